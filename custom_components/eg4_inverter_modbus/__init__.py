@@ -10,18 +10,44 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     Platform,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from pymodbus.exceptions import ModbusException
+import voluptuous as vol
 
 from .const import (
     DOMAIN, 
     DEFAULT_SCAN_INTERVAL, 
     CONF_ENABLE_READ_SENSORS, 
     CONF_ENABLE_WRITE_SENSORS,
+    CONF_MAX_READ_GAP,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_PARALLEL_UNITS,
+    CONF_PIPELINE_READS,
+    CONF_POWER_SAMPLE_RATE,
+    CONF_CAPTURE_RAW,
+    CAPTURE_DIRECTORY,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_POWER_SAMPLE_RATE,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
     INPUT_REGISTERS,
     HOLDING_REGISTERS,
+    PARALLEL_SENSORS,
+    ENERGY_INTEGRATION_SENSORS,
+    POWER_STATISTICS_SENSORS,
+    SERVICE_WRITE_REGISTERS,
+    SERVICE_DISCOVER_REGISTERS,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_ADDRESS,
+    ATTR_VALUES,
+    ATTR_SLAVE,
 )
+from .discovery import RegisterScanError
 from .hub import EG4ModbusHub
+from .parallel import EG4ParallelHub, parse_units
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,6 +59,24 @@ PLATFORMS: list[Platform] = [
     Platform.SELECT,
 ]
 
+WRITE_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SLAVE): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+        vol.Required(ATTR_ADDRESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=0xFFFF)),
+        vol.Required(ATTR_VALUES): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=-0x8000, max=0xFFFF))], vol.Length(min=1)
+        ),
+    }
+)
+
+DISCOVER_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SLAVE): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up an EG4 Modbus device from a config entry."""
@@ -43,17 +87,65 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     port = entry.options.get(CONF_PORT)
     slave = entry.options.get("slave")
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    max_read_gap = entry.options.get(CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP)
+    fast_scan_interval = entry.options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
+    slow_scan_interval = entry.options.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL)
+    pipeline_reads = entry.options.get(CONF_PIPELINE_READS, False)
+    power_sample_rate = entry.options.get(CONF_POWER_SAMPLE_RATE, DEFAULT_POWER_SAMPLE_RATE)
+    capture_dir = hass.config.path(CAPTURE_DIRECTORY) if entry.options.get(CONF_CAPTURE_RAW, False) else None
 
     _LOGGER.debug("Setup %s.%s", DOMAIN, name)
 
-    hub = EG4ModbusHub(hass, name, host, port, slave, scan_interval)
+    units = parse_units(entry.options.get(CONF_PARALLEL_UNITS, ""))
+    if len(units) > 1:
+        # A parallel system: one hub per unit, polled together in rounds by the parallel hub.
+        unit_hubs = [
+            EG4ModbusHub(
+                hass,
+                name if unit == slave else f"{name} {unit}",
+                host,
+                port,
+                unit,
+                scan_interval,
+                max_read_gap,
+                fast_scan_interval,
+                slow_scan_interval,
+                pipeline_reads,
+                power_sample_rate,
+                capture_dir,
+            )
+            for unit in units
+        ]
+        hub = EG4ParallelHub(hass, f"{name} Parallel", unit_hubs)
+    else:
+        hub = EG4ModbusHub(
+            hass,
+            name,
+            host,
+            port,
+            slave,
+            scan_interval,
+            max_read_gap,
+            fast_scan_interval,
+            slow_scan_interval,
+            pipeline_reads,
+            power_sample_rate,
+            capture_dir,
+        )
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = hub
 
+    if not hass.services.has_service(DOMAIN, SERVICE_WRITE_REGISTERS):
+        _register_services(hass)
+
     # Set up the options listener. This will reload the integration when options change.
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     # Forward the setup to all defined platforms.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if isinstance(hub, EG4ParallelHub):
+        # Keep the rounds going even when every system total is disabled.
+        entry.async_on_unload(hub.async_add_listener(lambda: None))
     
     # Update entity registry based on checkbox settings
     await _update_entity_registry(hass, entry)
@@ -61,6 +153,72 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _register_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    def get_hub(call: ServiceCall):
+        """Return the hub of the config entry a call names, or the only one."""
+        hubs = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            hub = hubs.get(entry_id)
+            if hub is None:
+                raise HomeAssistantError(f"No loaded EG4 inverter with config entry {entry_id}")
+            return hub
+        if len(hubs) == 1:
+            return next(iter(hubs.values()))
+        raise HomeAssistantError("More than one EG4 inverter is configured, specify config_entry_id")
+
+    def get_units(call: ServiceCall) -> list[EG4ModbusHub]:
+        """Return the unit a call names, or every unit of its hub."""
+        hub = get_hub(call)
+        if ATTR_SLAVE not in call.data:
+            return hub.units
+        for unit in hub.units:
+            if unit.unit_id == call.data[ATTR_SLAVE]:
+                return [unit]
+        raise HomeAssistantError(f"Unit {call.data[ATTR_SLAVE]} is not part of {hub.name}")
+
+    async def async_write_registers(call: ServiceCall) -> None:
+        """Queue raw holding register writes, sent together with any other pending writes."""
+        units = get_units(call)
+        if len(units) > 1:
+            raise HomeAssistantError(f"{get_hub(call).name} is a parallel system, specify the slave to write to")
+        hub = units[0]
+
+        address = call.data[ATTR_ADDRESS]
+        values = call.data[ATTR_VALUES]
+        if address + len(values) > 0x10000:
+            raise HomeAssistantError(f"Registers {address}-{address + len(values) - 1} are out of range")
+        results = await asyncio.gather(
+            *(hub.async_queue_write(address + i, value) for i, value in enumerate(values))
+        )
+        if not all(results):
+            raise HomeAssistantError(f"Writing registers {address}-{address + len(values) - 1} failed")
+
+    async def async_discover_registers(call: ServiceCall) -> ServiceResponse:
+        """Sweep the registers each unit answers and store them for its firmware."""
+        results = {}
+        for unit in get_units(call):
+            try:
+                register_map = await unit.async_discover_registers()
+            except (RegisterScanError, ModbusException) as ex:
+                raise HomeAssistantError(f"Discovering the registers of {unit.name} failed: {ex}") from ex
+            results[unit.name] = {"firmware": unit.register_map_key, **register_map}
+        return {"units": results}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_WRITE_REGISTERS, async_write_registers, schema=WRITE_REGISTERS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DISCOVER_REGISTERS,
+        async_discover_registers,
+        schema=DISCOVER_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
 async def _update_entity_registry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update entity registry to enable/disable entities based on checkbox settings."""
     registry = er.async_get(hass)
@@ -72,17 +230,28 @@ async def _update_entity_registry(hass: HomeAssistant, entry: ConfigEntry) -> No
     
     # Build a map of unique_id -> default enabled state from entity descriptions
     default_enabled_map = {}
-    name = entry.data[CONF_NAME]
+    hub = hass.data[DOMAIN][entry.entry_id]
     
-    # Check input registers (sensors/binary_sensors)
-    for desc in INPUT_REGISTERS.values():
-        unique_id = f"{name}_{desc.key}"
-        default_enabled_map[unique_id] = desc.entity_registry_enabled_default
+    for unit in hub.units:
+        # Check input registers (sensors/binary_sensors)
+        for desc in INPUT_REGISTERS:
+            unique_id = f"{unit.name}_{desc.key}"
+            default_enabled_map[unique_id] = desc.entity_registry_enabled_default
     
-    # Check holding registers (sensors/numbers/selects)
-    for desc in HOLDING_REGISTERS.values():
-        unique_id = f"{name}_{desc.key}"
-        default_enabled_map[unique_id] = desc.entity_registry_enabled_default
+        # Check holding registers (sensors/numbers/selects)
+        for desc in HOLDING_REGISTERS:
+            unique_id = f"{unit.name}_{desc.key}"
+            default_enabled_map[unique_id] = desc.entity_registry_enabled_default
+
+        # Check the statistics and integrated energy of the power samples
+        if unit.power_sampling:
+            for desc in POWER_STATISTICS_SENSORS + ENERGY_INTEGRATION_SENSORS:
+                default_enabled_map[f"{unit.name}_{desc.key}"] = desc.entity_registry_enabled_default
+
+    # Check system totals of a parallel system
+    if isinstance(hub, EG4ParallelHub):
+        for desc in PARALLEL_SENSORS:
+            default_enabled_map[f"{hub.name}_{desc.key}"] = desc.entity_registry_enabled_default
     
     for entity_entry in entities:
         entity_id = entity_entry.entity_id
@@ -131,5 +300,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Clean up the hub from `hass.data`.
         hub = hass.data[DOMAIN].pop(entry.entry_id)
         hub.close()  # Ensure cleanup
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_WRITE_REGISTERS)
+            hass.services.async_remove(DOMAIN, SERVICE_DISCOVER_REGISTERS)
 
     return unload_ok
@@ -16,7 +16,6 @@ from .const import (
     INPUT_REGISTERS,
     HOLDING_REGISTERS,
     EG4ModbusBinarySensorEntityDescription,
-    ATTR_MANUFACTURER,
     CONF_ENABLE_READ_SENSORS,
 )
 from .hub import EG4ModbusHub
@@ -32,33 +31,27 @@ async def async_setup_entry(
     """Set up the EG4 binary sensors."""
     hub: EG4ModbusHub = hass.data[DOMAIN][entry.entry_id]
     
-    device_info = {
-        "identifiers": {(DOMAIN, hub.name)},
-        "name": hub.name,
-        "manufacturer": ATTR_MANUFACTURER,
-        "model": "EG4 Inverter",
-    }
-
     entities = []
     
     # Note: Using CONF_ENABLE_READ_SENSORS to also control optional binary sensors
     enable_read_sensors = entry.options.get(CONF_ENABLE_READ_SENSORS, False)
 
-    # Create sensors from Input Registers
-    for description in INPUT_REGISTERS.values():
-        if isinstance(description, EG4ModbusBinarySensorEntityDescription):
-            is_enabled = description.entity_registry_enabled_default
-            if enable_read_sensors:
-                is_enabled = True
-            entities.append(EG4BinarySensor(hub, device_info, description, is_enabled))
+    for unit in hub.units:
+        # Create sensors from Input Registers
+        for description in INPUT_REGISTERS:
+            if isinstance(description, EG4ModbusBinarySensorEntityDescription):
+                is_enabled = description.entity_registry_enabled_default
+                if enable_read_sensors:
+                    is_enabled = True
+                entities.append(EG4BinarySensor(unit, unit.device_info, description, is_enabled))
 
-    # Create sensors from Holding Registers
-    for description in HOLDING_REGISTERS.values():
-        if isinstance(description, EG4ModbusBinarySensorEntityDescription):
-            is_enabled = description.entity_registry_enabled_default
-            if enable_read_sensors:
-                is_enabled = True
-            entities.append(EG4BinarySensor(hub, device_info, description, is_enabled))
+        # Create sensors from Holding Registers
+        for description in HOLDING_REGISTERS:
+            if isinstance(description, EG4ModbusBinarySensorEntityDescription):
+                is_enabled = description.entity_registry_enabled_default
+                if enable_read_sensors:
+                    is_enabled = True
+                entities.append(EG4BinarySensor(unit, unit.device_info, description, is_enabled))
 
     async_add_entities(entities)
 
@@ -77,13 +70,18 @@ class EG4BinarySensor(CoordinatorEntity[EG4ModbusHub], BinarySensorEntity):
         enabled_default: bool,
     ):
         """Initialize the binary sensor."""
-        super().__init__(coordinator=hub)
+        super().__init__(coordinator=hub, context=description.key)
         self.entity_description = description
         self._attr_device_info = device_info
         self._attr_unique_id = f"{hub.name}_{description.key}"
         self._attr_name = description.name
         self._attr_entity_enabled_default = enabled_default
 
+    @property
+    def available(self) -> bool:
+        """Return False while the value is stale because its registers can't be read."""
+        return super().available and not self.coordinator.is_stale(self.entity_description.key)
+
     @property
     def is_on(self) -> bool | None:
         """Return the state of the sensor."""
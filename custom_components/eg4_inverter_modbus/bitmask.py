@@ -0,0 +1,42 @@
+"""Byte-wise lookup tables for the 32-bit fault and warning words."""
+from __future__ import annotations
+
+from functools import lru_cache
+
+# Distinct raw words remembered per table; the words almost never change.
+MESSAGE_CACHE_SIZE = 64
+
+
+class BitmaskTable:
+    """
+    The messages of a 32-bit status word, looked up a byte at a time.
+
+    For each of the four bytes a table maps all 256 values to the messages of
+    the bits set in it, so a word decodes with four lookups instead of a test
+    per known bit, and the joined string is memoized on the raw value.
+    """
+
+    def __init__(self, codes: dict[int, str], no_bits: str = "No Faults"):
+        """Precompute the byte tables of `codes`, which maps single-bit masks to messages."""
+        self.codes = codes
+        self._no_bits = no_bits
+        self._bytes = tuple(
+            tuple(
+                tuple(message for mask, message in sorted(codes.items()) if mask & (value << (8 * index)))
+                for value in range(256)
+            )
+            for index in range(4)
+        )
+        self.messages = lru_cache(maxsize=MESSAGE_CACHE_SIZE)(self._messages)
+
+    def _messages(self, code: int) -> str:
+        """Return the comma-separated messages of the bits set in `code`."""
+        if not code:
+            return self._no_bits
+        low, byte1, byte2, high = self._bytes
+        messages = (
+            low[code & 0xFF] + byte1[(code >> 8) & 0xFF] + byte2[(code >> 16) & 0xFF] + high[(code >> 24) & 0xFF]
+        )
+        if not messages:
+            return f"Unknown Code: {hex(code)}"
+        return ", ".join(messages)
@@ -0,0 +1,245 @@
+"""Compact append-only captures of the raw register blocks the hub reads."""
+from __future__ import annotations
+
+from array import array
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Iterator, NamedTuple, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_SUFFIX = ".eg4cap"
+CAPTURE_MAGIC = b"EG4CAP"
+CAPTURE_VERSION = 1
+# Magic, version and the wall clock time the file starts at.
+_FILE_HEADER = struct.Struct(">6sBd")
+
+# Record kinds: the whole payload, the registers that changed since the last
+# record of the same block in the file, or a Modbus exception response.
+KIND_FULL = 0
+KIND_DELTA = 1
+KIND_EXCEPTION = 2
+
+
+class CaptureRecord(NamedTuple):
+    """One block response of a capture."""
+
+    timestamp: float
+    unit: int
+    function_code: int
+    start: int
+    # Big-endian registers as on the wire; empty for an exception.
+    payload: bytes
+    exception_code: int = 0
+
+    @property
+    def registers(self) -> list[int]:
+        """Return the payload as a list of registers."""
+        return list(struct.unpack(f">{len(self.payload) // 2}H", self.payload))
+
+
+def registers_to_payload(registers) -> bytes:
+    """Pack registers as the big-endian payload of a read response."""
+    words = array("H", registers)
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words.tobytes()
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 integer."""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buffer, offset: int) -> tuple[int, int]:
+    """Read an unsigned LEB128 integer, returning it and the offset after it."""
+    value = shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class CaptureWriter:
+    """
+    Encode block responses into capture files that rotate by size.
+
+    Each record holds the milliseconds since the previous record, unit,
+    function code, start address and count as varints, then the payload. A
+    block that was captured before in the same file only stores the registers
+    that changed, so an unchanged block costs about seven bytes. Every file
+    starts without history and can be read on its own.
+
+    Records are encoded on the event loop into memory; `take` hands the
+    buffered bytes over and `write` appends them to disk in an executor.
+    """
+
+    def __init__(self, directory: str, prefix: str, max_file_bytes: int, max_files: int):
+        """Initialize the writer; files are named `<prefix>-<start time>.eg4cap`."""
+        self.directory = directory
+        self.prefix = prefix
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.path: Optional[str] = None
+        self.records = 0
+        self.bytes = 0
+        self._buffer = bytearray()
+        self._rotated: list[tuple[str, bytes]] = []
+        self._file_bytes = 0
+        self._last_ms = 0
+        self._previous: dict[tuple[int, int, int, int], bytes] = {}
+        self._write_lock = threading.Lock()
+
+    @property
+    def pending_bytes(self) -> int:
+        """Return the encoded bytes not handed to `write` yet."""
+        return len(self._buffer) + sum(len(data) for _, data in self._rotated)
+
+    def _start_file(self, timestamp: float) -> None:
+        """Start a new file at `timestamp`, without delta history."""
+        if self._buffer:
+            self._rotated.append((self.path, bytes(self._buffer)))
+        started = time.strftime("%Y%m%dT%H%M%S", time.gmtime(timestamp))
+        self.path = os.path.join(self.directory, f"{self.prefix}-{started}{int(timestamp * 1000) % 1000:03d}{CAPTURE_SUFFIX}")
+        self._buffer = bytearray(_FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, timestamp))
+        self._file_bytes = len(self._buffer)
+        self._last_ms = round(timestamp * 1000)
+        self._previous.clear()
+
+    def append(
+        self, timestamp: float, unit: int, function_code: int, start: int, payload: bytes, exception_code: int = 0
+    ) -> None:
+        """Encode one block response; `payload` holds the big-endian registers."""
+        if self.path is None or self._file_bytes >= self.max_file_bytes:
+            self._start_file(timestamp)
+        out = bytearray()
+        key = (unit, function_code, start, len(payload))
+        previous = self._previous.get(key)
+        if exception_code:
+            out.append(KIND_EXCEPTION)
+        elif previous is not None:
+            changes = bytearray()
+            changed = last = 0
+            if payload != previous:
+                for index, (old, new) in enumerate(zip(memoryview(previous).cast("H"), memoryview(payload).cast("H"))):
+                    if old != new:
+                        _write_varint(changes, index - last)
+                        changes += payload[2 * index:2 * index + 2]
+                        changed += 1
+                        last = index
+            if len(changes) < len(payload):
+                out.append(KIND_DELTA)
+            else:
+                out.append(KIND_FULL)
+                previous = None
+        else:
+            out.append(KIND_FULL)
+
+        now_ms = round(timestamp * 1000)
+        # A wall clock that steps back is recorded as no time passing.
+        _write_varint(out, max(0, now_ms - self._last_ms))
+        self._last_ms = max(self._last_ms, now_ms)
+        out.append(unit)
+        out.append(function_code)
+        _write_varint(out, start)
+        if exception_code:
+            _write_varint(out, 0)
+            out.append(exception_code)
+        else:
+            _write_varint(out, len(payload) // 2)
+            if previous is not None:
+                _write_varint(out, changed)
+                out += changes
+            else:
+                out += payload
+            self._previous[key] = bytes(payload)
+
+        self._buffer += out
+        self._file_bytes += len(out)
+        self.records += 1
+        self.bytes += len(out)
+
+    def take(self) -> list[tuple[str, bytes]]:
+        """Hand over the encoded bytes of each file since the last call."""
+        segments, self._rotated = self._rotated, []
+        if self._buffer:
+            segments.append((self.path, bytes(self._buffer)))
+            self._buffer = bytearray()
+        return segments
+
+    def write(self, segments: list[tuple[str, bytes]]) -> None:
+        """Append the segments to their files and drop the oldest files beyond `max_files`. Blocking."""
+        with self._write_lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for path, data in segments:
+                    with open(path, "ab") as file:
+                        file.write(data)
+                captures = sorted(
+                    name for name in os.listdir(self.directory)
+                    if name.startswith(f"{self.prefix}-") and name.endswith(CAPTURE_SUFFIX)
+                )
+                for name in captures[:-self.max_files]:
+                    os.remove(os.path.join(self.directory, name))
+            except OSError as ex:
+                _LOGGER.warning(f"Writing the register capture failed: {ex}")
+
+
+def iter_records(buffer) -> Iterator[CaptureRecord]:
+    """Decode the records of one capture file held in a bytes-like object, e.g. an mmap."""
+    view = memoryview(buffer)
+    magic, version, started = _FILE_HEADER.unpack_from(view)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+        raise ValueError(f"Not a version {CAPTURE_VERSION} register capture")
+    offset = _FILE_HEADER.size
+    ms = round(started * 1000)
+    previous: dict[tuple[int, int, int, int], bytes] = {}
+    size = len(view)
+    try:
+        while offset < size:
+            kind = view[offset]
+            elapsed, offset = _read_varint(view, offset + 1)
+            unit, function_code = view[offset], view[offset + 1]
+            start, offset = _read_varint(view, offset + 2)
+            count, offset = _read_varint(view, offset)
+            ms += elapsed
+            if kind == KIND_EXCEPTION:
+                exception_code = view[offset]
+                offset += 1
+                yield CaptureRecord(ms / 1000, unit, function_code, start, b"", exception_code)
+                continue
+            key = (unit, function_code, start, 2 * count)
+            if kind == KIND_FULL:
+                if offset + 2 * count > size:
+                    break
+                payload = bytes(view[offset:offset + 2 * count])
+                offset += 2 * count
+            elif kind == KIND_DELTA:
+                changed, offset = _read_varint(view, offset)
+                registers = bytearray(previous[key])
+                index = 0
+                for _ in range(changed):
+                    gap, offset = _read_varint(view, offset)
+                    index += gap
+                    if offset + 2 > size:
+                        raise IndexError
+                    registers[2 * index:2 * index + 2] = view[offset:offset + 2]
+                    offset += 2
+                payload = bytes(registers)
+            else:
+                raise ValueError(f"Unknown record kind {kind} at offset {offset}")
+            previous[key] = payload
+            yield CaptureRecord(ms / 1000, unit, function_code, start, payload)
+    except IndexError:
+        # A record cut short, e.g. by a crash mid-write; everything before it is intact.
+        _LOGGER.debug(f"Capture ends in a partial record at offset {offset}")
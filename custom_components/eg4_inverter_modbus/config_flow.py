@@ -22,7 +22,30 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     CONF_ENABLE_READ_SENSORS,
     CONF_ENABLE_WRITE_SENSORS,
+    CONF_MAX_READ_GAP,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_PARALLEL_UNITS,
+    CONF_PIPELINE_READS,
+    CONF_POWER_SAMPLE_RATE,
+    CONF_CAPTURE_RAW,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_POWER_SAMPLE_RATE,
+    MAX_POWER_SAMPLE_RATE,
 )
+from .parallel import parse_units
+
+
+def _parallel_units(value: str) -> str:
+    """Validate the comma separated unit ids of a parallel system."""
+    try:
+        parse_units(value)
+    except ValueError as ex:
+        raise vol.Invalid(f"Invalid unit ids: {ex}") from ex
+    return value
+
 
 # Configuration schema for the initial setup.
 USER_DATA_SCHEMA = vol.Schema(
@@ -32,6 +55,15 @@ USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
         vol.Required("slave", default=1): int,
         vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
+        vol.Optional(CONF_FAST_SCAN_INTERVAL, default=DEFAULT_FAST_SCAN_INTERVAL): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_SLOW_SCAN_INTERVAL, default=DEFAULT_SLOW_SCAN_INTERVAL): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_MAX_READ_GAP, default=DEFAULT_MAX_READ_GAP): vol.All(int, vol.Range(min=0, max=124)),
+        vol.Optional(CONF_PARALLEL_UNITS, default=""): vol.All(str, _parallel_units),
+        vol.Optional(CONF_PIPELINE_READS, default=False): bool,
+        vol.Optional(CONF_POWER_SAMPLE_RATE, default=DEFAULT_POWER_SAMPLE_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_POWER_SAMPLE_RATE)
+        ),
+        vol.Optional(CONF_CAPTURE_RAW, default=False): bool,
         vol.Optional(
             CONF_ENABLE_READ_SENSORS,
             default=False,
@@ -143,6 +175,34 @@ class EG4ModbusOptionsFlowHandler(OptionsFlow):
                         config_data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
                     ),
                 ): int,
+                vol.Optional(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=options_data.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_SLOW_SCAN_INTERVAL,
+                    default=options_data.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MAX_READ_GAP,
+                    default=options_data.get(CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP),
+                ): vol.All(int, vol.Range(min=0, max=124)),
+                vol.Optional(
+                    CONF_PARALLEL_UNITS,
+                    default=options_data.get(CONF_PARALLEL_UNITS, ""),
+                ): vol.All(str, _parallel_units),
+                vol.Optional(
+                    CONF_PIPELINE_READS,
+                    default=options_data.get(CONF_PIPELINE_READS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_POWER_SAMPLE_RATE,
+                    default=options_data.get(CONF_POWER_SAMPLE_RATE, DEFAULT_POWER_SAMPLE_RATE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_POWER_SAMPLE_RATE)),
+                vol.Optional(
+                    CONF_CAPTURE_RAW,
+                    default=options_data.get(CONF_CAPTURE_RAW, False),
+                ): bool,
                 vol.Optional(
                     CONF_ENABLE_READ_SENSORS,
                     default=options_data.get(
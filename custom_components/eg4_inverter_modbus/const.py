@@ -1,5 +1,7 @@
-from dataclasses import dataclass, field
-from typing import Optional, Union
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import Any, Callable, Optional, Union
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -13,6 +15,7 @@ from homeassistant.components.sensor import (
 from homeassistant.components.number import NumberEntityDescription
 from homeassistant.components.select import SelectEntityDescription
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.util import dt as dt_util, slugify
 
 from homeassistant.const import (
     PERCENTAGE,
@@ -24,18 +27,80 @@ from homeassistant.const import (
     UnitOfPower,
     UnitOfReactivePower,
     UnitOfTemperature,
+    UnitOfInformation,
     UnitOfTime,
 )
 
+from .bitmask import BitmaskTable
+
+_LOGGER = logging.getLogger(__name__)
+
 DOMAIN = "eg4_inverter_modbus"
+DATA_GATEWAYS = f"{DOMAIN}_gateways"
 DEFAULT_NAME = "EG4"
 DEFAULT_SCAN_INTERVAL = 10
+DEFAULT_FAST_SCAN_INTERVAL = 2
+DEFAULT_SLOW_SCAN_INTERVAL = 300
 DEFAULT_PORT = 502
+DEFAULT_IDLE_TIMEOUT = 60  # seconds before an unused Modbus session is recycled
+# Unneeded registers read to merge two blocks into one request. A gateway round trip
+# costs 50-150 ms while each extra register costs ~1 ms at 19200 baud.
+DEFAULT_MAX_READ_GAP = 24
+DEFAULT_WRITE_DEBOUNCE = 0.5  # seconds pending register writes are collected before they are sent
+DEFAULT_POWER_SAMPLE_RATE = 0  # samples per second of the power registers, 0 is off
+MAX_POWER_SAMPLE_RATE = 4
+DEFAULT_MAX_BACKOFF_INTERVAL = 300  # longest poll interval while the gateway struggles, seconds
+DEFAULT_SETTINGS_CHECK_INTERVAL = 3600  # seconds between re-reads of the cached settings
+# Raw register captures: size of each file before it rotates, files kept per unit,
+# and how much or how long encoded records are buffered before they are written.
+CAPTURE_DIRECTORY = f"{DOMAIN}_captures"
+DEFAULT_CAPTURE_FILE_BYTES = 16 * 1024 * 1024
+DEFAULT_CAPTURE_FILES = 32
+CAPTURE_FLUSH_BYTES = 64 * 1024
+CAPTURE_FLUSH_INTERVAL = 60
 ATTR_MANUFACTURER = "EG4"
 
 # Add constants for options flow
 CONF_ENABLE_READ_SENSORS = "enable_read_sensors"
 CONF_ENABLE_WRITE_SENSORS = "enable_write_sensors"
+CONF_MAX_READ_GAP = "max_read_gap"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
+CONF_PARALLEL_UNITS = "parallel_units"
+CONF_PIPELINE_READS = "pipeline_reads"
+CONF_POWER_SAMPLE_RATE = "power_sample_rate"
+CONF_CAPTURE_RAW = "capture_raw"
+
+SERVICE_WRITE_REGISTERS = "write_registers"
+SERVICE_DISCOVER_REGISTERS = "discover_registers"
+# Fired when a bit of the fault or warning word is set or cleared.
+EVENT_CODE_CHANGED = f"{DOMAIN}_code_changed"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ADDRESS = "address"
+ATTR_VALUES = "values"
+ATTR_SLAVE = "slave"
+
+# Polling tiers. Fast values (power, SOC, grid) are read every fast scan interval,
+# normal values every scan interval and slow values (battery metadata, the
+# inverter clock) every slow scan interval. Settings only change when they are
+# written, which reads them back, or on the inverter's display: they are read
+# once at startup and then only checked every settings check interval.
+TIER_FAST = "fast"
+TIER_NORMAL = "normal"
+TIER_SLOW = "slow"
+TIER_SETTINGS = "settings"
+
+# Every description below carries its own register layout so the hub can compile
+# a decode plan from it:
+#   address    first register of the value, None for values calculated by the hub
+#   registers  width in registers, multi-register values are low word first
+#   signed     two's complement over the full width
+#   scale      multiplier applied to the raw value (0.1 == the register holds tenths)
+#   shift/mask bitfield inside the raw value, applied before scaling
+#   value_map  lookup of the raw value, unknown values map to "Unknown"
+#   value_fn   conversion of the raw value that a simple lookup can't express
+#   tier       polling tier the value is read in
+#   sources    keys a calculated value is derived from, so they're polled while it is enabled
 
 @dataclass
 class EG4ModbusSensorEntityDescription(SensorEntityDescription):
@@ -43,20 +108,47 @@ class EG4ModbusSensorEntityDescription(SensorEntityDescription):
     entity_category: Optional[EntityCategory] = None
     suggested_display_precision: Optional[int] = None
     entity_registry_enabled_default: bool = True
+    address: Optional[int] = None
+    registers: int = 1
+    signed: bool = False
+    scale: float = 1.0
+    shift: int = 0
+    mask: Optional[int] = None
+    value_map: Optional[dict] = None
+    value_fn: Optional[Callable[[int], Any]] = None
+    tier: str = TIER_NORMAL
+    sources: tuple[str, ...] = ()
 
 @dataclass
 class EG4ModbusBinarySensorEntityDescription(BinarySensorEntityDescription):
     """A class that describes EG4 binary sensor entities."""
     entity_category: Optional[EntityCategory] = None
     entity_registry_enabled_default: bool = True
+    address: Optional[int] = None
+    registers: int = 1
+    signed: bool = False
+    scale: float = 1.0
+    shift: int = 0
+    mask: Optional[int] = None
+    value_map: Optional[dict] = None
+    value_fn: Optional[Callable[[int], Any]] = None
+    tier: str = TIER_NORMAL
 
 
 @dataclass
 class EG4ModbusNumberEntityDescription(NumberEntityDescription):
     """A class that describes EG4 number entities."""
     entity_category: Optional[EntityCategory] = EntityCategory.CONFIG
-    scale: float = 1.0
     entity_registry_enabled_default: bool = False
+    address: Optional[int] = None
+    registers: int = 1
+    signed: bool = False
+    scale: float = 1.0
+    shift: int = 0
+    mask: Optional[int] = None
+    value_map: Optional[dict] = None
+    value_fn: Optional[Callable[[int], Any]] = None
+    tier: str = TIER_SETTINGS
 
 
 @dataclass
@@ -64,207 +156,15 @@ class EG4ModbusSelectEntityDescription(SelectEntityDescription):
     """A class that describes EG4 select entities."""
     entity_category: Optional[EntityCategory] = EntityCategory.CONFIG
     entity_registry_enabled_default: bool = False
-
-
-# --- Input Registers (Function Code 0x04) ---
-INPUT_REGISTERS: dict[int, EG4ModbusSensorEntityDescription] = {
-    0: EG4ModbusSensorEntityDescription(key="inverter_state", name="Inverter State", icon="mdi:information-outline"),
-    1: EG4ModbusSensorEntityDescription(key="voltage_pv1", name="Voltage PV1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    2: EG4ModbusSensorEntityDescription(key="voltage_pv2", name="Voltage PV2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    3: EG4ModbusSensorEntityDescription(key="voltage_pv3", name="Voltage PV3", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    4: EG4ModbusSensorEntityDescription(key="voltage_battery", name="Voltage Battery", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    5: EG4ModbusSensorEntityDescription(key="battery_soc", name="Battery SOC", native_unit_of_measurement=PERCENTAGE, device_class=SensorDeviceClass.BATTERY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    6: EG4ModbusSensorEntityDescription(key="battery_soh", name="Battery SOH", native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT, icon="mdi:heart-pulse", suggested_display_precision=1),
-    7: EG4ModbusSensorEntityDescription(key="power_pv1", name="Power PV1", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
-    8: EG4ModbusSensorEntityDescription(key="power_pv2", name="Power PV2", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power", suggested_display_precision=1, entity_registry_enabled_default=False),
-    9: EG4ModbusSensorEntityDescription(key="power_pv3", name="Power PV3", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power", suggested_display_precision=1, entity_registry_enabled_default=False),
-    10: EG4ModbusSensorEntityDescription(key="power_battery_charge", name="Power Battery Charge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
-    11: EG4ModbusSensorEntityDescription(key="power_battery_discharge", name="Power Battery Discharge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
-    12: EG4ModbusSensorEntityDescription(key="voltage_grid_l1l2", name="Voltage Grid L1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    13: EG4ModbusSensorEntityDescription(key="voltage_grid_l2l3", name="Voltage Grid L2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    14: EG4ModbusSensorEntityDescription(key="voltage_grid_l3l1", name="Voltage Grid L3", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    15: EG4ModbusSensorEntityDescription(key="frequency_grid", name="Frequency Grid", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2, entity_registry_enabled_default=False),
-    16: EG4ModbusSensorEntityDescription(key="power_inverter_output", name="Power Inverter Output", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
-    17: EG4ModbusSensorEntityDescription(key="power_ac_charge", name="Power AC Charge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
-    18: EG4ModbusSensorEntityDescription(key="current_inverter_rms", name="Current Inverter RMS", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    19: EG4ModbusSensorEntityDescription(key="power_factor_inverter", name="Power Factor Inverter", device_class=SensorDeviceClass.POWER_FACTOR, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    20: EG4ModbusSensorEntityDescription(key="voltage_inverter_l1l2", name="Voltage Inverter L1-L2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    21: EG4ModbusSensorEntityDescription(key="voltage_inverter_l2l3", name="Voltage Inverter L2-L3", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    22: EG4ModbusSensorEntityDescription(key="voltage_inverter_l3l1", name="Voltage Inverter L3-L1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    23: EG4ModbusSensorEntityDescription(key="frequency_inverter", name="Frequency Inverter", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2, entity_registry_enabled_default=False),
-    24: EG4ModbusSensorEntityDescription(key="power_inverter", name="Power Inverter", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
-    25: EG4ModbusSensorEntityDescription(key="power_apparent_inverter", name="Power Apparent Inverter", native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE, device_class=SensorDeviceClass.APPARENT_POWER, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    26: EG4ModbusSensorEntityDescription(key="power_grid_export", name="Power Grid Export", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower-export"),
-    27: EG4ModbusSensorEntityDescription(key="power_grid_import", name="Power Grid Import", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower-import"),
-    28: EG4ModbusSensorEntityDescription(key="energy_daily_pv1", name="Energy Daily PV1", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, icon="mdi:solar-power"),
-    29: EG4ModbusSensorEntityDescription(key="energy_daily_pv2", name="Energy Daily PV2", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False, icon="mdi:solar-power"),
-    30: EG4ModbusSensorEntityDescription(key="energy_daily_pv3", name="Energy Daily PV3", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False, icon="mdi:solar-power"),
-    31: EG4ModbusSensorEntityDescription(key="energy_daily_inverter_output", name="Energy Daily Inverter Output", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    32: EG4ModbusSensorEntityDescription(key="energy_daily_ac_charge", name="Energy Daily AC Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    33: EG4ModbusSensorEntityDescription(key="energy_daily_battery_charge", name="Energy Daily Battery Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    34: EG4ModbusSensorEntityDescription(key="energy_daily_battery_discharge", name="Energy Daily Battery Discharge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    35: EG4ModbusSensorEntityDescription(key="energy_daily_inverter", name="Energy Daily Inverter", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    36: EG4ModbusSensorEntityDescription(key="energy_daily_grid_export", name="Energy Daily Grid Export", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    37: EG4ModbusSensorEntityDescription(key="energy_daily_grid_import", name="Energy Daily Grid Import", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
-    38: EG4ModbusSensorEntityDescription(key="voltage_bus_1", name="Voltage Bus 1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    39: EG4ModbusSensorEntityDescription(key="voltage_bus_2", name="Voltage Bus 2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    40: EG4ModbusSensorEntityDescription(key="energy_cumulative_pv1", name="Energy Cumulative PV1", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    42: EG4ModbusSensorEntityDescription(key="energy_cumulative_pv2", name="Energy Cumulative PV2", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    44: EG4ModbusSensorEntityDescription(key="energy_cumulative_pv3", name="Energy Cumulative PV3", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    46: EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter_output", name="Energy Cumulative Inverter Output", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    48: EG4ModbusSensorEntityDescription(key="energy_cumulative_ac_charge", name="Energy Cumulative AC Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    50: EG4ModbusSensorEntityDescription(key="energy_cumulative_battery_charge", name="Energy Cumulative Battery Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    52: EG4ModbusSensorEntityDescription(key="energy_cumulative_battery_discharge", name="Energy Cumulative Battery Discharge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    54: EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter", name="Energy Cumulative Inverter", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    56: EG4ModbusSensorEntityDescription(key="energy_cumulative_grid_export", name="Energy Cumulative Grid Export", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    58: EG4ModbusSensorEntityDescription(key="energy_cumulative_grid_import", name="Energy Cumulative Grid Import", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    60: EG4ModbusSensorEntityDescription(key="fault_code", name="Fault Code", icon="mdi:alert-octagon", entity_category=EntityCategory.DIAGNOSTIC),
-    62: EG4ModbusSensorEntityDescription(key="warning_code", name="Warning Code", icon="mdi:alert-outline", entity_category=EntityCategory.DIAGNOSTIC),
-    64: EG4ModbusSensorEntityDescription(key="temperature_internal", name="Temperature Internal", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT),
-    65: EG4ModbusSensorEntityDescription(key="temperature_heatsink_dc", name="Heatsink Temperature DC", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    66: EG4ModbusSensorEntityDescription(key="temperature_heatsink_ac", name="Heatsink Temperature AC", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    67: EG4ModbusSensorEntityDescription(key="temperature_battery", name="Temperature Battery", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    69: EG4ModbusSensorEntityDescription(key="inverter_on_time", name="Inverter ON time", icon="mdi:timer-outline", device_class=SensorDeviceClass.TIMESTAMP, entity_category=EntityCategory.DIAGNOSTIC),
-    71: EG4ModbusSensorEntityDescription(key="auto_test_status", name="Auto Test Status", icon="mdi:play-box-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    77: EG4ModbusSensorEntityDescription(key="ac_input_type", name="AC Input Type", icon="mdi:power-plug"),
-    81: EG4ModbusSensorEntityDescription(key="bms_current_max_charge", name="BMS Current Max Charge", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=0, entity_registry_enabled_default=False),
-    82: EG4ModbusSensorEntityDescription(key="bms_current_max_discharge", name="BMS Current Max Discharge", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=0, entity_registry_enabled_default=False),
-    83: EG4ModbusSensorEntityDescription(key="bms_voltage_charge_ref", name="BMS Voltage Charge Reference", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=1, entity_registry_enabled_default=False),
-    84: EG4ModbusSensorEntityDescription(key="bms_voltage_discharge_cutoff", name="BMS Voltage Discharge Cutoff", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=1, entity_registry_enabled_default=False),
-    85: EG4ModbusSensorEntityDescription(key="bms_status_0", name="BMS Status 0", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    86: EG4ModbusSensorEntityDescription(key="bms_status_1", name="BMS Status 1", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    87: EG4ModbusSensorEntityDescription(key="bms_status_2", name="BMS Status 2", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    88: EG4ModbusSensorEntityDescription(key="bms_status_3", name="BMS Status 3", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    89: EG4ModbusSensorEntityDescription(key="bms_status_4", name="BMS Status 4", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    90: EG4ModbusSensorEntityDescription(key="bms_status_5", name="BMS Status 5", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    91: EG4ModbusSensorEntityDescription(key="bms_status_6", name="BMS Status 6", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    92: EG4ModbusSensorEntityDescription(key="bms_status_7", name="BMS Status 7", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    93: EG4ModbusSensorEntityDescription(key="bms_status_8", name="BMS Status 8", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    94: EG4ModbusSensorEntityDescription(key="bms_status_9", name="BMS Status 9", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    95: EG4ModbusSensorEntityDescription(key="bms_status_inv", name="BMS Status Inverter Summary", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    96: EG4ModbusSensorEntityDescription(key="battery_parallel_num", name="Battery Parallel Number", icon="mdi:battery-plus-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    97: EG4ModbusSensorEntityDescription(key="battery_capacity_ah", name="Battery Capacity", native_unit_of_measurement="Ah", icon="mdi:battery-charging", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    98: EG4ModbusSensorEntityDescription(key="bms_current_battery", name="BMS Current Battery", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
-    99: EG4ModbusSensorEntityDescription(key="bms_fault_code", name="Fault Code BMS", icon="mdi:alert-octagon", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    100: EG4ModbusSensorEntityDescription(key="bms_warning_code", name="Warning Code BMS", icon="mdi:alert-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    101: EG4ModbusSensorEntityDescription(key="bms_voltage_max_cell", name="BMS Voltage Max Cell", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2),
-    102: EG4ModbusSensorEntityDescription(key="bms_voltage_min_cell", name="BMS Voltage Min Cell", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2),
-    103: EG4ModbusSensorEntityDescription(key="bms_temperature_max_cell", name="BMS Temperature Max Cell", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT),
-    104: EG4ModbusSensorEntityDescription(key="bms_temperature_min_cell", name="BMS Temperature Min Cell", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT),
-    105: EG4ModbusSensorEntityDescription(key="bms_fw_update_state", name="BMS FW Update State", icon="mdi:update", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    106: EG4ModbusSensorEntityDescription(key="bms_cycle_count", name="Battery Cycle Count", icon="mdi:recycle", state_class=SensorStateClass.TOTAL_INCREASING),
-    107: EG4ModbusSensorEntityDescription(key="voltage_battery_sample_inverter", name="Voltage Battery Sample Inverter", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    108: EG4ModbusSensorEntityDescription(key="temperature_t1", name="Temperature T1", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    109: EG4ModbusSensorEntityDescription(key="temperature_t2", name="Temperature T2", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    110: EG4ModbusSensorEntityDescription(key="temperature_t3", name="Temperature T3", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    111: EG4ModbusSensorEntityDescription(key="temperature_t4", name="Temperature T4", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    112: EG4ModbusSensorEntityDescription(key="temperature_t5", name="Temperature T5", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
-    120: EG4ModbusSensorEntityDescription(key="voltage_bus_p", name="Voltage Bus P", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    121: EG4ModbusSensorEntityDescription(key="voltage_generator", name="Voltage Generator", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    122: EG4ModbusSensorEntityDescription(key="frequency_generator", name="Frequency Generator", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2, entity_registry_enabled_default=False),
-    123: EG4ModbusSensorEntityDescription(key="power_generator", name="Power Generator", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
-    124: EG4ModbusSensorEntityDescription(key="energy_daily_generator", name="Energy Daily Generator", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    125: EG4ModbusSensorEntityDescription(key="energy_cumulative_generator", name="Energy Cumulative Generator", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    127: EG4ModbusSensorEntityDescription(key="voltage_inverter_l1n", name="Voltage Inverter L1-N", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    128: EG4ModbusSensorEntityDescription(key="voltage_inverter_l2n", name="Voltage Inverter L2-N", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    129: EG4ModbusSensorEntityDescription(key="power_inverter_l1n", name="Power Inverter L1-N", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
-    130: EG4ModbusSensorEntityDescription(key="power_inverter_l2n", name="Power Inverter L2-N", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
-    131: EG4ModbusSensorEntityDescription(key="power_apparent_inverter_l1n", name="Power Apparent Inverter L1-N", native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE, device_class=SensorDeviceClass.APPARENT_POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
-    132: EG4ModbusSensorEntityDescription(key="power_apparent_inverter_l2n", name="Power Apparent Inverter L2-N", native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE, device_class=SensorDeviceClass.APPARENT_POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
-    133: EG4ModbusSensorEntityDescription(key="energy_daily_inverter_l1n", name="Energy Daily Inverter L1-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    134: EG4ModbusSensorEntityDescription(key="energy_daily_inverter_l2n", name="Energy Daily Inverter L2-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    135: EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter_l1n", name="Energy Cumulative Inverter L1-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    137: EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter_l2n", name="Energy Cumulative Inverter L2-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
-    140: EG4ModbusSensorEntityDescription(key="current_afci_ch1", name="Current AFCI CH1", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    141: EG4ModbusSensorEntityDescription(key="current_afci_ch2", name="Current AFCI CH2", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    142: EG4ModbusSensorEntityDescription(key="current_afci_ch3", name="Current AFCI CH3", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    143: EG4ModbusSensorEntityDescription(key="current_afci_ch4", name="Current AFCI CH4", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
-    145: EG4ModbusSensorEntityDescription(key="afci_arc_ch1", name="AFCI Arc CH1", icon="mdi:flash-alert", entity_registry_enabled_default=False),
-    146: EG4ModbusSensorEntityDescription(key="afci_arc_ch2", name="AFCI Arc CH2", icon="mdi:flash-alert", entity_registry_enabled_default=False),
-    147: EG4ModbusSensorEntityDescription(key="afci_arc_ch3", name="AFCI Arc CH3", icon="mdi:flash-alert", entity_registry_enabled_default=False),
-    148: EG4ModbusSensorEntityDescription(key="afci_arc_ch4", name="AFCI Arc CH4", icon="mdi:flash-alert", entity_registry_enabled_default=False),
-    149: EG4ModbusSensorEntityDescription(key="afci_max_arc_ch1", name="AFCI Max Arc CH1", icon="mdi:flash", entity_registry_enabled_default=False),
-    150: EG4ModbusSensorEntityDescription(key="afci_max_arc_ch2", name="AFCI Max Arc CH2", icon="mdi:flash", entity_registry_enabled_default=False),
-    151: EG4ModbusSensorEntityDescription(key="afci_max_arc_ch3", name="AFCI Max Arc CH3", icon="mdi:flash", entity_registry_enabled_default=False),
-    152: EG4ModbusSensorEntityDescription(key="afci_max_arc_ch4", name="AFCI Max Arc CH4", icon="mdi:flash", entity_registry_enabled_default=False),
-    # --- Calculated Sensors ---
-    -1: EG4ModbusSensorEntityDescription(key="power_pv_total", name="Power PV Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
-    -2: EG4ModbusSensorEntityDescription(key="power_battery_total", name="Power Battery Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:home-battery-outline"),
-    -3: EG4ModbusSensorEntityDescription(key="energy_daily_pv_total", name="Energy Daily PV Total", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, icon="mdi:solar-power", suggested_display_precision=1),
-    -4: EG4ModbusSensorEntityDescription(key="energy_cumulative_pv", name="Energy Cumulative PV", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, icon="mdi:solar-power", suggested_display_precision=1),
-    -5: EG4ModbusBinarySensorEntityDescription(key="inverter_time_accurate", name="Inverter Time Accurate", device_class=BinarySensorDeviceClass.CONNECTIVITY, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),  ### DOES NOT WORK
-    -6: EG4ModbusSensorEntityDescription(key="parallel_master_slave", name="Parallel Master/Slave", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -7: EG4ModbusSensorEntityDescription(key="parallel_phase", name="Parallel Phase", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -8: EG4ModbusSensorEntityDescription(key="parallel_number", name="Parallel Number", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -9: EG4ModbusSensorEntityDescription(key="power_grid_total", name="Power Grid Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower"),
-    -10: EG4ModbusSensorEntityDescription(key="voltage_pv_average", name="Voltage PV Average", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
-    -11: EG4ModbusSensorEntityDescription(key="inverter_uptime_minutes", name="Inverter Uptime (minutes)", native_unit_of_measurement=UnitOfTime.MINUTES, state_class=SensorStateClass.MEASUREMENT, icon="mdi:timer-plus-outline", entity_registry_enabled_default=False),
-    -12: EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch1", name="AFCI Alarm CH1", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -13: EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch2", name="AFCI Alarm CH2", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -14: EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch3", name="AFCI Alarm CH3", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -15: EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch4", name="AFCI Alarm CH4", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    -16: EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch1", name="AFCI Self-Test CH1", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
-    -17: EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch2", name="AFCI Self-Test CH2", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
-    -18: EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch3", name="AFCI Self-Test CH3", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
-    -19: EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch4", name="AFCI Self-Test CH4", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
-}
-
-# --- Holding Registers (Function Codes 0x03, 0x06, 0x10) ---
-# A single dictionary for all holding registers. The setup process will determine
-# whether to create a sensor, number, or select entity based on the description type.
-HOLDING_REGISTERS: dict[int, Union[EG4ModbusSensorEntityDescription, EG4ModbusNumberEntityDescription, EG4ModbusSelectEntityDescription]] = {
-    9: EG4ModbusSensorEntityDescription(key="info_com_version", name="Info COM Version", icon="mdi:information-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    10: EG4ModbusSensorEntityDescription(key="info_controller_version", name="Info Control Version", icon="mdi:information-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
-    22: EG4ModbusNumberEntityDescription(key="setting_voltage_pv_start", name="PV Start Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=90, native_max_value=500),
-    23: EG4ModbusNumberEntityDescription(key="setting_time_grid_connection_wait", name="Grid Connection Wait Time", native_unit_of_measurement=UnitOfTime.SECONDS, icon="mdi:cogs", native_min_value=30, native_max_value=600),
-    24: EG4ModbusNumberEntityDescription(key="setting_time_reconnection_wait", name="Reconnection Wait Time", native_unit_of_measurement=UnitOfTime.SECONDS, icon="mdi:cogs", native_min_value=0, native_max_value=900),
-    64: EG4ModbusNumberEntityDescription(key="setting_percent_charge_power", name="Charge Power Percentage", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    65: EG4ModbusNumberEntityDescription(key="setting_percent_discharge_power", name="Discharge Power Percentage", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    66: EG4ModbusNumberEntityDescription(key="setting_percent_ac_charge_power", name="AC Charge Percentage", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    67: EG4ModbusNumberEntityDescription(key="setting_limit_soc_ac_charge", name="AC Charging SOC Limit", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    99: EG4ModbusNumberEntityDescription(key="setting_voltage_charge_ref", name="Charge Voltage Reference", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=50, native_max_value=59),
-    100: EG4ModbusNumberEntityDescription(key="setting_voltage_discharge_cutoff", name="Discharge Cutoff Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=50),
-    101: EG4ModbusNumberEntityDescription(key="setting_current_charge", name="Charge Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=140),
-    102: EG4ModbusNumberEntityDescription(key="setting_current_discharge", name="Discharge Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=140),
-    103: EG4ModbusNumberEntityDescription(key="setting_max_backflow_power", name="Max Backflow Power", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    105: EG4ModbusNumberEntityDescription(key="setting_eod_soc", name="EOD SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=10, native_max_value=90),
-    116: EG4ModbusNumberEntityDescription(key="setting_ptouser_start_discharge", name="Ptouser Start Discharge", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs", native_min_value=50, native_max_value=10000),
-    118: EG4ModbusNumberEntityDescription(key="setting_voltage_start_derating", name="Voltage Start Derating", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1),
-    119: EG4ModbusNumberEntityDescription(key="setting_power_offset_wct", name="Power Offset WCT", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs", native_min_value=-1000, native_max_value=1000),
-    125: EG4ModbusNumberEntityDescription(key="setting_soc_low_limit_inverter_discharge", name="SOC Low Limit Inverter Discharge", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    144: EG4ModbusNumberEntityDescription(key="setting_voltage_float_charge", name="Float Charge Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=50, native_max_value=56),
-    147: EG4ModbusNumberEntityDescription(key="setting_battery_capacity", name="Battery Capacity", native_unit_of_measurement="Ah", icon="mdi:cogs", native_min_value=0, native_max_value=10000),
-    148: EG4ModbusNumberEntityDescription(key="setting_battery_nominal_voltage", name="Battery Nominal Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=59),
-    149: EG4ModbusNumberEntityDescription(key="setting_voltage_equalization", name="Equalization Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=50, native_max_value=59),
-    150: EG4ModbusNumberEntityDescription(key="setting_equalization_interval", name="Equalization Interval", native_unit_of_measurement=UnitOfTime.DAYS, icon="mdi:cogs", native_min_value=0, native_max_value=365),
-    151: EG4ModbusNumberEntityDescription(key="setting_equalization_time", name="Equalization Time", native_unit_of_measurement=UnitOfTime.HOURS, icon="mdi:cogs", native_min_value=0, native_max_value=24),
-    158: EG4ModbusNumberEntityDescription(key="setting_voltage_ac_charge_start", name="AC Charge Start Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=38.4, native_max_value=52),
-    159: EG4ModbusNumberEntityDescription(key="setting_voltage_ac_charge_end", name="AC Charge End Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=48, native_max_value=59),
-    160: EG4ModbusNumberEntityDescription(key="setting_soc_ac_charge_start", name="AC Charge Start SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=90),
-    161: EG4ModbusNumberEntityDescription(key="setting_soc_ac_charge_end", name="AC Charge End SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=20, native_max_value=100),
-    162: EG4ModbusNumberEntityDescription(key="setting_voltage_battery_low", name="Battery Low Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=50),
-    163: EG4ModbusNumberEntityDescription(key="setting_voltage_battery_low_back", name="Battery Low Back Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=42, native_max_value=52),
-    164: EG4ModbusNumberEntityDescription(key="setting_soc_battery_low", name="Battery Low SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=90),
-    165: EG4ModbusNumberEntityDescription(key="setting_soc_battery_low_back", name="Battery Low Back SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=20, native_max_value=100),
-    166: EG4ModbusNumberEntityDescription(key="setting_voltage_battery_low_to_utility", name="Battery Low to Utility Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=44.4, native_max_value=51.4),
-    167: EG4ModbusNumberEntityDescription(key="setting_soc_battery_low_to_utility", name="Battery Low to Utility SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
-    168: EG4ModbusNumberEntityDescription(key="setting_current_ac_charge_battery", name="AC Charge Battery Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=140),
-    169: EG4ModbusNumberEntityDescription(key="setting_voltage_ongrid_eod", name="Ongrid EOD Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=56),
-    176: EG4ModbusNumberEntityDescription(key="setting_power_max_grid_input", name="Max Grid Input Power", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs"),
-    177: EG4ModbusNumberEntityDescription(key="setting_power_gen_rated", name="Gen Rated Power", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs"),
-    194: EG4ModbusNumberEntityDescription(key="setting_voltage_gen_charge_start", name="Gen Charge Start Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=38.4, native_max_value=52),
-    195: EG4ModbusNumberEntityDescription(key="setting_voltage_gen_charge_end", name="Gen Charge End Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=48, native_max_value=59),
-    196: EG4ModbusNumberEntityDescription(key="setting_soc_gen_charge_start", name="Gen Charge Start SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=90),
-    197: EG4ModbusNumberEntityDescription(key="setting_soc_gen_charge_end", name="Gen Charge End SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=20, native_max_value=100),
-    198: EG4ModbusNumberEntityDescription(key="setting_current_max_gen_charge_battery", name="Max Gen Charge Battery Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=60),
-    16: EG4ModbusSelectEntityDescription(key="setting_language", name="Language", icon="mdi:cogs", options=["English", "German"]),
-    20: EG4ModbusSelectEntityDescription(key="setting_pv_input_model", name="PV Input Model", icon="mdi:cogs", options=["No PV", "PV1 in", "PV2 in", "PV3 in", "PV1&2 in", "PV1&3 in", "PV2&3 in", "PV1&2&3 in"]),
-    90: EG4ModbusSelectEntityDescription(key="setting_voltage_inverter", name="Inverter Voltage", icon="mdi:cogs", options=["230", "240", "277", "208"]),
-    91: EG4ModbusSelectEntityDescription(key="setting_frequency_inverter", name="Inverter Frequency", icon="mdi:cogs", options=["50", "60"]),
-    112: EG4ModbusSelectEntityDescription(key="setting_system_type", name="System Type", icon="mdi:cogs", options=["No Parallel", "Single Phase Parallel (Master)", "Slave", "Three Phase Parallel (Master)"]),
-    145: EG4ModbusSelectEntityDescription(key="setting_output_priority_config", name="Output Priority Config", icon="mdi:cogs", options=["Battery First", "PV First", "AC First"]),
-    146: EG4ModbusSelectEntityDescription(key="setting_line_mode", name="Line Mode", icon="mdi:cogs", options=["APL", "UPS", "GEN"]),
-}
+    address: Optional[int] = None
+    registers: int = 1
+    signed: bool = False
+    scale: float = 1.0
+    shift: int = 0
+    mask: Optional[int] = None
+    value_map: Optional[dict] = None
+    value_fn: Optional[Callable[[int], Any]] = None
+    tier: str = TIER_SETTINGS
 
 
 # --- Enums and Flags ---
@@ -302,4 +202,352 @@ WARNING_CODES = {
     (1 << 23): "PV short", (1 << 25): "Battery voltage high", (1 << 26): "Battery voltage low",
     (1 << 27): "Battery open circuit", (1 << 28): "EPS overload", (1 << 29): "EPS voltage high",
     (1 << 30): "Meter reverse connection", (1 << 31): "DCV high",
-}
\ No newline at end of file
+}
+
+
+FAULT_TABLE = BitmaskTable(FAULT_CODES)
+WARNING_TABLE = BitmaskTable(WARNING_CODES)
+
+
+def code_bit_sensors(word: str, address: int, codes: dict) -> tuple[EG4ModbusBinarySensorEntityDescription, ...]:
+    """Return a problem binary sensor per known bit of a fault or warning word."""
+    return tuple(
+        EG4ModbusBinarySensorEntityDescription(key=f"{word}_{slugify(message)}", address=address, registers=2, shift=mask.bit_length() - 1, mask=0x01, name=f"{word.capitalize()} {message}", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False)
+        for mask, message in codes.items()
+    )
+
+
+CODE_BIT_SENSORS = code_bit_sensors("fault", 60, FAULT_CODES) + code_bit_sensors("warning", 62, WARNING_CODES)
+
+
+def translate_bitmask_to_messages(code: int, message_map: dict) -> str:
+    """
+    Translate a bitmask code into a comma-separated string of messages, testing
+    every known bit. The fault and warning words use the byte tables instead.
+    """
+    if not code:
+        return "No Faults"
+
+    messages = [
+        message for bit, message in message_map.items() if (code & bit)
+    ]
+    
+    if not messages:
+        return f"Unknown Code: {hex(code)}"
+
+    return ", ".join(messages)
+
+
+def inverter_time_accurate(raw: int) -> bool:
+    """Check the inverter clock (registers 12-14, one byte per field) against our own."""
+    year = 2000 + (raw & 0xFF)
+    month = (raw >> 8) & 0xFF
+    day = (raw >> 16) & 0xFF
+    hour = (raw >> 24) & 0xFF
+    minute = (raw >> 32) & 0xFF
+    second = (raw >> 40) & 0xFF
+    try:
+        inverter_time = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+    except ValueError:
+        _LOGGER.warning("Invalid date components received from inverter")
+        return False
+    return abs(dt_util.utcnow() - inverter_time) <= timedelta(seconds=30)
+
+
+# Inclusive (first, last) register ranges the inverter refuses to read. The read
+# planner never bridges a gap through them. Each hub adds the ranges the register
+# map discovered for its firmware.
+UNREADABLE_REGISTERS: dict[str, tuple[tuple[int, int], ...]] = {
+    "input": (),
+    "holding": (),
+}
+
+# --- Input Registers (Function Code 0x04) ---
+INPUT_REGISTERS: tuple[Union[EG4ModbusSensorEntityDescription, EG4ModbusBinarySensorEntityDescription], ...] = (
+    EG4ModbusSensorEntityDescription(key="inverter_state", address=0, value_map=INVERTER_STATUS_CODES, tier=TIER_FAST, name="Inverter State", icon="mdi:information-outline"),
+    EG4ModbusSensorEntityDescription(key="voltage_pv1", address=1, scale=0.1, name="Voltage PV1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="voltage_pv2", address=2, scale=0.1, name="Voltage PV2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_pv3", address=3, scale=0.1, name="Voltage PV3", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_battery", address=4, scale=0.1, name="Voltage Battery", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="battery_soc", address=5, mask=0xFF, tier=TIER_FAST, name="Battery SOC", native_unit_of_measurement=PERCENTAGE, device_class=SensorDeviceClass.BATTERY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="battery_soh", address=5, shift=8, mask=0xFF, tier=TIER_SLOW, name="Battery SOH", native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT, icon="mdi:heart-pulse", suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="power_pv1", address=7, tier=TIER_FAST, name="Power PV1", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="power_pv2", address=8, tier=TIER_FAST, name="Power PV2", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power", suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_pv3", address=9, tier=TIER_FAST, name="Power PV3", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power", suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_battery_charge", address=10, tier=TIER_FAST, name="Power Battery Charge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="power_battery_discharge", address=11, tier=TIER_FAST, name="Power Battery Discharge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="voltage_grid_l1l2", address=12, scale=0.1, tier=TIER_FAST, name="Voltage Grid L1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="voltage_grid_l2l3", address=13, scale=0.1, tier=TIER_FAST, name="Voltage Grid L2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_grid_l3l1", address=14, scale=0.1, tier=TIER_FAST, name="Voltage Grid L3", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="frequency_grid", address=15, scale=0.01, tier=TIER_FAST, name="Frequency Grid", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_inverter_output", address=16, tier=TIER_FAST, name="Power Inverter Output", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="power_ac_charge", address=17, tier=TIER_FAST, name="Power AC Charge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="current_inverter_rms", address=18, scale=0.01, name="Current Inverter RMS", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="power_factor_inverter", address=19, scale=0.001, name="Power Factor Inverter", device_class=SensorDeviceClass.POWER_FACTOR, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_inverter_l1l2", address=20, scale=0.1, name="Voltage Inverter L1-L2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="voltage_inverter_l2l3", address=21, scale=0.1, name="Voltage Inverter L2-L3", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_inverter_l3l1", address=22, scale=0.1, name="Voltage Inverter L3-L1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="frequency_inverter", address=23, scale=0.01, name="Frequency Inverter", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_inverter", address=24, tier=TIER_FAST, name="Power Inverter", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="power_apparent_inverter", address=25, tier=TIER_FAST, name="Power Apparent Inverter", native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE, device_class=SensorDeviceClass.APPARENT_POWER, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_grid_export", address=26, tier=TIER_FAST, name="Power Grid Export", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower-export"),
+    EG4ModbusSensorEntityDescription(key="power_grid_import", address=27, tier=TIER_FAST, name="Power Grid Import", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower-import"),
+    EG4ModbusSensorEntityDescription(key="energy_daily_pv1", address=28, scale=0.1, name="Energy Daily PV1", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="energy_daily_pv2", address=29, scale=0.1, name="Energy Daily PV2", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="energy_daily_pv3", address=30, scale=0.1, name="Energy Daily PV3", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="energy_daily_inverter_output", address=31, scale=0.1, name="Energy Daily Inverter Output", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_daily_ac_charge", address=32, scale=0.1, name="Energy Daily AC Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_daily_battery_charge", address=33, scale=0.1, name="Energy Daily Battery Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_daily_battery_discharge", address=34, scale=0.1, name="Energy Daily Battery Discharge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_daily_inverter", address=35, scale=0.1, name="Energy Daily Inverter", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_daily_grid_export", address=36, scale=0.1, name="Energy Daily Grid Export", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_daily_grid_import", address=37, scale=0.1, name="Energy Daily Grid Import", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="voltage_bus_1", address=38, scale=0.1, name="Voltage Bus 1", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_bus_2", address=39, scale=0.1, name="Voltage Bus 2", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_pv1", address=40, registers=2, scale=0.1, name="Energy Cumulative PV1", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_pv2", address=42, registers=2, scale=0.1, name="Energy Cumulative PV2", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_pv3", address=44, registers=2, scale=0.1, name="Energy Cumulative PV3", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter_output", address=46, registers=2, scale=0.1, name="Energy Cumulative Inverter Output", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_ac_charge", address=48, registers=2, scale=0.1, name="Energy Cumulative AC Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_battery_charge", address=50, registers=2, scale=0.1, name="Energy Cumulative Battery Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_battery_discharge", address=52, registers=2, scale=0.1, name="Energy Cumulative Battery Discharge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter", address=54, registers=2, scale=0.1, name="Energy Cumulative Inverter", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_grid_export", address=56, registers=2, scale=0.1, name="Energy Cumulative Grid Export", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_grid_import", address=58, registers=2, scale=0.1, name="Energy Cumulative Grid Import", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="fault_code", address=60, registers=2, value_fn=FAULT_TABLE.messages, name="Fault Code", icon="mdi:alert-octagon", entity_category=EntityCategory.DIAGNOSTIC),
+    EG4ModbusSensorEntityDescription(key="warning_code", address=62, registers=2, value_fn=WARNING_TABLE.messages, name="Warning Code", icon="mdi:alert-outline", entity_category=EntityCategory.DIAGNOSTIC),
+    *CODE_BIT_SENSORS,
+    EG4ModbusSensorEntityDescription(key="temperature_internal", address=64, signed=True, name="Temperature Internal", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="temperature_heatsink_dc", address=65, signed=True, name="Heatsink Temperature DC", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_heatsink_ac", address=66, signed=True, name="Heatsink Temperature AC", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_battery", address=67, signed=True, name="Temperature Battery", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="inverter_on_time", address=69, registers=2, value_fn=lambda seconds: datetime.now(timezone.utc) - timedelta(seconds=seconds), name="Inverter ON time", icon="mdi:timer-outline", device_class=SensorDeviceClass.TIMESTAMP, entity_category=EntityCategory.DIAGNOSTIC),
+    EG4ModbusSensorEntityDescription(key="inverter_uptime_minutes", address=69, registers=2, scale=1 / 60, name="Inverter Uptime (minutes)", native_unit_of_measurement=UnitOfTime.MINUTES, state_class=SensorStateClass.MEASUREMENT, icon="mdi:timer-plus-outline", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="auto_test_status", address=71, shift=4, mask=0x0F, name="Auto Test Status", icon="mdi:play-box-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="ac_input_type", address=77, mask=0x01, value_map=AC_INPUT_TYPE_CODES, name="AC Input Type", icon="mdi:power-plug"),
+    EG4ModbusSensorEntityDescription(key="bms_current_max_charge", address=81, scale=0.01, tier=TIER_SLOW, name="BMS Current Max Charge", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_current_max_discharge", address=82, scale=0.01, tier=TIER_SLOW, name="BMS Current Max Discharge", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_voltage_charge_ref", address=83, scale=0.1, tier=TIER_SLOW, name="BMS Voltage Charge Reference", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_voltage_discharge_cutoff", address=84, scale=0.1, tier=TIER_SLOW, name="BMS Voltage Discharge Cutoff", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_0", address=85, name="BMS Status 0", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_1", address=86, name="BMS Status 1", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_2", address=87, name="BMS Status 2", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_3", address=88, name="BMS Status 3", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_4", address=89, name="BMS Status 4", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_5", address=90, name="BMS Status 5", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_6", address=91, name="BMS Status 6", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_7", address=92, name="BMS Status 7", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_8", address=93, name="BMS Status 8", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_9", address=94, name="BMS Status 9", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_status_inv", address=95, name="BMS Status Inverter Summary", icon="mdi:battery-heart-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="battery_parallel_num", address=96, tier=TIER_SLOW, name="Battery Parallel Number", icon="mdi:battery-plus-variant", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="battery_capacity_ah", address=97, tier=TIER_SLOW, name="Battery Capacity", native_unit_of_measurement="Ah", icon="mdi:battery-charging", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_current_battery", address=98, signed=True, scale=0.1, name="BMS Current Battery", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="bms_fault_code", address=99, name="Fault Code BMS", icon="mdi:alert-octagon", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_warning_code", address=100, name="Warning Code BMS", icon="mdi:alert-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_voltage_max_cell", address=101, scale=0.001, name="BMS Voltage Max Cell", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2),
+    EG4ModbusSensorEntityDescription(key="bms_voltage_min_cell", address=102, scale=0.001, name="BMS Voltage Min Cell", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2),
+    EG4ModbusSensorEntityDescription(key="bms_temperature_max_cell", address=103, signed=True, scale=0.1, name="BMS Temperature Max Cell", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="bms_temperature_min_cell", address=104, signed=True, scale=0.1, name="BMS Temperature Min Cell", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="bms_fw_update_state", address=105, tier=TIER_SLOW, name="BMS FW Update State", icon="mdi:update", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="bms_cycle_count", address=106, tier=TIER_SLOW, name="Battery Cycle Count", icon="mdi:recycle", state_class=SensorStateClass.TOTAL_INCREASING),
+    EG4ModbusSensorEntityDescription(key="voltage_battery_sample_inverter", address=107, scale=0.1, name="Voltage Battery Sample Inverter", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_t1", address=108, signed=True, scale=0.1, name="Temperature T1", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_t2", address=109, signed=True, scale=0.1, name="Temperature T2", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_t3", address=110, signed=True, scale=0.1, name="Temperature T3", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_t4", address=111, signed=True, scale=0.1, name="Temperature T4", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="temperature_t5", address=112, signed=True, scale=0.1, name="Temperature T5", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="parallel_master_slave", address=113, mask=0x03, tier=TIER_SLOW, name="Parallel Master/Slave", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="parallel_phase", address=113, shift=2, mask=0x03, tier=TIER_SLOW, name="Parallel Phase", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="parallel_number", address=113, shift=8, mask=0xFF, tier=TIER_SLOW, name="Parallel Number", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_bus_p", address=120, scale=0.1, name="Voltage Bus P", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_generator", address=121, scale=0.1, name="Voltage Generator", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="frequency_generator", address=122, scale=0.01, name="Frequency Generator", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_generator", address=123, tier=TIER_FAST, name="Power Generator", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_daily_generator", address=124, scale=0.1, name="Energy Daily Generator", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_generator", address=125, registers=2, scale=0.1, name="Energy Cumulative Generator", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_inverter_l1n", address=127, scale=0.1, name="Voltage Inverter L1-N", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="voltage_inverter_l2n", address=128, scale=0.1, name="Voltage Inverter L2-N", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_inverter_l1n", address=129, tier=TIER_FAST, name="Power Inverter L1-N", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_inverter_l2n", address=130, tier=TIER_FAST, name="Power Inverter L2-N", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_apparent_inverter_l1n", address=131, tier=TIER_FAST, name="Power Apparent Inverter L1-N", native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE, device_class=SensorDeviceClass.APPARENT_POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="power_apparent_inverter_l2n", address=132, tier=TIER_FAST, name="Power Apparent Inverter L2-N", native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE, device_class=SensorDeviceClass.APPARENT_POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=0, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_daily_inverter_l1n", address=133, scale=0.1, name="Energy Daily Inverter L1-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_daily_inverter_l2n", address=134, scale=0.1, name="Energy Daily Inverter L2-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter_l1n", address=135, registers=2, scale=0.1, name="Energy Cumulative Inverter L1-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_inverter_l2n", address=137, registers=2, scale=0.1, name="Energy Cumulative Inverter L2-N", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="current_afci_ch1", address=140, scale=0.1, name="Current AFCI CH1", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="current_afci_ch2", address=141, scale=0.1, name="Current AFCI CH2", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="current_afci_ch3", address=142, scale=0.1, name="Current AFCI CH3", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="current_afci_ch4", address=143, scale=0.1, name="Current AFCI CH4", native_unit_of_measurement="mA", device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1, entity_registry_enabled_default=False),
+    EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch1", address=144, shift=0, mask=0x01, name="AFCI Alarm CH1", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch2", address=144, shift=1, mask=0x01, name="AFCI Alarm CH2", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch3", address=144, shift=2, mask=0x01, name="AFCI Alarm CH3", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusBinarySensorEntityDescription(key="afci_alarm_ch4", address=144, shift=3, mask=0x01, name="AFCI Alarm CH4", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch1", address=144, shift=4, mask=0x01, name="AFCI Self-Test CH1", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
+    EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch2", address=144, shift=5, mask=0x01, name="AFCI Self-Test CH2", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
+    EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch3", address=144, shift=6, mask=0x01, name="AFCI Self-Test CH3", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
+    EG4ModbusBinarySensorEntityDescription(key="afci_selftest_ch4", address=144, shift=7, mask=0x01, name="AFCI Self-Test CH4", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False, icon="mdi:alert"),
+    EG4ModbusSensorEntityDescription(key="afci_arc_ch1", address=145, name="AFCI Arc CH1", icon="mdi:flash-alert", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_arc_ch2", address=146, name="AFCI Arc CH2", icon="mdi:flash-alert", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_arc_ch3", address=147, name="AFCI Arc CH3", icon="mdi:flash-alert", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_arc_ch4", address=148, name="AFCI Arc CH4", icon="mdi:flash-alert", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_max_arc_ch1", address=149, name="AFCI Max Arc CH1", icon="mdi:flash", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_max_arc_ch2", address=150, name="AFCI Max Arc CH2", icon="mdi:flash", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_max_arc_ch3", address=151, name="AFCI Max Arc CH3", icon="mdi:flash", entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="afci_max_arc_ch4", address=152, name="AFCI Max Arc CH4", icon="mdi:flash", entity_registry_enabled_default=False),
+    # --- Calculated Sensors ---
+    EG4ModbusSensorEntityDescription(key="power_pv_total", sources=("power_pv1", "power_pv2", "power_pv3"), name="Power PV Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="power_battery_total", sources=("power_battery_charge", "power_battery_discharge"), name="Power Battery Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:home-battery-outline"),
+    EG4ModbusSensorEntityDescription(key="energy_daily_pv_total", sources=("energy_daily_pv1", "energy_daily_pv2", "energy_daily_pv3"), name="Energy Daily PV Total", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, icon="mdi:solar-power", suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="energy_cumulative_pv", sources=("energy_cumulative_pv1", "energy_cumulative_pv2", "energy_cumulative_pv3"), name="Energy Cumulative PV", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, icon="mdi:solar-power", suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="power_grid_total", sources=("power_grid_import", "power_grid_export"), name="Power Grid Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower"),
+    EG4ModbusSensorEntityDescription(key="voltage_pv_average", sources=("voltage_pv1", "voltage_pv2", "voltage_pv3"), name="Voltage PV Average", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="modbus_reconnects", name="Modbus Reconnects", icon="mdi:lan-disconnect", state_class=SensorStateClass.TOTAL_INCREASING, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_requests", name="Modbus Requests", icon="mdi:swap-horizontal", state_class=SensorStateClass.TOTAL_INCREASING, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_errors", name="Modbus Errors", icon="mdi:alert-circle-outline", state_class=SensorStateClass.TOTAL_INCREASING, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_latency", name="Modbus Latency", icon="mdi:timer-outline", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_queue_wait", name="Modbus Queue Wait", icon="mdi:timer-sand", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="poll_latency", name="Poll Latency", icon="mdi:timer-outline", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="entity_writes_per_poll", name="Entity Writes Per Poll", icon="mdi:database-arrow-down", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="entity_writes_skipped_per_poll", name="Entity Writes Skipped Per Poll", icon="mdi:database-off-outline", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_block_rtt_p50", name="Modbus Block RTT p50", icon="mdi:timer-outline", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_block_rtt_p95", name="Modbus Block RTT p95", icon="mdi:timer-outline", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_block_rtt_max", name="Modbus Block RTT Max", icon="mdi:timer-alert-outline", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_slowest_block", name="Modbus Slowest Block", icon="mdi:snail", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_retries", name="Modbus Retries", icon="mdi:refresh", state_class=SensorStateClass.TOTAL_INCREASING, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_bytes", name="Modbus Bytes Transferred", icon="mdi:swap-horizontal", native_unit_of_measurement=UnitOfInformation.BYTES, device_class=SensorDeviceClass.DATA_SIZE, state_class=SensorStateClass.TOTAL_INCREASING, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_last_error", name="Modbus Last Error", icon="mdi:alert-circle-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_oldest_block_success", name="Modbus Oldest Block Success", icon="mdi:clock-check-outline", device_class=SensorDeviceClass.TIMESTAMP, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_scan_interval", name="Modbus Scan Interval", icon="mdi:timer-cog-outline", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="modbus_circuit", name="Modbus Circuit Breaker", icon="mdi:electric-switch", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+)
+
+# --- Holding Registers (Function Codes 0x03, 0x06, 0x10) ---
+# A single tuple for all holding registers. The setup process will determine
+# whether to create a sensor, number, or select entity based on the description type.
+HOLDING_REGISTERS: tuple[Union[EG4ModbusSensorEntityDescription, EG4ModbusBinarySensorEntityDescription, EG4ModbusNumberEntityDescription, EG4ModbusSelectEntityDescription], ...] = (
+    EG4ModbusSensorEntityDescription(key="info_com_version", address=9, shift=8, mask=0xFF, tier=TIER_SETTINGS, name="Info COM Version", icon="mdi:information-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="info_controller_version", address=10, mask=0xFF, tier=TIER_SETTINGS, name="Info Control Version", icon="mdi:information-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusBinarySensorEntityDescription(key="inverter_time_accurate", address=12, registers=3, value_fn=inverter_time_accurate, tier=TIER_SLOW, name="Inverter Time Accurate", device_class=BinarySensorDeviceClass.CONNECTIVITY, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="setting_address_communication", address=15, tier=TIER_SETTINGS, name="Communication Address", icon="mdi:information-outline", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_pv_start", address=22, scale=0.1, name="PV Start Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", native_min_value=90, native_max_value=500),
+    EG4ModbusNumberEntityDescription(key="setting_time_grid_connection_wait", address=23, name="Grid Connection Wait Time", native_unit_of_measurement=UnitOfTime.SECONDS, icon="mdi:cogs", native_min_value=30, native_max_value=600),
+    EG4ModbusNumberEntityDescription(key="setting_time_reconnection_wait", address=24, name="Reconnection Wait Time", native_unit_of_measurement=UnitOfTime.SECONDS, icon="mdi:cogs", native_min_value=0, native_max_value=900),
+    EG4ModbusNumberEntityDescription(key="setting_percent_charge_power", address=64, name="Charge Power Percentage", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_percent_discharge_power", address=65, name="Discharge Power Percentage", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_percent_ac_charge_power", address=66, name="AC Charge Percentage", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_limit_soc_ac_charge", address=67, name="AC Charging SOC Limit", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_charge_ref", address=99, name="Charge Voltage Reference", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=50, native_max_value=59),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_discharge_cutoff", address=100, name="Discharge Cutoff Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=50),
+    EG4ModbusNumberEntityDescription(key="setting_current_charge", address=101, scale=0.1, name="Charge Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=140),
+    EG4ModbusNumberEntityDescription(key="setting_current_discharge", address=102, scale=0.1, name="Discharge Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=140),
+    EG4ModbusNumberEntityDescription(key="setting_max_backflow_power", address=103, name="Max Backflow Power", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_eod_soc", address=105, name="EOD SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=10, native_max_value=90),
+    EG4ModbusSensorEntityDescription(key="setting_temp_low_limit_discharge", address=106, signed=True, scale=0.1, tier=TIER_SETTINGS, name="Discharge Temperature Low Limit", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="setting_temp_high_limit_discharge", address=107, signed=True, scale=0.1, tier=TIER_SETTINGS, name="Discharge Temperature High Limit", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="setting_temp_low_limit_charge", address=108, signed=True, scale=0.1, tier=TIER_SETTINGS, name="Charge Temperature Low Limit", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="setting_temp_high_limit_charge", address=109, signed=True, scale=0.1, tier=TIER_SETTINGS, name="Charge Temperature High Limit", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusSensorEntityDescription(key="setting_composed_phase", address=113, tier=TIER_SETTINGS, name="Composed Phase", icon="mdi:vector-combine", entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+    EG4ModbusNumberEntityDescription(key="setting_ptouser_start_discharge", address=116, name="Ptouser Start Discharge", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs", native_min_value=50, native_max_value=10000),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_start_derating", address=118, name="Voltage Start Derating", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1),
+    EG4ModbusNumberEntityDescription(key="setting_power_offset_wct", address=119, signed=True, name="Power Offset WCT", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs", native_min_value=-1000, native_max_value=1000),
+    EG4ModbusNumberEntityDescription(key="setting_soc_low_limit_inverter_discharge", address=125, name="SOC Low Limit Inverter Discharge", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_float_charge", address=144, name="Float Charge Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=50, native_max_value=56),
+    EG4ModbusNumberEntityDescription(key="setting_battery_capacity", address=147, name="Battery Capacity", native_unit_of_measurement="Ah", icon="mdi:cogs", native_min_value=0, native_max_value=10000),
+    EG4ModbusNumberEntityDescription(key="setting_battery_nominal_voltage", address=148, name="Battery Nominal Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=59),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_equalization", address=149, name="Equalization Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=50, native_max_value=59),
+    EG4ModbusNumberEntityDescription(key="setting_equalization_interval", address=150, name="Equalization Interval", native_unit_of_measurement=UnitOfTime.DAYS, icon="mdi:cogs", native_min_value=0, native_max_value=365),
+    EG4ModbusNumberEntityDescription(key="setting_equalization_time", address=151, name="Equalization Time", native_unit_of_measurement=UnitOfTime.HOURS, icon="mdi:cogs", native_min_value=0, native_max_value=24),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_ac_charge_start", address=158, name="AC Charge Start Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=38.4, native_max_value=52),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_ac_charge_end", address=159, name="AC Charge End Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=48, native_max_value=59),
+    EG4ModbusNumberEntityDescription(key="setting_soc_ac_charge_start", address=160, name="AC Charge Start SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=90),
+    EG4ModbusNumberEntityDescription(key="setting_soc_ac_charge_end", address=161, name="AC Charge End SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=20, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_battery_low", address=162, name="Battery Low Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=50),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_battery_low_back", address=163, name="Battery Low Back Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=42, native_max_value=52),
+    EG4ModbusNumberEntityDescription(key="setting_soc_battery_low", address=164, name="Battery Low SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=90),
+    EG4ModbusNumberEntityDescription(key="setting_soc_battery_low_back", address=165, name="Battery Low Back SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=20, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_battery_low_to_utility", address=166, name="Battery Low to Utility Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=44.4, native_max_value=51.4),
+    EG4ModbusNumberEntityDescription(key="setting_soc_battery_low_to_utility", address=167, name="Battery Low to Utility SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_current_ac_charge_battery", address=168, scale=0.1, name="AC Charge Battery Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=140),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_ongrid_eod", address=169, name="Ongrid EOD Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=40, native_max_value=56),
+    EG4ModbusNumberEntityDescription(key="setting_power_max_grid_input", address=176, name="Max Grid Input Power", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs"),
+    EG4ModbusNumberEntityDescription(key="setting_power_gen_rated", address=177, name="Gen Rated Power", native_unit_of_measurement=UnitOfPower.WATT, icon="mdi:cogs"),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_gen_charge_start", address=194, name="Gen Charge Start Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=38.4, native_max_value=52),
+    EG4ModbusNumberEntityDescription(key="setting_voltage_gen_charge_end", address=195, name="Gen Charge End Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, icon="mdi:cogs", scale=0.1, native_min_value=48, native_max_value=59),
+    EG4ModbusNumberEntityDescription(key="setting_soc_gen_charge_start", address=196, name="Gen Charge Start SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=0, native_max_value=90),
+    EG4ModbusNumberEntityDescription(key="setting_soc_gen_charge_end", address=197, name="Gen Charge End SOC", native_unit_of_measurement=PERCENTAGE, icon="mdi:cogs", native_min_value=20, native_max_value=100),
+    EG4ModbusNumberEntityDescription(key="setting_current_max_gen_charge_battery", address=198, scale=0.1, name="Max Gen Charge Battery Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, icon="mdi:cogs", native_min_value=0, native_max_value=60),
+    EG4ModbusSelectEntityDescription(key="setting_language", address=16, name="Language", icon="mdi:cogs", options=["English", "German"]),
+    EG4ModbusSelectEntityDescription(key="setting_pv_input_model", address=20, name="PV Input Model", icon="mdi:cogs", options=["No PV", "PV1 in", "PV2 in", "PV3 in", "PV1&2 in", "PV1&3 in", "PV2&3 in", "PV1&2&3 in"]),
+    EG4ModbusSelectEntityDescription(key="setting_voltage_inverter", address=90, name="Inverter Voltage", icon="mdi:cogs", options=["230", "240", "277", "208"]),
+    EG4ModbusSelectEntityDescription(key="setting_frequency_inverter", address=91, name="Inverter Frequency", icon="mdi:cogs", options=["50", "60"]),
+    EG4ModbusSelectEntityDescription(key="setting_system_type", address=112, name="System Type", icon="mdi:cogs", options=["No Parallel", "Single Phase Parallel (Master)", "Slave", "Three Phase Parallel (Master)"]),
+    EG4ModbusSelectEntityDescription(key="setting_output_priority_config", address=145, name="Output Priority Config", icon="mdi:cogs", options=["Battery First", "PV First", "AC First"]),
+    EG4ModbusSelectEntityDescription(key="setting_line_mode", address=146, name="Line Mode", icon="mdi:cogs", options=["APL", "UPS", "GEN"]),
+)
+
+
+# System totals of a parallel system, summed (SOC averaged) over the units whose
+# registers behind them were read in the same polling round. `sources` is the key
+# aggregated per unit.
+PARALLEL_SENSORS = (
+    EG4ModbusSensorEntityDescription(key="parallel_power_pv_total", sources=("power_pv_total",), name="Power PV Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="parallel_power_battery_total", sources=("power_battery_total",), name="Power Battery Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:home-battery-outline"),
+    EG4ModbusSensorEntityDescription(key="parallel_power_battery_charge", sources=("power_battery_charge",), name="Power Battery Charge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="parallel_power_battery_discharge", sources=("power_battery_discharge",), name="Power Battery Discharge", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="parallel_power_inverter", sources=("power_inverter",), name="Power Inverter", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT),
+    EG4ModbusSensorEntityDescription(key="parallel_power_grid_total", sources=("power_grid_total",), name="Power Grid Total", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower"),
+    EG4ModbusSensorEntityDescription(key="parallel_power_grid_import", sources=("power_grid_import",), name="Power Grid Import", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower-import"),
+    EG4ModbusSensorEntityDescription(key="parallel_power_grid_export", sources=("power_grid_export",), name="Power Grid Export", native_unit_of_measurement=UnitOfPower.WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, icon="mdi:transmission-tower-export"),
+    EG4ModbusSensorEntityDescription(key="parallel_energy_daily_pv_total", sources=("energy_daily_pv_total",), name="Energy Daily PV Total", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="parallel_energy_daily_battery_charge", sources=("energy_daily_battery_charge",), name="Energy Daily Battery Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="parallel_energy_daily_battery_discharge", sources=("energy_daily_battery_discharge",), name="Energy Daily Battery Discharge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="parallel_energy_daily_grid_import", sources=("energy_daily_grid_import",), name="Energy Daily Grid Import", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="parallel_energy_daily_grid_export", sources=("energy_daily_grid_export",), name="Energy Daily Grid Export", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="parallel_energy_cumulative_pv", sources=("energy_cumulative_pv",), name="Energy Cumulative PV", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL, suggested_display_precision=1, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="parallel_battery_soc", sources=("battery_soc",), name="Battery SOC", native_unit_of_measurement=PERCENTAGE, device_class=SensorDeviceClass.BATTERY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1),
+    EG4ModbusSensorEntityDescription(key="parallel_units_online", name="Units Online", icon="mdi:server-network", state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC),
+    EG4ModbusSensorEntityDescription(key="parallel_poll_window", name="Poll Window", icon="mdi:timer-outline", native_unit_of_measurement=UnitOfTime.MILLISECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, entity_category=EntityCategory.DIAGNOSTIC, entity_registry_enabled_default=False),
+)
+
+# Power values sampled several times a second when power sampling is on.
+SAMPLED_POWER_KEYS = (
+    "power_pv1", "power_pv2", "power_pv3",
+    "power_battery_charge", "power_battery_discharge",
+    "power_inverter_output", "power_inverter",
+    "power_grid_export", "power_grid_import",
+)
+
+# Min/max/mean of the samples in each reporting window, enabled like the value they sample.
+POWER_STATISTICS_SENSORS = tuple(
+    replace(
+        description,
+        key=f"{description.key}_{statistic}",
+        name=f"{description.name} {label}",
+        address=None,
+        tier=TIER_NORMAL,
+        suggested_display_precision=0,
+    )
+    for description in INPUT_REGISTERS
+    if description.key in SAMPLED_POWER_KEYS
+    for statistic, label in (("min", "Min"), ("max", "Max"), ("mean", "Mean"))
+)
+
+# Energy integrated from the power samples, and the power values each one sums.
+INTEGRATED_POWER_KEYS = {
+    "energy_integrated_pv": ("power_pv1", "power_pv2", "power_pv3"),
+    "energy_integrated_battery_charge": ("power_battery_charge",),
+    "energy_integrated_battery_discharge": ("power_battery_discharge",),
+    "energy_integrated_grid_export": ("power_grid_export",),
+    "energy_integrated_grid_import": ("power_grid_import",),
+}
+
+# The sources of each counter are the cumulative registers it is anchored to.
+ENERGY_INTEGRATION_SENSORS = (
+    EG4ModbusSensorEntityDescription(key="energy_integrated_pv", sources=("energy_cumulative_pv1", "energy_cumulative_pv2", "energy_cumulative_pv3"), name="Energy Integrated PV", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=3, icon="mdi:solar-power"),
+    EG4ModbusSensorEntityDescription(key="energy_integrated_battery_charge", sources=("energy_cumulative_battery_charge",), name="Energy Integrated Battery Charge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=3),
+    EG4ModbusSensorEntityDescription(key="energy_integrated_battery_discharge", sources=("energy_cumulative_battery_discharge",), name="Energy Integrated Battery Discharge", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=3),
+    EG4ModbusSensorEntityDescription(key="energy_integrated_grid_export", sources=("energy_cumulative_grid_export",), name="Energy Integrated Grid Export", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=3, icon="mdi:transmission-tower-export"),
+    EG4ModbusSensorEntityDescription(key="energy_integrated_grid_import", sources=("energy_cumulative_grid_import",), name="Energy Integrated Grid Import", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=3, icon="mdi:transmission-tower-import"),
+)
@@ -0,0 +1,213 @@
+"""Compile the register descriptions in const.py into flat decode plans."""
+from __future__ import annotations
+
+from array import array
+import logging
+from operator import itemgetter, mul, truediv
+import struct
+import sys
+from typing import Any, Callable, NamedTuple, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FieldPlan(NamedTuple):
+    """Everything needed to decode one key, precomputed at startup."""
+
+    key: str
+    offset: int
+    width: int
+    sign_bit: int
+    shift: int
+    mask: Optional[int]
+    divisor: float
+    multiplier: float
+    value_map: Optional[dict]
+    value_fn: Optional[Callable[[int], Any]]
+
+
+# struct codes for values of 1, 2 and 4 registers. Other widths are unpacked as raw bytes.
+_INT_CODES = {1: ("H", "h"), 2: ("I", "i"), 4: ("Q", "q")}
+
+
+def registers_to_buffer(registers) -> memoryview:
+    """
+    Lay the registers out as little-endian words, so a low-word-first pair is
+    also a little-endian 32-bit value. The array is viewed, not copied.
+    """
+    words = array("H", registers)
+    if sys.byteorder != "little":
+        words.byteswap()
+    return memoryview(words).cast("B")
+
+
+def payload_to_buffer(payload: bytes) -> memoryview:
+    """Turn a big-endian Modbus register payload into the little-endian layout of registers_to_buffer."""
+    words = array("H", payload)
+    if sys.byteorder == "little":
+        words.byteswap()
+    return memoryview(words).cast("B")
+
+
+def _slot_code(width: int, signed: bool) -> str:
+    """struct code for a value of `width` registers."""
+    codes = _INT_CODES.get(width)
+    return codes[signed] if codes else f"{2 * width}s"
+
+
+def _getter(indices: tuple[int, ...]) -> Callable[[tuple], tuple]:
+    """itemgetter that always returns a tuple, whatever the number of indices."""
+    if not indices:
+        return lambda values: ()
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indices)
+
+
+class DecodePlan:
+    """
+    The fields to pull out of one block of registers.
+
+    Every distinct register span of the block is unpacked by one precompiled
+    struct in a single pass over the payload, then values that only need
+    scaling are scaled in bulk. Bitfields, lookups and conversions are the only
+    fields handled one by one.
+    """
+
+    def __init__(self, start: int, count: int, fields: tuple[FieldPlan, ...]):
+        """Initialize the plan."""
+        self.start = start
+        self.count = count
+        self.fields = fields
+        self.keys = tuple(f.key for f in fields)
+        # Shortest response that still holds every field of the plan.
+        self.required = max((f.offset + f.width for f in fields), default=0)
+
+        # One struct slot per (offset, width, signed); bitfields of one register share it.
+        fmt = ["<"]
+        slots: dict[tuple[int, int, bool], int] = {}
+        overlapping: list[tuple[int, int, bool]] = []
+        cursor = 0
+        for field in fields:
+            slot = (field.offset, field.width, bool(field.sign_bit))
+            if slot in slots:
+                continue
+            if field.offset < cursor:
+                # Overlaps the previous slot, so it can't be part of the same pass.
+                overlapping.append(slot)
+                continue
+            if field.offset > cursor:
+                fmt.append(f"{2 * (field.offset - cursor)}x")
+            fmt.append(_slot_code(field.width, slot[2]))
+            slots[slot] = len(slots)
+            cursor = field.offset + field.width
+        self._struct = struct.Struct("".join(fmt))
+        self._overlapping = tuple(
+            struct.Struct(f"<{2 * offset}x{_slot_code(width, signed)}") for offset, width, signed in overlapping
+        )
+        for slot in overlapping:
+            slots[slot] = len(slots)
+
+        plain, divided, multiplied, other = [], [], [], []
+        for field in fields:
+            index = slots[(field.offset, field.width, bool(field.sign_bit))]
+            if field.width not in _INT_CODES or field.mask is not None or field.value_map is not None or field.value_fn is not None:
+                other.append((index, field))
+            elif field.divisor != 1:
+                divided.append((index, field))
+            elif field.multiplier != 1:
+                multiplied.append((index, field))
+            else:
+                plain.append((index, field))
+
+        self._plain_keys = tuple(f.key for _, f in plain)
+        self._plain = _getter(tuple(i for i, _ in plain))
+        self._divided_keys = tuple(f.key for _, f in divided)
+        self._divided = _getter(tuple(i for i, _ in divided))
+        self._divisors = tuple(f.divisor for _, f in divided)
+        self._multiplied_keys = tuple(f.key for _, f in multiplied)
+        self._multiplied = _getter(tuple(i for i, _ in multiplied))
+        self._multipliers = tuple(f.multiplier for _, f in multiplied)
+        self._other = tuple(other)
+
+    def apply(self, registers: list[int], data: dict) -> None:
+        """Decode every field of the plan from `registers` into `data`."""
+        if len(registers) < self.required:
+            _LOGGER.warning(f"Not enough registers to decode. Have {len(registers)}, need {self.required}")
+            raise IndexError("Not enough registers to decode")
+        self.apply_buffer(registers_to_buffer(registers), data)
+
+    def apply_payload(self, payload: bytes, data: dict) -> None:
+        """Decode every field of the plan from a raw big-endian register payload into `data`."""
+        if len(payload) < 2 * self.required:
+            _LOGGER.warning(f"Not enough registers to decode. Have {len(payload) // 2}, need {self.required}")
+            raise IndexError("Not enough registers to decode")
+        self.apply_buffer(payload_to_buffer(payload), data)
+
+    def apply_buffer(self, buffer: memoryview, data: dict) -> None:
+        """Decode every field of the plan from a buffer laid out by registers_to_buffer."""
+        values = self._struct.unpack_from(buffer)
+        if self._overlapping:
+            values += tuple(s.unpack_from(buffer)[0] for s in self._overlapping)
+
+        data.update(zip(self._plain_keys, self._plain(values)))
+        data.update(zip(self._divided_keys, map(truediv, self._divided(values), self._divisors)))
+        data.update(zip(self._multiplied_keys, map(mul, self._multiplied(values), self._multipliers)))
+
+        for index, (key, _, width, sign_bit, shift, mask, divisor, multiplier, value_map, value_fn) in self._other:
+            raw = values[index]
+            if width not in _INT_CODES:
+                raw = int.from_bytes(raw, "little", signed=bool(sign_bit))
+            if mask is not None:
+                raw = (raw >> shift) & mask
+
+            if value_fn is not None:
+                data[key] = value_fn(raw)
+            elif value_map is not None:
+                data[key] = value_map.get(raw, "Unknown")
+            elif divisor != 1:
+                data[key] = raw / divisor
+            elif multiplier != 1:
+                data[key] = raw * multiplier
+            else:
+                data[key] = raw
+
+
+def compile_field(description, offset: int) -> FieldPlan:
+    """Precompute the decode steps for one register description."""
+    width = description.registers
+    scale = description.scale
+    divisor = multiplier = 1
+    if scale != 1:
+        # Registers holding tenths/hundredths are divided, so 3 decodes to 0.3 and not 0.30000000000000004.
+        inverse = 1 / scale
+        if abs(inverse - round(inverse)) < 1e-9:
+            divisor = float(round(inverse))
+        else:
+            multiplier = scale
+    return FieldPlan(
+        key=description.key,
+        offset=offset,
+        width=width,
+        sign_bit=1 << (16 * width - 1) if description.signed else 0,
+        shift=description.shift,
+        mask=description.mask,
+        divisor=divisor,
+        multiplier=multiplier,
+        value_map=description.value_map,
+        value_fn=description.value_fn,
+    )
+
+
+def compile_decode_plan(descriptions, start: int, count: int) -> DecodePlan:
+    """Build the plan for every description that lies completely inside start..start+count-1."""
+    fields = tuple(
+        compile_field(description, description.address - start)
+        for description in sorted(
+            (d for d in descriptions if d.address is not None),
+            key=lambda d: d.address,
+        )
+        if start <= description.address and description.address + description.registers <= start + count
+    )
+    return DecodePlan(start, count, fields)
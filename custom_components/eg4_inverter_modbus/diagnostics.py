@@ -0,0 +1,23 @@
+"""Diagnostics support for EG4 Modbus."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .hub import EG4ModbusHub
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the connection and per-block read statistics of every unit."""
+    hub: EG4ModbusHub = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "units": {unit.name: unit.diagnostics() for unit in hub.units},
+    }
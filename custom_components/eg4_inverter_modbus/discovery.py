@@ -0,0 +1,143 @@
+"""Discover which register ranges an inverter model and firmware answers."""
+from __future__ import annotations
+
+import logging
+from typing import Awaitable, Callable, Iterable, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .planner import MAX_REGISTERS_PER_READ
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.register_maps"
+STORAGE_VERSION = 1
+
+# Modbus exceptions that mean the registers don't exist, rather than that the read failed.
+UNSUPPORTED_EXCEPTION_CODES = (0x02, 0x03)
+
+# The registers identifying the firmware, whose register map is cached.
+FIRMWARE_KEYS = ("info_com_version", "info_controller_version")
+
+
+class RegisterScanError(Exception):
+    """A scan read failed for a reason other than the registers not existing."""
+
+
+async def async_scan_registers(
+    read: Callable[[int, int], Awaitable[bool]],
+    end: int,
+    spans: Iterable[tuple[int, int]] = (),
+    max_count: int = MAX_REGISTERS_PER_READ,
+) -> list[tuple[int, int]]:
+    """
+    Return the inclusive ranges of registers below `end` that `read(start, count)` can read.
+
+    Every read is as big as a request allows. When one fails, a binary search
+    finds its longest readable prefix. When the first register itself can't
+    be read, single-register reads at doubling distances bracket the end of
+    the unreadable run and a binary search finds it, so a fully readable
+    space costs a read per 125 registers and every hole a few more.
+
+    The doubling steps can jump over a small readable island inside a hole,
+    so each of the inclusive `spans`, the registers that matter, that ended
+    up in a hole is read once more on its own.
+    """
+    readable: list[tuple[int, int]] = []
+    position = 0
+    while position < end:
+        count = min(max_count, end - position)
+        if not await read(position, count):
+            low, high = 0, count
+            while high - low > 1:
+                middle = (low + high) // 2
+                if await read(position, middle):
+                    low = middle
+                else:
+                    high = middle
+            count = low
+        if count:
+            readable.append((position, position + count - 1))
+            position += count
+            continue
+
+        # `position` can't be read: find the first register after it that can.
+        unreadable, step = position, 1
+        while position + step < end and not await read(position + step, 1):
+            unreadable = position + step
+            step *= 2
+        high = position + step
+        if high >= end:
+            # Either the run reaches the end, or a readable tail starts before it.
+            if unreadable == end - 1 or not await read(end - 1, 1):
+                break
+            high = end - 1
+        low = unreadable
+        while high - low > 1:
+            middle = (low + high) // 2
+            if await read(middle, 1):
+                high = middle
+            else:
+                low = middle
+        position = high
+
+    for first, last in sorted(set(spans)):
+        if last < end and not any(a <= first and last <= b for a, b in readable):
+            if await read(first, last - first + 1):
+                readable.append((first, last))
+    return _merge(readable)
+
+
+def _merge(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping and adjacent inclusive ranges."""
+    merged: list[tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def unreadable_ranges(readable: list[tuple[int, int]], end: int) -> list[tuple[int, int]]:
+    """Return the inclusive ranges below `end` that are not readable."""
+    holes, position = [], 0
+    for first, last in sorted(readable):
+        if first > position:
+            holes.append((position, first - 1))
+        position = max(position, last + 1)
+    if position < end:
+        holes.append((position, end - 1))
+    return holes
+
+
+def register_map_key(data: dict) -> Optional[str]:
+    """Return the cache key of the firmware the data was read from, None until it is known."""
+    versions = [data.get(key) for key in FIRMWARE_KEYS]
+    if None in versions:
+        return None
+    return "com {} controller {}".format(*versions)
+
+
+def register_map_holes(register_map: dict) -> dict[str, tuple[tuple[int, int], ...]]:
+    """Return the unreadable ranges per register type of a stored register map."""
+    return {
+        register_type: tuple(unreadable_ranges([tuple(r) for r in scan["readable"]], scan["end"]))
+        for register_type, scan in register_map.items()
+    }
+
+
+async def async_load_register_map(hass: HomeAssistant, key: str) -> Optional[dict]:
+    """Return the stored register map of a firmware, None if it was never scanned."""
+    stored = await Store(hass, STORAGE_VERSION, STORAGE_KEY).async_load() or {}
+    return stored.get(key)
+
+
+async def async_save_register_map(hass: HomeAssistant, key: str, register_map: dict) -> None:
+    """Store the register map of a firmware."""
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    stored = await store.async_load() or {}
+    stored[key] = register_map
+    await store.async_save(stored)
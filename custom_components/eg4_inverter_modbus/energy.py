@@ -0,0 +1,83 @@
+"""Energy counters integrated from the power samples."""
+from __future__ import annotations
+
+from typing import Optional
+
+# Samples further apart than this, seconds, are not integrated; the anchor covers the gap.
+MAX_SAMPLE_GAP = 10.0
+# Resolution of the cumulative energy registers, kWh.
+REGISTER_RESOLUTION = 0.1
+WATT_SECONDS_PER_KWH = 3_600_000
+
+
+class EnergyCounter:
+    """
+    Trapezoidal integral of one power value, kept between the inverter's own
+    cumulative register and one register step above it.
+
+    The register truncates to 0.1 kWh, so whenever it is read the true total
+    is known to lie in [register, register + 0.1): the integral is clamped
+    into that window, which stops it drifting while keeping the resolution of
+    the samples in between. The published total never decreases, as a
+    `total_increasing` sensor would read that as a meter reset.
+    """
+
+    __slots__ = ("_value", "_total", "_last")
+
+    def __init__(self):
+        """Initialize the counter; it counts from the first anchor on."""
+        self._value: Optional[float] = None
+        self._total: Optional[float] = None
+        self._last: Optional[tuple[float, float]] = None
+
+    def add(self, at: float, power: float) -> None:
+        """Integrate a power sample in W taken at monotonic time `at`."""
+        if self._last is not None and self._value is not None:
+            last_at, last_power = self._last
+            elapsed = at - last_at
+            if 0 < elapsed <= MAX_SAMPLE_GAP:
+                self._value += (last_power + power) / 2 * elapsed / WATT_SECONDS_PER_KWH
+        self._last = (at, power)
+
+    def anchor(self, register: float, resolution: float = REGISTER_RESOLUTION) -> None:
+        """Clamp the integral to a fresh reading of the cumulative register, kWh."""
+        if self._value is None:
+            self._value = register
+        else:
+            self._value = min(max(self._value, register), register + resolution)
+
+    @property
+    def total(self) -> Optional[float]:
+        """Return the published total, kWh."""
+        if self._value is not None:
+            self._total = self._value if self._total is None else max(self._total, self._value)
+        return None if self._total is None else round(self._total, 3)
+
+
+class EnergyIntegrator:
+    """The energy counters of a unit, fed by the power sampler."""
+
+    def __init__(self, power_keys: dict[str, tuple[str, ...]], anchor_keys: dict[str, tuple[str, ...]]):
+        """Initialize a counter per key, integrating the sum of its power keys."""
+        self._power_keys = power_keys
+        self._anchor_keys = anchor_keys
+        self.counters = {key: EnergyCounter() for key in power_keys}
+
+    def add(self, at: float, values: dict) -> None:
+        """Integrate one set of power samples."""
+        for key, counter in self.counters.items():
+            powers = [values.get(power_key) for power_key in self._power_keys[key]]
+            if None not in powers:
+                counter.add(at, sum(powers))
+
+    def anchor(self, data: dict, fresh: set[str]) -> None:
+        """Anchor every counter whose cumulative registers are all in `fresh`."""
+        for key, counter in self.counters.items():
+            sources = self._anchor_keys[key]
+            if all(source in fresh and data.get(source) is not None for source in sources):
+                # Each register truncates, so a sum of them may lag by a step per register.
+                counter.anchor(sum(data[source] for source in sources), REGISTER_RESOLUTION * len(sources))
+
+    def totals(self) -> dict:
+        """Return the published totals of the anchored counters."""
+        return {key: total for key, counter in self.counters.items() if (total := counter.total) is not None}
@@ -0,0 +1,326 @@
+"""Modbus TCP sessions shared by every inverter behind the same gateway."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import logging
+import socket
+import time
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+from .const import DATA_GATEWAYS, DEFAULT_IDLE_TIMEOUT
+from .pipeline import PipelineError, PipelineTransportError, PipelinedReader, PipelinedResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest request in the moving latency averages.
+LATENCY_SMOOTHING = 0.1
+# Pipelined batches lost in a row, each while single requests were answered, before
+# the gateway is taken to drop pipelined requests rather than to have had a hiccup.
+PIPELINE_MAX_TRANSPORT_FAILURES = 3
+
+
+class ModbusConnection:
+    """
+    A long-lived Modbus TCP session that survives across polls and writes.
+
+    Cheap RS485 gateways handle a fresh TCP handshake every few seconds badly,
+    so the socket is kept open, TCP keepalive is enabled on it and requests
+    transparently reconnect once when the gateway has dropped the session or
+    a request timed out, which is how a half-open socket shows up.
+    All I/O runs on the event loop through pymodbus's asyncio client.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """Initialize the connection manager."""
+        # pymodbus' own background reconnect is disabled, reconnects are driven from here.
+        self._client = AsyncModbusTcpClient(host=host, port=port, timeout=timeout, reconnect_delay=0)
+        self._idle_timeout = idle_timeout
+        self._last_activity = 0.0
+        self._connected_once = False
+        self._lock = asyncio.Lock()
+        self.reconnect_count = 0
+        self.idle_reconnect_count = 0
+        self.retry_count = 0
+
+    @property
+    def client(self) -> AsyncModbusTcpClient:
+        """Return the underlying pymodbus client."""
+        return self._client
+
+    def _enable_keepalive(self) -> None:
+        """Turn on TCP keepalive so dead gateways are noticed between polls."""
+        transport = getattr(getattr(self._client, "ctx", None), "transport", None)
+        sock = transport.get_extra_info("socket") if transport is not None else None
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Not every platform exposes the tuning knobs, keep the OS defaults there.
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+            if hasattr(socket, "TCP_KEEPINTVL"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+            if hasattr(socket, "TCP_KEEPCNT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        except OSError as ex:
+            _LOGGER.debug(f"Could not enable TCP keepalive: {ex}")
+
+    async def connect(self) -> bool:
+        """Make sure the session is open."""
+        async with self._lock:
+            return await self._ensure_connected()
+
+    async def _ensure_connected(self) -> bool:
+        """Open the session if needed, recycling it when it sat idle too long."""
+        now = time.monotonic()
+        if self._client.connected and self._last_activity and now - self._last_activity > self._idle_timeout:
+            # Most gateways silently drop idle sessions; reconnect before we hit a half-open socket.
+            _LOGGER.debug("Modbus session idle for %.0fs, reconnecting", now - self._last_activity)
+            self._client.close()
+            self.idle_reconnect_count += 1
+
+        if self._client.connected:
+            return True
+
+        if not await self._client.connect():
+            return False
+
+        if self._connected_once:
+            self.reconnect_count += 1
+            _LOGGER.debug("Modbus session re-established (%s reconnects)", self.reconnect_count)
+        self._connected_once = True
+        self._last_activity = now
+        self._enable_keepalive()
+        return True
+
+    async def execute(self, method: str, *args, **kwargs):
+        """Run a client request, reconnecting once if the session was dropped or the request timed out."""
+        # The lock is held per request, not per poll, so a write can slip in between poll blocks.
+        async with self._lock:
+            for attempt in range(2):
+                if not await self._ensure_connected():
+                    raise ConnectionException("Modbus connection failed")
+                try:
+                    result = await getattr(self._client, method)(*args, **kwargs)
+                except (ConnectionException, ModbusIOException):
+                    # A timeout usually means a half-open socket; a fresh session answers again.
+                    self._client.close()
+                    if attempt:
+                        raise
+                    self.retry_count += 1
+                    continue
+                self._last_activity = time.monotonic()
+                return result
+
+    def close(self) -> None:
+        """Close the session."""
+        if self._client.connected:
+            self._client.close()
+
+
+@dataclass
+class UnitStats:
+    """Bus statistics of one unit id."""
+
+    requests: int = 0
+    errors: int = 0
+    latency: float = 0.0  # moving average of the time on the bus, seconds
+    queue_wait: float = 0.0  # moving average of the time queued behind other units, seconds
+
+    def record(self, latency: float, queue_wait: float, error: bool) -> None:
+        """Add one finished request."""
+        if self.requests:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+            self.queue_wait += LATENCY_SMOOTHING * (queue_wait - self.queue_wait)
+        else:
+            self.latency = latency
+            self.queue_wait = queue_wait
+        self.requests += 1
+        if error:
+            self.errors += 1
+
+
+@dataclass
+class RequestTrace:
+    """Timing of one request through the scheduler."""
+
+    rtt: float = 0.0  # time on the bus, seconds
+    queue_wait: float = 0.0  # time queued behind other units, seconds
+    retries: int = 0
+
+
+class ModbusGateway:
+    """
+    One Modbus TCP session to a gateway, shared by every unit id behind it.
+
+    RS485 gateways serve one request at a time on the serial bus, so requests
+    of all units are funnelled through a single scheduler. Each unit has its own
+    queue and the scheduler takes one request per unit in turn, so a unit that
+    queues a whole poll can't starve the others.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5):
+        """Initialize the gateway."""
+        self.key = f"{host}:{port}"
+        self.connection = ModbusConnection(host, port, timeout=timeout)
+        # A second TCP client, only connected once a hub pipelines its reads.
+        self._pipeline = PipelinedReader(host, port, timeout=timeout)
+        # Cleared for good once the gateway mishandles pipelined batches.
+        self.pipeline_ok = True
+        self.pipeline_transport_failures = 0
+        self._answered_since_batch = False
+        self.stats: dict[int, UnitStats] = {}
+        self._users: dict[int, int] = {}
+        self._queues: dict[int, deque] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def acquire(self, unit: int) -> None:
+        """Register a user of the gateway for a unit id."""
+        self._users[unit] = self._users.get(unit, 0) + 1
+        self._queues.setdefault(unit, deque())
+        self.stats.setdefault(unit, UnitStats())
+
+    def release(self, unit: int) -> bool:
+        """Drop a user of the gateway, returning True when nobody uses it anymore."""
+        self._users[unit] -= 1
+        if not self._users[unit]:
+            del self._users[unit]
+        if self._users:
+            return False
+        self.close()
+        return True
+
+    async def connect(self) -> bool:
+        """Make sure the shared session is open."""
+        return await self.connection.connect()
+
+    async def execute(self, unit: int, method, *args, **kwargs) -> Any:
+        """
+        Queue a request for `unit` and wait for its result. `method` names a
+        pymodbus client method, or is a coroutine function run in its place.
+        """
+        return await self.execute_traced(unit, RequestTrace(), method, *args, **kwargs)
+
+    async def execute_traced(self, unit: int, trace: RequestTrace, method, *args, **kwargs) -> Any:
+        """Like execute, filling `trace` with the timing of the request."""
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(unit, deque()).append((future, time.monotonic(), trace, method, args, kwargs))
+        self.stats.setdefault(unit, UnitStats())
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._async_run())
+        self._wakeup.set()
+        return await future
+
+    async def _async_run(self) -> None:
+        """Serve the unit queues round robin, one request per unit per turn."""
+        while True:
+            served = False
+            for unit, queue in list(self._queues.items()):
+                if not queue:
+                    continue
+                future, queued_at, trace, method, args, kwargs = queue.popleft()
+                if future.done():
+                    continue  # the caller gave up waiting
+                served = True
+                started = time.monotonic()
+                retries = self.connection.retry_count
+                error = False
+                try:
+                    if callable(method):
+                        result = await method(*args, **kwargs)
+                    else:
+                        result = await self.connection.execute(method, *args, **kwargs)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as ex:  # handed to the caller
+                    error = True
+                    if not future.done():
+                        future.set_exception(ex)
+                else:
+                    error = any(r.isError() for r in result) if isinstance(result, list) else result.isError()
+                    if not callable(method):
+                        self._answered_since_batch = True
+                    if not future.done():
+                        future.set_result(result)
+                trace.rtt = time.monotonic() - started
+                trace.queue_wait = started - queued_at
+                trace.retries = self.connection.retry_count - retries
+                self.stats[unit].record(trace.rtt, trace.queue_wait, error)
+            if not served:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+    async def execute_pipelined(
+        self, unit: int, requests: list[tuple[str, int, int]], trace: Optional[RequestTrace] = None
+    ) -> Optional[list[PipelinedResponse]]:
+        """
+        Queue a batch of (register type, start, count) reads that are sent back
+        to back. Returns None when the gateway can't pipeline or the batch was
+        lost, so the caller reads them one at a time instead.
+        """
+        if not self.pipeline_ok:
+            return None
+        try:
+            results = await self.execute_traced(unit, trace or RequestTrace(), self._pipeline.read, unit, requests)
+        except PipelineError as ex:
+            _LOGGER.warning(f"Gateway {self.key} doesn't handle pipelined reads, reading sequentially from now on: {ex}")
+            self.pipeline_ok = False
+            return None
+        except PipelineTransportError as ex:
+            # A reboot or a dropped packet; only counts against pipelining when single requests get through.
+            if self._answered_since_batch:
+                self.pipeline_transport_failures += 1
+            self._answered_since_batch = False
+            if self.pipeline_transport_failures >= PIPELINE_MAX_TRANSPORT_FAILURES:
+                _LOGGER.warning(
+                    f"Gateway {self.key} keeps losing pipelined reads while answering single ones, "
+                    f"reading sequentially from now on: {ex}"
+                )
+                self.pipeline_ok = False
+            else:
+                _LOGGER.debug(f"Pipelined read on gateway {self.key} lost, reading this poll sequentially: {ex}")
+            return None
+        self.pipeline_transport_failures = 0
+        self._answered_since_batch = False
+        return results
+
+    def close(self) -> None:
+        """Stop the scheduler, fail queued requests and close the session."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for queue in self._queues.values():
+            while queue:
+                future = queue.popleft()[0]
+                if not future.done():
+                    future.set_exception(ConnectionException("Modbus gateway closed"))
+        self._pipeline.close()
+        self.connection.close()
+
+
+def acquire_gateway(hass: HomeAssistant, host: str, port: int, unit: int) -> ModbusGateway:
+    """Return the shared gateway for host:port, creating it on first use."""
+    gateways: dict[str, ModbusGateway] = hass.data.setdefault(DATA_GATEWAYS, {})
+    key = f"{host}:{port}"
+    gateway = gateways.get(key)
+    if gateway is None:
+        gateway = gateways[key] = ModbusGateway(host, port)
+        _LOGGER.debug(f"Opened Modbus gateway {key}")
+    gateway.acquire(unit)
+    return gateway
+
+
+def release_gateway(hass: HomeAssistant, gateway: ModbusGateway, unit: int) -> None:
+    """Release a unit's use of a gateway, closing it when it was the last user."""
+    if gateway.release(unit):
+        hass.data.get(DATA_GATEWAYS, {}).pop(gateway.key, None)
+        _LOGGER.debug(f"Closed Modbus gateway {gateway.key}")
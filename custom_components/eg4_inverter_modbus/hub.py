@@ -1,31 +1,103 @@
 """EG4 Modbus Hub"""
-from datetime import datetime, timedelta, timezone
+import asyncio
+from datetime import datetime, timedelta
 import inspect
 import logging
+import os
 import struct
-import threading
-from typing import Optional
+import time
+from typing import Any, Callable, Optional
 
 from homeassistant.core import CALLBACK_TYPE, callback, HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.util import dt as dt_util
+from homeassistant.util import dt as dt_util, slugify
 
 import pymodbus
 from pymodbus import __version__ as pymodbus_version
-from pymodbus.client import ModbusTcpClient
-from pymodbus.exceptions import ConnectionException
+from pymodbus.exceptions import ConnectionException, ModbusException
 from pymodbus.pdu import ExceptionResponse
 from packaging.version import parse as parse_version
 
 from .const import (
-    FAULT_CODES,
-    WARNING_CODES,
-    INVERTER_STATUS_CODES,
-    AC_INPUT_TYPE_CODES,
+    ATTR_MANUFACTURER,
+    CAPTURE_FLUSH_BYTES,
+    CAPTURE_FLUSH_INTERVAL,
+    CODE_BIT_SENSORS,
+    DOMAIN,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_CAPTURE_FILE_BYTES,
+    DEFAULT_CAPTURE_FILES,
+    DEFAULT_MAX_BACKOFF_INTERVAL,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_SETTINGS_CHECK_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_WRITE_DEBOUNCE,
+    ENERGY_INTEGRATION_SENSORS,
+    EVENT_CODE_CHANGED,
+    INPUT_REGISTERS,
+    INTEGRATED_POWER_KEYS,
+    HOLDING_REGISTERS,
+    SAMPLED_POWER_KEYS,
+    SERVICE_DISCOVER_REGISTERS,
+    TIER_FAST,
+    TIER_NORMAL,
+    TIER_SETTINGS,
+    TIER_SLOW,
+    UNREADABLE_REGISTERS,
 )
+from .capture import CaptureWriter, registers_to_payload
+from .decoder import DecodePlan, compile_decode_plan
+from .discovery import (
+    FIRMWARE_KEYS,
+    UNSUPPORTED_EXCEPTION_CODES,
+    RegisterScanError,
+    async_load_register_map,
+    async_save_register_map,
+    async_scan_registers,
+    register_map_holes,
+    register_map_key,
+)
+from .energy import EnergyIntegrator
+from .gateway import LATENCY_SMOOTHING, ModbusGateway, RequestTrace, acquire_gateway, release_gateway
+from .metrics import READ_REQUEST_BYTES, BlockStats, describe_error, read_bytes, summarize_blocks
+from .pipeline import READ_FUNCTION_CODES, PipelinedResponse
+from .planner import MAX_REGISTERS_PER_WRITE, description_spans, plan_reads
+from .sampler import PowerSampler
+from .scheduler import BREAKER_CLOSED, BREAKER_OPEN, AdaptiveSchedule
 
 _LOGGER = logging.getLogger(__name__)
 
+# Keys each calculated value is derived from.
+CALCULATED_SOURCES = {
+    description.key: description.sources
+    for description in INPUT_REGISTERS + ENERGY_INTEGRATION_SENSORS
+    if getattr(description, "sources", ())
+}
+
+# Listener counts published with every notification; they don't count towards themselves.
+WRITE_METRIC_KEYS = ("entity_writes_per_poll", "entity_writes_skipped_per_poll")
+
+READ_METHODS = {
+    "input": "read_input_registers",
+    "holding": "read_holding_registers",
+}
+
+# Retries a poll may spend on error and short responses, shared by all its blocks.
+POLL_RETRY_BUDGET = 3
+# Blocks in a row without any answer before the rest of the poll is given up.
+MAX_UNANSWERED_BLOCKS = 2
+# A value goes stale once its block hasn't been read for this many intervals of its tier.
+STALE_AFTER_INTERVALS = 3
+
+KEY_TIERS = {
+    description.key: description.tier
+    for description in (*INPUT_REGISTERS, *HOLDING_REGISTERS)
+    if description.address is not None
+}
+SETTINGS_KEYS = frozenset(key for key, tier in KEY_TIERS.items() if tier == TIER_SETTINGS)
+# Bits of the fault and warning words, read whether or not their binary sensors are enabled.
+CODE_BITS = {description.key: description for description in CODE_BIT_SENSORS}
+
 
 class CustomPayloadDecoder:
     """
@@ -80,7 +152,7 @@ class CustomPayloadDecoder:
 
 
 class EG4ModbusHub(DataUpdateCoordinator[dict]):
-    """Thread safe wrapper class for pymodbus."""
+    """Asyncio wrapper class for pymodbus."""
 
     def __init__(
         self,
@@ -90,18 +162,87 @@ class EG4ModbusHub(DataUpdateCoordinator[dict]):
         port: int,
         slave: int,
         scan_interval: int,
+        max_read_gap: int = DEFAULT_MAX_READ_GAP,
+        fast_scan_interval: int = DEFAULT_FAST_SCAN_INTERVAL,
+        slow_scan_interval: int = DEFAULT_SLOW_SCAN_INTERVAL,
+        pipeline_reads: bool = False,
+        power_sample_rate: float = 0,
+        capture_dir: Optional[str] = None,
     ):
-        """Initialize the Modbus hub."""
+        """Initialize the Modbus hub; raw block responses are captured to `capture_dir` when given."""
+        self._tier_intervals = {
+            TIER_FAST: min(fast_scan_interval, scan_interval),
+            TIER_NORMAL: scan_interval,
+            TIER_SLOW: max(slow_scan_interval, scan_interval),
+            TIER_SETTINGS: max(DEFAULT_SETTINGS_CHECK_INTERVAL, slow_scan_interval, scan_interval),
+        }
+        # The coordinator ticks at the fast interval; each tick reads only the tiers that are due.
         super().__init__(
             hass,
             _LOGGER,
             name=name,
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=timedelta(seconds=self._tier_intervals[TIER_FAST]),
         )
-        self._client = ModbusTcpClient(host=host, port=port, timeout=5)
+        self._host = host
+        self._port = port
         self._device_id = slave if slave else 1
-        self._lock = threading.Lock()
+        # Inverters behind the same gateway share one session and one bus scheduler.
+        self._gateway: Optional[ModbusGateway] = acquire_gateway(hass, host, port, self._device_id)
+        self._client = self._gateway.connection.client
         self.data: dict = {}
+        self._max_read_gap = max_read_gap
+        self._pipeline_reads = pipeline_reads
+        # Moving average of the poll duration per read mode, seconds.
+        self.poll_latency: dict[str, float] = {}
+        self.last_poll_latency = 0.0
+        # Read requests of the last poll, retries included.
+        self.last_poll_requests = 0
+        # Statistics per read block, e.g. "input 0-124".
+        self.block_stats: dict[str, BlockStats] = {}
+        self._tier_last_poll: dict[str, float] = {}
+        self._wanted_keys: Optional[frozenset[str]] = None
+        # Keys read even without an entity, e.g. for the totals of a parallel system.
+        self.required_keys: frozenset[str] = frozenset()
+        self.last_read_ok = False
+        self._read_attempted = False
+        self._failed_blocks: list[tuple[str, DecodePlan]] = []
+        self._retries_left = POLL_RETRY_BUDGET
+        # Monotonic time each key was last read successfully.
+        self._read_at: dict[str, float] = {}
+        self._notified_stale: frozenset[str] = frozenset()
+        # Ranges the read plans stay out of, including those a register map found unreadable.
+        self._holes: dict[str, tuple[tuple[int, int], ...]] = dict(UNREADABLE_REGISTERS)
+        # Firmware versions the register map applies to, None until they are read.
+        self.register_map_key: Optional[str] = None
+        self._firmware_checked = False
+        self._sampler: Optional[PowerSampler] = None
+        self._integrator: Optional[EnergyIntegrator] = None
+        if power_sample_rate:
+            self._sample_plans = self._compile_read_plan(lambda d: d.key in SAMPLED_POWER_KEYS)
+            self._integrator = EnergyIntegrator(
+                INTEGRATED_POWER_KEYS,
+                {description.key: description.sources for description in ENERGY_INTEGRATION_SENSORS},
+            )
+            self._sampler = PowerSampler(
+                self._async_sample,
+                SAMPLED_POWER_KEYS,
+                power_sample_rate,
+                self._tier_intervals[TIER_NORMAL],
+                self._integrator.add,
+            )
+        self._capture: Optional[CaptureWriter] = None
+        if capture_dir is not None:
+            self._capture = CaptureWriter(capture_dir, slugify(name), DEFAULT_CAPTURE_FILE_BYTES, DEFAULT_CAPTURE_FILES)
+            self._capture_lock = asyncio.Lock()
+            self._capture_written = time.monotonic()
+        # Stretches the interval and opens the circuit breaker while the gateway struggles.
+        self._schedule = AdaptiveSchedule(self._tier_intervals[TIER_FAST], DEFAULT_MAX_BACKOFF_INTERVAL)
+        self._notified_data: Optional[dict] = None
+        self._notified_success: Optional[bool] = None
+        self._pending_writes: dict[int, int] = {}
+        self._write_waiters: dict[int, list[asyncio.Future]] = {}
+        self._write_flush: Optional[asyncio.Task] = None
+        self._read_plans: dict[frozenset[str], list[tuple[str, DecodePlan]]] = {}
         
         self._pyversion = parse_version(pymodbus_version)
 
@@ -140,6 +281,77 @@ class EG4ModbusHub(DataUpdateCoordinator[dict]):
             self._device_id,
         )
 
+    @property
+    def unit_id(self) -> int:
+        """Return the Modbus unit id of this inverter."""
+        return self._device_id
+
+    @property
+    def units(self) -> list["EG4ModbusHub"]:
+        """Return the inverters polled by this hub."""
+        return [self]
+
+    @property
+    def poll_interval(self) -> float:
+        """Return the current adaptive poll interval, seconds."""
+        return self._schedule.interval
+
+    @property
+    def power_sampling(self) -> bool:
+        """Return True when the power registers are sampled between polls."""
+        return self._sampler is not None
+
+    @property
+    def device_info(self) -> dict:
+        """Return the device the entities of this inverter belong to."""
+        return {
+            "identifiers": {(DOMAIN, self.name)},
+            "name": self.name,
+            "manufacturer": ATTR_MANUFACTURER,
+            "model": "EG4 Inverter",
+        }
+
+    def is_stale(self, key: str) -> bool:
+        """
+        Return True when the value of `key` hasn't been read for several
+        intervals of its tier because its block keeps failing. Calculated
+        values are stale when any of their sources is.
+        """
+        sources = CALCULATED_SOURCES.get(key)
+        if sources is not None:
+            return any(self.is_stale(source) for source in sources)
+        read_at = self._read_at.get(key)
+        if read_at is None:
+            return False
+        interval = max(self._tier_intervals[KEY_TIERS[key]], self._schedule.interval)
+        return time.monotonic() - read_at > STALE_AFTER_INTERVALS * interval
+
+    def read_since(self, key: str, since: float) -> bool:
+        """
+        Return True when the value of `key` was read at or after the monotonic
+        time `since`. Calculated values need every source that was ever read,
+        so a missing third PV string doesn't hold them back.
+        """
+        sources = CALCULATED_SOURCES.get(key)
+        if sources is not None:
+            read = [source for source in sources if source in self._read_at]
+            return bool(read) and all(self.read_since(source, since) for source in read)
+        read_at = self._read_at.get(key)
+        return read_at is not None and read_at >= since
+
+    async def async_poll_once(self) -> None:
+        """
+        Poll once through the coordinator's own refresh, which records the
+        result and notifies the listeners. For units without a timer of their
+        own, such as the units of a parallel system.
+        """
+        await self.async_refresh()
+
+    def value_timestamps(self) -> dict[str, datetime]:
+        """Return when each value was last read successfully."""
+        now, monotonic = dt_util.utcnow(), time.monotonic()
+        return {key: now - timedelta(seconds=monotonic - read_at) for key, read_at in self._read_at.items()}
+
     @callback
     def async_remove_listener(self, update_callback: CALLBACK_TYPE) -> None:
         """Remove data update listener."""
@@ -147,429 +359,718 @@ class EG4ModbusHub(DataUpdateCoordinator[dict]):
         if not self._listeners:
             self.close()
 
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Update only the listeners whose key changed since the last notification.
+        Listeners without a context, and all listeners after the availability
+        of the hub changed, are always updated.
+        """
+        data = self.data or {}
+        previous = self._notified_data
+        update_all = previous is None or self.last_update_success != self._notified_success
+        changed = {
+            key for key, value in data.items()
+            if update_all or key not in previous or previous[key] != value
+        }
+
+        listeners = list(self._listeners.values())
+        # Entities go unavailable while their value is stale, and back once it is read again.
+        stale = frozenset(
+            context for _, context in listeners if context is not None and self.is_stale(context)
+        )
+        changed |= stale ^ self._notified_stale
+        self._notified_stale = stale
+        writes = sum(
+            1 for _, context in listeners
+            if context not in WRITE_METRIC_KEYS and (context is None or context in changed)
+        )
+        data["entity_writes_per_poll"] = writes
+        data["entity_writes_skipped_per_poll"] = (
+            sum(1 for _, context in listeners if context not in WRITE_METRIC_KEYS) - writes
+        )
+        for key in WRITE_METRIC_KEYS:
+            if update_all or previous.get(key) != data[key]:
+                changed.add(key)
+
+        self._notified_data = dict(data)
+        self._notified_success = self.last_update_success
+        for update_callback, context in listeners:
+            if context is None or context in changed:
+                update_callback()
+
+    def _get_gateway(self) -> ModbusGateway:
+        """Return the shared gateway, acquiring it again after the hub was closed."""
+        if self._gateway is None:
+            self._gateway = acquire_gateway(self.hass, self._host, self._port, self._device_id)
+        return self._gateway
+
+    async def _execute(self, method: str, *args, **kwargs):
+        """Run a request for this unit through the gateway's scheduler."""
+        return await self._get_gateway().execute(self._device_id, method, *args, **kwargs)
+
     def close(self) -> None:
         """Disconnect client."""
-        with self._lock:
-            if self._client.is_socket_open():
-                self._client.close()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._capture is not None and self._capture.pending_bytes:
+            self.hass.async_create_task(self._async_write_capture())
+        if self._write_flush is not None:
+            self._write_flush.cancel()
+            self._write_flush = None
+        for futures in self._write_waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(False)
+        self._pending_writes.clear()
+        self._write_waiters.clear()
+        if self._gateway is not None:
+            release_gateway(self.hass, self._gateway, self._device_id)
+            self._gateway = None
 
-    def write_register(self, address: int, value: int) -> bool:
+    async def async_write_register(self, address: int, value: int) -> bool:
         """Write a single holding register."""
-        if self._kwargs is None:
-            _LOGGER.error("Cannot write register: integration has not successfully polled yet. Please wait.")
-            return False
+        return await self.async_write_registers(address, [value])
 
-        with self._lock:
-            try:
-                with self._client as client:
-                    if not client.is_socket_open():
-                        client.connect() # Ensure connection
-                    
-                    if not client.is_socket_open():
-                        _LOGGER.error("Client connection failed before write.")
-                        return False
-                        
-                    result = client.write_register(address=address, value=value, **self._kwargs)
-                    
-                    if result.isError():
-                        _LOGGER.error(f"Error writing register {address} with value {value}: {result}")
-                        return False
-                    return True
-            except ConnectionException as ex:
-                _LOGGER.error(f"Connection failed during write: {ex}")
-                return False
-            except Exception as e:
-                _LOGGER.error(f"An unexpected error occurred during Modbus write: {e}")
+    async def async_write_registers(self, address: int, values: list[int]) -> bool:
+        """Write consecutive holding registers, with FC06 for one register and FC16 for more."""
+        try:
+            if len(values) == 1:
+                result = await self._execute("write_register", address=address, value=values[0], **self._kwargs)
+            else:
+                result = await self._execute("write_registers", address=address, values=values, **self._kwargs)
+
+            if result.isError():
+                _LOGGER.error(f"Error writing registers {address}-{address + len(values) - 1} with values {values}: {result}")
                 return False
+            return True
+        except ConnectionException as ex:
+            _LOGGER.error(f"Connection failed during write: {ex}")
+            return False
+        except Exception as e:
+            _LOGGER.error(f"An unexpected error occurred during Modbus write: {e}")
+            return False
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from inverter in a single executor job."""
-        return await self.hass.async_add_executor_job(self._sync_update_data)
+    async def async_queue_write(self, address: int, value: int) -> bool:
+        """
+        Queue a holding register write and wait until it has been sent.
+        Writes queued within the debounce window are sent together, consecutive
+        addresses as one FC16 request, and the written keys are read back.
+        """
+        self._pending_writes[address] = value & 0xFFFF
+        future = self.hass.loop.create_future()
+        self._write_waiters.setdefault(address, []).append(future)
+        if self._write_flush is None:
+            self._write_flush = self.hass.async_create_task(self._async_flush_writes())
+        return await future
 
-    def _sync_update_data(self) -> dict:
+    async def _async_flush_writes(self) -> None:
+        """Send the writes queued during the debounce window."""
+        await asyncio.sleep(DEFAULT_WRITE_DEBOUNCE)
+        self._write_flush = None
+        pending, self._pending_writes = self._pending_writes, {}
+        waiters, self._write_waiters = self._write_waiters, {}
+
+        written = set()
+        for request in plan_reads(((a, a) for a in pending), max_count=MAX_REGISTERS_PER_WRITE):
+            addresses = range(request.start, request.end + 1)
+            if await self.async_write_registers(request.start, [pending[a] for a in addresses]):
+                written.update(addresses)
+        _LOGGER.debug(f"Wrote {len(written)} of {len(pending)} queued registers")
+
+        for address, futures in waiters.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(address in written)
+        if written and not await self._async_read_back(written):
+            # The cached settings can't be trusted any more; read them all on the next poll.
+            self._tier_last_poll.pop(TIER_SETTINGS, None)
+            await self.async_request_refresh()
+
+    async def _async_read_back(self, addresses: set[int]) -> bool:
         """
-        Synchronously read all Modbus data in a single session.
-        This runs in the executor and performs all I/O,
-        preventing multiple sequential connections.
+        Read back only the holding registers of the keys that were written and
+        notify the entities of those keys, instead of refreshing everything.
         """
-        data = self.data.copy()
-        updated = False
+        descriptions = [
+            d for d in HOLDING_REGISTERS
+            if d.address is not None and any(d.address <= a < d.address + d.registers for a in addresses)
+        ]
+        decoded: dict = {}
+        try:
+            for request in plan_reads(
+                description_spans(descriptions),
+                max_gap=self._max_read_gap,
+                holes=self._holes["holding"],
+            ):
+                result = await self._execute(
+                    READ_METHODS["holding"], request.start, count=request.count, **self._kwargs
+                )
+                if self._capture is not None:
+                    self._capture_block("holding", request.start, result)
+                if result.isError():
+                    _LOGGER.warning(f"Modbus read-back error on holding registers {request.start}-{request.end}")
+                    return False
+                plan = compile_decode_plan(descriptions, request.start, request.count)
+                plan.apply(result.registers, decoded)
+                self._read_at.update(dict.fromkeys(plan.keys, time.monotonic()))
+        except (IndexError, ModbusException) as ex:
+            _LOGGER.warning(f"Modbus read-back after write failed: {ex}")
+            return False
+
+        # Onto the current data, so a poll that finished meanwhile keeps its fresher values.
+        self.data = dict(self.data, **decoded)
+        # Only the listeners of keys that changed are called.
+        self.async_update_listeners()
+        return True
+
+    def _compile_read_plan(self, wanted: Callable[[Any], bool]) -> list[tuple[str, DecodePlan]]:
+        """Plan the reads for the wanted descriptions and compile a decode plan for each."""
+        plans = []
+        for register_type, descriptions in (("input", INPUT_REGISTERS), ("holding", HOLDING_REGISTERS)):
+            selected = [d for d in descriptions if d.address is not None and wanted(d)]
+            for request in plan_reads(
+                description_spans(selected),
+                max_gap=self._max_read_gap,
+                holes=self._holes[register_type],
+            ):
+                plans.append((register_type, compile_decode_plan(selected, request.start, request.count)))
+        _LOGGER.debug(
+            "Read plan: %s",
+            ", ".join(f"{t} {p.start}-{p.start + p.count - 1}" for t, p in plans),
+        )
+        return plans
 
-        with self._lock:
+    def _due_tiers(self, now: float) -> frozenset[str]:
+        """Return the polling tiers whose interval has elapsed."""
+        # Half a tick of slack, so scheduling jitter doesn't push a tier back by a whole tick.
+        slack = self._tier_intervals[TIER_FAST] / 2
+        return frozenset(
+            tier
+            for tier, interval in self._tier_intervals.items()
+            if tier not in self._tier_last_poll or now - self._tier_last_poll[tier] >= interval - slack
+        )
+
+    def _enabled_keys(self) -> Optional[frozenset[str]]:
+        """
+        Return the keys the enabled entities subscribe to, plus the registers
+        their calculated values need, the fault and warning bits and the firmware versions.
+        None until the first entity subscribes, so the first refresh reads everything.
+        """
+        keys = set(self.async_contexts())
+        if not keys:
+            return None
+        keys |= self.required_keys
+        keys.update(CODE_BITS)
+        keys.update(FIRMWARE_KEYS)
+        for key in list(keys):
+            keys.update(CALCULATED_SOURCES.get(key, ()))
+        return frozenset(keys)
+
+    def _read_plan(self, tiers: frozenset[str]) -> tuple[list[tuple[str, DecodePlan]], frozenset[str]]:
+        """Return the cached read plan for the due tiers, and the tiers it covers."""
+        keys = self._enabled_keys()
+        if keys != self._wanted_keys:
+            # Entities were enabled or disabled; replan and read every tier of the new set once.
+            _LOGGER.debug(f"Polling {len(keys) if keys is not None else 'all'} enabled register keys")
+            self._wanted_keys = keys
+            self._read_plans.clear()
+            self._failed_blocks = []
+            self._tier_last_poll.clear()
+            tiers = frozenset(self._tier_intervals)
+
+        plans = self._read_plans.get(tiers)
+        if plans is None:
+            plans = self._read_plans[tiers] = self._compile_read_plan(
+                lambda d: d.tier in tiers and (keys is None or d.key in keys)
+            )
+        return plans, tiers
+
+    def _record_poll_latency(self, mode: str, seconds: float) -> None:
+        """Track the poll duration of a read mode, to compare pipelined and sequential polls."""
+        self.last_poll_latency = seconds
+        average = self.poll_latency.get(mode)
+        self.poll_latency[mode] = seconds if average is None else average + LATENCY_SMOOTHING * (seconds - average)
+        _LOGGER.debug(f"{mode.capitalize()} poll took {seconds * 1000:.1f} ms")
+
+    def _record_block(
+        self, register_type: str, plan: DecodePlan, trace: RequestTrace, received: Optional[int], failure=None
+    ) -> None:
+        """
+        Add one read of a block to its statistics. `received` is the number of
+        registers in the response, None when no response arrived.
+        """
+        name = f"{register_type} {plan.start}-{plan.start + plan.count - 1}"
+        stats = self.block_stats.get(name)
+        if stats is None:
+            stats = self.block_stats[name] = BlockStats()
+        transferred = READ_REQUEST_BYTES if received is None else read_bytes(received)
+        stats.record(trace.rtt, trace.retries, transferred, None if failure is None else describe_error(failure))
+
+    def _with_block_stats(self, data: dict) -> dict:
+        """Return the data with the block diagnostic values updated."""
+        data = dict(data, **summarize_blocks(self.block_stats))
+        successes = [stats.last_success for stats in self.block_stats.values() if stats.last_success]
+        data['modbus_oldest_block_success'] = min(successes, default=None)
+        return data
+
+    def diagnostics(self) -> dict:
+        """Return the connection and per-block statistics for a diagnostics download."""
+        gateway = self._gateway
+        return {
+            "unit": self.unit_id,
+            "read_plan": {
+                " ".join(sorted(tiers)): [f"{t} {p.start}-{p.start + p.count - 1}" for t, p in plans]
+                for tiers, plans in self._read_plans.items()
+            },
+            "poll_latency_ms": {mode: round(seconds * 1000, 1) for mode, seconds in self.poll_latency.items()},
+            "gateway": None if gateway is None else {
+                "reconnects": gateway.connection.reconnect_count,
+                "idle_reconnects": gateway.connection.idle_reconnect_count,
+                "retries": gateway.connection.retry_count,
+                "pipeline_ok": gateway.pipeline_ok,
+                "pipeline_transport_failures": gateway.pipeline_transport_failures,
+                "requests": gateway.stats[self.unit_id].requests,
+                "errors": gateway.stats[self.unit_id].errors,
+            },
+            "blocks": {name: stats.as_dict() for name, stats in self.block_stats.items()},
+            "power_sampler": None if self._sampler is None else {
+                "rate": self._sampler.rate,
+                "samples": self._sampler.samples,
+                "failures": self._sampler.failures,
+            },
+            "capture": None if self._capture is None else {
+                "file": self._capture.path,
+                "records": self._capture.records,
+                "bytes": self._capture.bytes,
+            },
+            "register_map": {
+                "firmware": self.register_map_key,
+                "holes": {t: [f"{first}-{last}" for first, last in holes] for t, holes in self._holes.items()},
+            },
+            "failed_blocks": [f"{t} {p.start}-{p.start + p.count - 1}" for t, p in self._failed_blocks],
+            "stale_values": sorted(key for key in self._read_at if self.is_stale(key)),
+            "value_timestamps": {key: read_at.isoformat() for key, read_at in self.value_timestamps().items()},
+        }
+
+    async def _async_sample(self) -> Optional[dict]:
+        """Read the power registers for the sampler, None when they can't be read."""
+        if self._schedule.state != BREAKER_CLOSED:
+            return None  # leave a struggling gateway to the probes
+        values: dict = {}
+        for register_type, plan in self._sample_plans:
+            result = await self._execute(READ_METHODS[register_type], plan.start, count=plan.count, **self._kwargs)
+            if result.isError():
+                return None
+            plan.apply(result.registers, values)
+        return values
+
+    async def _async_probe(self) -> bool:
+        """Read a single register to learn whether a failing gateway answers again."""
+        try:
+            result = await self._execute(READ_METHODS["input"], 0, count=1, **self._kwargs)
+        except Exception as ex:
+            _LOGGER.debug(f"Modbus probe failed: {ex}")
+            return False
+        return not result.isError()
+
+    def _fire_code_events(self, data: dict) -> None:
+        """Fire an event for every fault or warning bit that was set or cleared since the last poll."""
+        for key, description in CODE_BITS.items():
+            previous, value = self.data.get(key), data.get(key)
+            if previous is None or value is None or previous == value:
+                continue
+            _LOGGER.info(f"{description.name} {'set' if value else 'cleared'}")
+            self.hass.bus.async_fire(
+                EVENT_CODE_CHANGED,
+                {"unit": self.name, "key": key, "name": description.name, "bit": description.shift, "active": bool(value)},
+            )
+
+    def _publish_schedule(self, data: dict) -> dict:
+        """Apply the adaptive interval and return the data with its diagnostic values."""
+        if self.update_interval is not None:
+            # Units of a parallel system are refreshed by the parallel hub instead.
+            self.update_interval = timedelta(seconds=self._schedule.interval)
+        self.data = dict(data, modbus_scan_interval=round(self._schedule.interval, 1), modbus_circuit=self._schedule.state)
+        return self.data
+
+    async def _async_update_data(self) -> dict:
+        """
+        Poll the inverter, or only probe it while the circuit breaker is open,
+        and adapt the interval to how well the gateway copes.
+        """
+        schedule = self._schedule
+        if schedule.state == BREAKER_OPEN:
+            ok = await self._async_probe()
+            schedule.record_probe(ok)
+            if not ok:
+                _LOGGER.debug(f"Modbus gateway still not answering, next probe in {schedule.interval:.0f}s")
+                return self._publish_schedule(self.data)
+            _LOGGER.info("Modbus gateway answered the probe, resuming polls")
+
+        if self._sampler is not None:
+            self._sampler.start()
+        self._read_attempted = False
+        data = await self._async_poll()
+        if self._read_attempted:
+            was_open = schedule.state == BREAKER_OPEN
+            schedule.record_poll(self.last_read_ok, self.last_poll_latency, self.last_poll_requests)
+            if schedule.state == BREAKER_OPEN and not was_open:
+                _LOGGER.warning(
+                    f"Modbus gateway failed {schedule.failures} polls in a row, "
+                    f"probing it every {schedule.interval:.0f}s or less until it answers"
+                )
+        if self._capture is not None and not self._capture_lock.locked() and (
+            self._capture.pending_bytes >= CAPTURE_FLUSH_BYTES
+            or time.monotonic() - self._capture_written >= CAPTURE_FLUSH_INTERVAL
+        ):
+            self.hass.async_create_task(self._async_write_capture())
+        return self._publish_schedule(data)
+
+    def _capture_block(self, register_type: str, start: int, result) -> None:
+        """Add a raw block response to the capture."""
+        if result.isError():
+            # 0xFF stands for an error without a Modbus exception code, e.g. no response.
+            payload, exception_code = b"", getattr(result, "exception_code", 0) or 0xFF
+        elif isinstance(result, PipelinedResponse):
+            payload, exception_code = result.payload, 0
+        else:
+            payload, exception_code = registers_to_payload(result.registers), 0
+        self._capture.append(
+            time.time(), self._device_id, READ_FUNCTION_CODES[register_type], start, payload, exception_code
+        )
+
+    async def _async_write_capture(self) -> None:
+        """Append the buffered capture records to disk, one write at a time and in order."""
+        async with self._capture_lock:
+            self._capture_written = time.monotonic()
+            segments = self._capture.take()
+            if segments:
+                await self.hass.async_add_executor_job(self._capture.write, segments)
+
+    @staticmethod
+    def _response_complete(plan: DecodePlan, result) -> bool:
+        """Return whether a block response holds every register its plan decodes."""
+        if result.isError():
+            return False
+        received = len(result.payload) // 2 if isinstance(result, PipelinedResponse) else len(result.registers)
+        return received >= plan.required
+
+    def _commit_block(
+        self, register_type: str, plan: DecodePlan, trace: RequestTrace, result, data: dict
+    ) -> bool:
+        """Decode a block response into `data`, returning False for an error or short response."""
+        if self._capture is not None:
+            self._capture_block(register_type, plan.start, result)
+        if result.isError():
+            self._record_block(register_type, plan, trace, 0, result)
+            _LOGGER.warning(f"Modbus read error on {register_type} registers {plan.start}-{plan.start + plan.count - 1}")
+            return False
+        try:
+            if isinstance(result, PipelinedResponse):
+                received = len(result.payload) // 2
+                plan.apply_payload(result.payload, data)
+            else:
+                received = len(result.registers)
+                plan.apply(result.registers, data)
+        except IndexError as ex:
+            self._record_block(register_type, plan, trace, received, ex)
+            return False
+        self._record_block(register_type, plan, trace, received)
+        self._read_at.update(dict.fromkeys(plan.keys, time.monotonic()))
+        return True
+
+    async def _async_read_block(
+        self, register_type: str, plan: DecodePlan, retried: bool = False
+    ) -> Optional[tuple[str, DecodePlan, Any, RequestTrace]]:
+        """
+        Read one block until it answers completely and return the response for
+        async_apply_blocks, or None. Error and short responses are recorded and
+        retried from the retry budget of the poll. Requests that got no answer
+        raise, as pymodbus has already retried those.
+        """
+        while True:
+            if retried:
+                if not self._retries_left:
+                    return None
+                self._retries_left -= 1
+            retried = True
+            trace = RequestTrace()
             try:
-                with self._client as client:
-                    if not client.is_socket_open():
-                        client.connect() # Ensure connection
-
-                    if not client.is_socket_open():
-                        _LOGGER.error("Modbus connection failed")
-                        return self.data # Return last known data on connection fail
-
-                    # =================================================================================
-                    # Read Input Registers (Function Code 0x04)
-                    # =================================================================================
-                    
-                    # --- Block 1: Registers 0-39 ---
-                    result = client.read_input_registers(0, count=40, **self._kwargs)
-                    if not result.isError():
-                        updated = True
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["inverter_state"] = INVERTER_STATUS_CODES.get(decoder.decode_16bit_uint(), "Unknown")
-                        data["voltage_pv1"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_pv2"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_pv3"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_battery"] = decoder.decode_16bit_uint() / 10.0
-                        soc_soh_register = decoder.decode_16bit_uint()
-                        data["battery_soc"] = soc_soh_register & 0xFF
-                        data["battery_soh"] = soc_soh_register >> 8
-                        decoder.skip_registers(1)
-                        data["power_pv1"] = decoder.decode_16bit_uint()
-                        data["power_pv2"] = decoder.decode_16bit_uint()
-                        data["power_pv3"] = decoder.decode_16bit_uint()
-                        data["power_battery_charge"] = decoder.decode_16bit_uint()
-                        data["power_battery_discharge"] = decoder.decode_16bit_uint()
-                        data["voltage_grid_l1l2"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_grid_l2l3"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_grid_l3l1"] = decoder.decode_16bit_uint() / 10.0
-                        
-                        fac_pinv_reg = decoder.decode_16bit_uint()
-                        data["frequency_grid"] = (fac_pinv_reg) / 100.0
-                        data["power_inverter_output"] = decoder.decode_16bit_uint()
-                        data["power_ac_charge"] = decoder.decode_16bit_uint()
-                        data["current_inverter_rms"] = decoder.decode_16bit_uint() / 100.0
-                        data["power_factor_inverter"] = decoder.decode_16bit_uint() / 1000.0
-                        data["voltage_inverter_l1l2"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_inverter_l2l3"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_inverter_l3l1"] = decoder.decode_16bit_uint() / 10.0
-                        data["frequency_inverter"] = decoder.decode_16bit_uint() / 100.0
-                        data["power_inverter"] = decoder.decode_16bit_uint()
-                        data["power_apparent_inverter"] = decoder.decode_16bit_uint()
-                        data["power_grid_export"] = decoder.decode_16bit_uint()
-                        data["power_grid_import"] = decoder.decode_16bit_uint()
-                        data["energy_daily_pv1"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_pv2"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_pv3"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_inverter_output"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_ac_charge"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_battery_charge"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_battery_discharge"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_inverter"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_grid_export"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_grid_import"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_bus_1"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_bus_2"] = decoder.decode_16bit_uint() / 10.0
-                    else:
-                        _LOGGER.warning("Modbus read error on input registers 0-39")
-
-                    # --- Block 2: Registers 40-79 ---
-                    result = client.read_input_registers(40, count=40, **self._kwargs)
-                    if not result.isError():
-                        updated = True
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["energy_cumulative_pv1"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_pv2"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_pv3"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_inverter_output"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_ac_charge"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_battery_charge"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_battery_discharge"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_inverter"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_grid_export"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_grid_import"] = decoder.decode_32bit_uint() / 10.0
-                        
-                        fault_code_val = decoder.decode_32bit_uint()
-                        warning_code_val = decoder.decode_32bit_uint()
-                        data["fault_code"] = self.translate_bitmask_to_messages(fault_code_val, FAULT_CODES)
-                        data["warning_code"] = self.translate_bitmask_to_messages(warning_code_val, WARNING_CODES)
-
-                        data["temperature_internal"] = decoder.decode_16bit_int()
-                        data["temperature_heatsink_dc"] = decoder.decode_16bit_int()
-                        data["temperature_heatsink_ac"] = decoder.decode_16bit_int()
-                        data["temperature_battery"] = decoder.decode_16bit_int()
-                        decoder.skip_registers(1)
-                        
-                        time_running_total_seconds = decoder.decode_32bit_uint()
-                        current_time = datetime.now(timezone.utc)
-                        data["inverter_on_time"] = (current_time - timedelta(seconds=time_running_total_seconds))
-                        
-                        auto_test_reg = decoder.decode_16bit_uint()
-                        data["auto_test_status"] = (auto_test_reg >> 4) & 0x0F
-                        decoder.skip_registers(5)
-                        
-                        ac_type_raw = decoder.decode_16bit_uint()
-                        ac_type_val = ac_type_raw & 1
-                        data["ac_input_type"] = AC_INPUT_TYPE_CODES.get(ac_type_val, "Unknown")
-                        
-                        decoder.skip_registers(2)
-                    else:
-                        _LOGGER.warning("Modbus read error on input registers 40-79")
-
-                    # --- Block 3: Registers 80-119 ---
-                    result = client.read_input_registers(80, count=40, **self._kwargs)
-                    if not result.isError():
-                        updated = True
-                        decoder = CustomPayloadDecoder(result.registers)
-                        decoder.skip_registers(1)
-                        data["bms_current_max_charge"] = decoder.decode_16bit_uint() / 100.0
-                        data["bms_current_max_discharge"] = decoder.decode_16bit_uint() / 100.0
-                        data["bms_voltage_charge_ref"] = decoder.decode_16bit_uint() / 10.0
-                        data["bms_voltage_discharge_cutoff"] = decoder.decode_16bit_uint() / 10.0
-                        data["bms_status_0"] = decoder.decode_16bit_uint()
-                        data["bms_status_1"] = decoder.decode_16bit_uint()
-                        data["bms_status_2"] = decoder.decode_16bit_uint()
-                        data["bms_status_3"] = decoder.decode_16bit_uint()
-                        data["bms_status_4"] = decoder.decode_16bit_uint()
-                        data["bms_status_5"] = decoder.decode_16bit_uint()
-                        data["bms_status_6"] = decoder.decode_16bit_uint()
-                        data["bms_status_7"] = decoder.decode_16bit_uint()
-                        data["bms_status_8"] = decoder.decode_16bit_uint()
-                        data["bms_status_9"] = decoder.decode_16bit_uint()
-                        data["bms_status_inv"] = decoder.decode_16bit_uint()
-                        data["battery_parallel_num"] = decoder.decode_16bit_uint()
-                        data["battery_capacity_ah"] = decoder.decode_16bit_uint()
-                        data["bms_current_battery"] = decoder.decode_16bit_int() / 10.0
-                        data["bms_fault_code"] = decoder.decode_16bit_uint()
-                        data["bms_warning_code"] = decoder.decode_16bit_uint()
-                        data["bms_voltage_max_cell"] = decoder.decode_16bit_uint() / 1000.0
-                        data["bms_voltage_min_cell"] = decoder.decode_16bit_uint() / 1000.0
-                        data["bms_temperature_max_cell"] = decoder.decode_16bit_int() / 10.0
-                        data["bms_temperature_min_cell"] = decoder.decode_16bit_int() / 10.0
-                        data["bms_fw_update_state"] = decoder.decode_16bit_uint()
-                        data["bms_cycle_count"] = decoder.decode_16bit_uint()
-                        data["voltage_battery_sample_inverter"] = decoder.decode_16bit_uint() / 10.0
-                        data["temperature_t1"] = decoder.decode_16bit_int() / 10.0
-                        data["temperature_t2"] = decoder.decode_16bit_int() / 10.0
-                        data["temperature_t3"] = decoder.decode_16bit_int() / 10.0
-                        data["temperature_t4"] = decoder.decode_16bit_int() / 10.0
-                        data["temperature_t5"] = decoder.decode_16bit_int() / 10.0
-                        parallel_reg = decoder.decode_16bit_uint()
-                        data["parallel_master_slave"] = parallel_reg & 0x03
-                        data["parallel_phase"] = (parallel_reg >> 2) & 0x03
-                        data["parallel_number"] = parallel_reg >> 8
-                        decoder.skip_registers(6)
-                    else:
-                        _LOGGER.warning("Modbus read error on input registers 80-119")
-
-                    # --- Block 4: Registers 120-152 ---
-                    result = client.read_input_registers(120, count=33, **self._kwargs)
-                    if not result.isError():
-                        updated = True
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["voltage_bus_p"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_generator"] = decoder.decode_16bit_uint() / 10.0
-                        data["frequency_generator"] = decoder.decode_16bit_uint() / 100.0
-                        data["power_generator"] = decoder.decode_16bit_uint()
-                        data["energy_daily_generator"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_cumulative_generator"] = decoder.decode_32bit_uint() / 10.0
-                        data["voltage_inverter_l1n"] = decoder.decode_16bit_uint() / 10.0
-                        data["voltage_inverter_l2n"] = decoder.decode_16bit_uint() / 10.0
-                        data["power_inverter_l1n"] = decoder.decode_16bit_uint()
-                        data["power_inverter_l2n"] = decoder.decode_16bit_uint()
-                        data["power_apparent_inverter_l1n"] = decoder.decode_16bit_uint()
-                        data["power_apparent_inverter_l2n"] = decoder.decode_16bit_uint()
-                        data["energy_daily_inverter_l1n"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_daily_inverter_l2n"] = decoder.decode_16bit_uint() / 10.0
-                        data["energy_cumulative_inverter_l1n"] = decoder.decode_32bit_uint() / 10.0
-                        data["energy_cumulative_inverter_l2n"] = decoder.decode_32bit_uint() / 10.0
-                        decoder.skip_registers(1)
-                        data["current_afci_ch1"] = decoder.decode_16bit_uint() / 10.0
-                        data["current_afci_ch2"] = decoder.decode_16bit_uint() / 10.0
-                        data["current_afci_ch3"] = decoder.decode_16bit_uint() / 10.0
-                        data["current_afci_ch4"] = decoder.decode_16bit_uint() / 10.0
-                        
-                        reg_144 = decoder.decode_16bit_uint()
-                        data["afci_alarm_ch1"] = bool(reg_144 & (1 << 0))
-                        data["afci_alarm_ch2"] = bool(reg_144 & (1 << 1))
-                        data["afci_alarm_ch3"] = bool(reg_144 & (1 << 2))
-                        data["afci_alarm_ch4"] = bool(reg_144 & (1 << 3))
-                        data["afci_selftest_ch1"] = bool(reg_144 & (1 << 4)) 
-                        data["afci_selftest_ch2"] = bool(reg_144 & (1 << 5))
-                        data["afci_selftest_ch3"] = bool(reg_144 & (1 << 6))
-                        data["afci_selftest_ch4"] = bool(reg_144 & (1 << 7))
-                        
-                        data["afci_arc_ch1"] = decoder.decode_16bit_uint()
-                        data["afci_arc_ch2"] = decoder.decode_16bit_uint()
-                        data["afci_arc_ch3"] = decoder.decode_16bit_uint()
-                        data["afci_arc_ch4"] = decoder.decode_16bit_uint()
-                        data["afci_max_arc_ch1"] = decoder.decode_16bit_uint()
-                        data["afci_max_arc_ch2"] = decoder.decode_16bit_uint()
-                        data["afci_max_arc_ch3"] = decoder.decode_16bit_uint()
-                        data["afci_max_arc_ch4"] = decoder.decode_16bit_uint()
-                    else:
-                        _LOGGER.warning("Modbus read error on input registers 120-152")
-
-                    # =================================================================================
-                    # Read Holding Registers (Function Code 0x03)
-                    # =================================================================================
-                    
-                    # --- Block 1: Registers 9-24 ---
-                    result = client.read_holding_registers(9, count=16, **self._kwargs)
-                    if not result.isError():
-                        updated = True
-                        decoder = CustomPayloadDecoder(result.registers)
-                        info_ver_reg9 = decoder.decode_16bit_uint()
-                        data["info_com_version"] = info_ver_reg9 >> 8
-                        info_ver_reg10 = decoder.decode_16bit_uint()
-                        data["info_controller_version"] = info_ver_reg10 & 0xFF
-                        decoder.skip_registers(1)
-                        
-                        time_reg12 = decoder.decode_16bit_uint()
-                        time_reg13 = decoder.decode_16bit_uint()
-                        time_reg14 = decoder.decode_16bit_uint()
-                        
-                        year = 2000 + (time_reg12 & 0xFF)
-                        month = time_reg12 >> 8
-                        day = time_reg13 & 0xFF
-                        hour = time_reg13 >> 8
-                        minute = time_reg14 & 0xFF
-                        second = time_reg14 >> 8
-                        try:
-                            inverter_time = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
-                            now = dt_util.utcnow()
-                            time_difference = abs(now - inverter_time)
-                            data["inverter_time_accurate"] = time_difference <= timedelta(seconds=30)
-                        except ValueError:
-                            _LOGGER.warning("Invalid date components received from inverter")
-                            data["inverter_time_accurate"] = False
-                        
-                        data["setting_address_communication"] = decoder.decode_16bit_uint()
-                        data["setting_language"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(3)
-                        data["setting_pv_input_model"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(1)
-                        data["setting_voltage_pv_start"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_time_grid_connection_wait"] = decoder.decode_16bit_uint()
-                        data["setting_time_reconnection_wait"] = decoder.decode_16bit_uint()
-                    else:
-                        _LOGGER.warning("Modbus read error on holding registers 9-24")
-
-                    # --- Block 2: Registers 64-119 ---
-                    result = client.read_holding_registers(64, count=56, **self._kwargs)
-                    if not result.isError():
-                        updated = True
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["setting_percent_charge_power"] = decoder.decode_16bit_uint()
-                        data["setting_percent_discharge_power"] = decoder.decode_16bit_uint()
-                        data["setting_percent_ac_charge_power"] = decoder.decode_16bit_uint()
-                        data["setting_limit_soc_ac_charge"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(22)
-                        data["setting_voltage_inverter"] = decoder.decode_16bit_uint()
-                        data["setting_frequency_inverter"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(7)
-                        data["setting_voltage_charge_ref"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_voltage_discharge_cutoff"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_current_charge"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_current_discharge"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_max_backflow_power"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(1)
-                        data["setting_eod_soc"] = decoder.decode_16bit_uint()
-                        data["setting_temp_low_limit_discharge"] = decoder.decode_16bit_int() / 10.0
-                        data["setting_temp_high_limit_discharge"] = decoder.decode_16bit_int() / 10.0
-                        data["setting_temp_low_limit_charge"] = decoder.decode_16bit_int() / 10.0
-                        data["setting_temp_high_limit_charge"] = decoder.decode_16bit_int() / 10.0
-                        decoder.skip_registers(2)
-                        data["setting_system_type"] = decoder.decode_16bit_uint()
-                        data["setting_composed_phase"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(2)
-                        data["setting_ptouser_start_discharge"] = decoder.decode_16bit_uint()
-                        decoder.skip_registers(1)
-                        data["setting_voltage_start_derating"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_power_offset_wct"] = decoder.decode_16bit_int()
+                result = await self._get_gateway().execute_traced(
+                    self._device_id, trace, READ_METHODS[register_type], plan.start, count=plan.count, **self._kwargs
+                )
+            except Exception as ex:
+                self._record_block(register_type, plan, trace, None, ex)
+                raise
+            if self._response_complete(plan, result):
+                return register_type, plan, result, trace
+            self._commit_block(register_type, plan, trace, result, {})
+
+    async def _async_poll(self) -> dict:
+        """
+        Read the register tiers that are due in a single session.
+        All I/O is awaited on the event loop, so polls and writes
+        interleave request by request without holding a thread.
+        """
+        now = time.monotonic()
+        plans, tiers = self._read_plan(self._due_tiers(now))
+        # Blocks that failed last time are read again on the next tick, not after their tier's interval.
+        planned = {(register_type, plan.start, plan.count) for register_type, plan in plans}
+        plans = plans + [
+            (register_type, plan) for register_type, plan in self._failed_blocks
+            if (register_type, plan.start, plan.count) not in planned
+        ]
+        if not plans:
+            # Nothing due, or no enabled entity reads a register in the due tiers.
+            for tier in tiers:
+                self._tier_last_poll[tier] = now
+            return self.data
+
+        self.last_read_ok = False
+        self._read_attempted = True
+        responses = []
+        failed = []
+
+        try:
+            if not await self._get_gateway().connect():
+                _LOGGER.error("Modbus connection failed")
+                return self.data # Return last known data on connection fail
+            if not self._firmware_checked:
+                # Before the first full poll, so a known firmware's unsupported ranges are never read.
+                self._firmware_checked = True
+                key = await self._async_read_firmware()
+                if key is not None:
+                    await self._async_use_register_map(key)
+                    plans, tiers = self._read_plan(tiers)
+
+            started = time.monotonic()
+            pending = plans
+            mode = "sequential"
+            if self._pipeline_reads and len(plans) > 1:
+                # All blocks in flight at once; None if the gateway can't take that.
+                trace = RequestTrace()
+                results = await self._get_gateway().execute_pipelined(
+                    self._device_id, [(register_type, plan.start, plan.count) for register_type, plan in plans], trace
+                )
+                if results is not None:
+                    mode = "pipelined"
+                    # The blocks share one round trip; the ones that failed are retried one by one below.
+                    pending = []
+                    for (register_type, plan), result in zip(plans, results):
+                        if self._response_complete(plan, result):
+                            responses.append((register_type, plan, result, trace))
+                        else:
+                            self._commit_block(register_type, plan, trace, result, {})
+                            pending.append((register_type, plan))
+
+            # Each block succeeds or fails on its own, with a few retries shared by the whole poll.
+            self._retries_left = POLL_RETRY_BUDGET
+            unanswered = 0
+            for index, (register_type, plan) in enumerate(pending):
+                try:
+                    response = await self._async_read_block(register_type, plan, retried=mode == "pipelined")
+                    if response is not None:
+                        responses.append(response)
+                        unanswered = 0
                     else:
-                        _LOGGER.warning("Modbus read error on holding registers 64-119")
-
-                    # --- Block 3: Registers 125, 144-151, 158-169, 176-177, 194-198 ---
-                    result = client.read_holding_registers(125, count=1, **self._kwargs)
-                    if not result.isError(): 
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["setting_soc_low_limit_inverter_discharge"] = decoder.decode_16bit_uint()
-                    
-                    result = client.read_holding_registers(144, count=8, **self._kwargs)
-                    if not result.isError():
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["setting_voltage_float_charge"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_output_priority_config"] = decoder.decode_16bit_uint()
-                        data["setting_line_mode"] = decoder.decode_16bit_uint()
-                        data["setting_battery_capacity"] = decoder.decode_16bit_uint()
-                        data["setting_battery_nominal_voltage"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_voltage_equalization"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_equalization_interval"] = decoder.decode_16bit_uint()
-                        data["setting_equalization_time"] = decoder.decode_16bit_uint()
-                    
-                    result = client.read_holding_registers(158, count=12, **self._kwargs)
-                    if not result.isError():
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["setting_voltage_ac_charge_start"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_voltage_ac_charge_end"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_soc_ac_charge_start"] = decoder.decode_16bit_uint()
-                        data["setting_soc_ac_charge_end"] = decoder.decode_16bit_uint()
-                        data["setting_voltage_battery_low"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_voltage_battery_low_back"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_soc_battery_low"] = decoder.decode_16bit_uint()
-                        data["setting_soc_battery_low_back"] = decoder.decode_16bit_uint()
-                        data["setting_voltage_battery_low_to_utility"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_soc_battery_low_to_utility"] = decoder.decode_16bit_uint()
-                        data["setting_current_ac_charge_battery"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_voltage_ongrid_eod"] = decoder.decode_16bit_uint() / 10.0
-                    
-                    result = client.read_holding_registers(176, count=2, **self._kwargs)
-                    if not result.isError():
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["setting_power_max_grid_input"] = decoder.decode_16bit_uint()
-                        data["setting_power_gen_rated"] = decoder.decode_16bit_uint()
-                    
-                    result = client.read_holding_registers(194, count=5, **self._kwargs)
-                    if not result.isError():
-                        decoder = CustomPayloadDecoder(result.registers)
-                        data["setting_voltage_gen_charge_start"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_voltage_gen_charge_end"] = decoder.decode_16bit_uint() / 10.0
-                        data["setting_soc_gen_charge_start"] = decoder.decode_16bit_uint()
-                        data["setting_soc_gen_charge_end"] = decoder.decode_16bit_uint()
-                        data["setting_current_max_gen_charge_battery"] = decoder.decode_16bit_uint() / 10.0
-
-            except IndexError:
-                _LOGGER.warning("IndexError during Modbus decoding. Inverter response may be shorter than expected.")
-            except ConnectionException as ex:
-                _LOGGER.error(f"Modbus connection failed during update: {ex}")
-                return self.data # Return last known data
-            except Exception as e:
-                _LOGGER.error(f"An unexpected error occurred during Modbus update: {e}")
-                return self.data # Return last known data
+                        failed.append((register_type, plan))
+                except Exception as ex:
+                    _LOGGER.warning(
+                        f"Modbus read of {register_type} registers {plan.start}-{plan.start + plan.count - 1} failed: {ex}"
+                    )
+                    failed.append((register_type, plan))
+                    unanswered += 1
+                    if isinstance(ex, ConnectionException) or unanswered >= MAX_UNANSWERED_BLOCKS:
+                        # The gateway is gone; don't wait out a timeout for every remaining block.
+                        failed.extend(pending[index + 1:])
+                        break
+            self.last_poll_requests = len(plans) + POLL_RETRY_BUDGET - self._retries_left
+            self._record_poll_latency(mode, time.monotonic() - started)
 
+        except ConnectionException as ex:
+            _LOGGER.error(f"Modbus connection failed during update: {ex}")
+            self.data = self._with_block_stats(self.data)
+            return self.data # Return last known data
+        except Exception as e:
+            _LOGGER.error(f"An unexpected error occurred during Modbus update: {e}")
+            self.data = self._with_block_stats(self.data)
+            return self.data # Return last known data
 
-        # --- Final Calculations ---
-        if updated:
-            data['power_pv_total'] = data.get('power_pv1', 0) + data.get('power_pv2', 0) + data.get('power_pv3', 0)
-            
-            pv_voltages = [v for v in [data.get('voltage_pv1', 0), data.get('voltage_pv2', 0), data.get('voltage_pv3', 0)] if v > 25]
-            
-            if pv_voltages:
-                data['voltage_pv_average'] = sum(pv_voltages) / len(pv_voltages)
-            else:
-                data['voltage_pv_average'] = 0
-                
-            data['power_battery_total'] = data.get('power_battery_charge', 0) - data.get('power_battery_discharge', 0)
-            data['energy_daily_pv_total'] = data.get('energy_daily_pv1', 0) + data.get('energy_daily_pv2', 0) + data.get('energy_daily_pv3', 0)
-            data['energy_cumulative_pv'] = data.get('energy_cumulative_pv1', 0) + data.get('energy_cumulative_pv2', 0) + data.get('energy_cumulative_pv3', 0)
-            
-            data['power_grid_total'] = data.get('power_grid_import', 0) - data.get('power_grid_export', 0)
+        self._failed_blocks = failed
 
-            self.data = data
+        if responses:
+            await self.async_apply_blocks(responses, now, tiers)
             return self.data
         
         _LOGGER.warning("Modbus update failed to read any new data, returning last known values.")
+        self.data = self._with_block_stats(self.data)
         return self.data
 
-    def translate_bitmask_to_messages(self, code: int, message_map: dict) -> str:
-        """Translate a bitmask code into a comma-separated string of messages."""
-        if not code:
-            return "No Faults"
+    async def async_apply_blocks(self, blocks, now: float, tiers: Optional[frozenset[str]] = None) -> int:
+        """
+        Decode the block responses of one poll and publish the data with its
+        calculated values, events and statistics. `blocks` holds (register
+        type, plan, response, trace) tuples; the trace is None for responses
+        that weren't timed, such as replayed ones. `now` is the monotonic time
+        the poll started and `tiers` the tiers it read, by default all of them.
+        Both the live polls and the capture replay go through here. Returns the
+        number of blocks decoded.
+        """
+        data = self.data.copy()
+        decoded = 0
+        for register_type, plan, result, trace in blocks:
+            if self._commit_block(register_type, plan, trace or RequestTrace(), result, data):
+                decoded += 1
+        if not decoded:
+            return 0
 
-        messages = [
-            message for bit, message in message_map.items() if (code & bit)
-        ]
+        # --- Final Calculations ---
+        self._finish_poll(data, frozenset(self._tier_intervals) if tiers is None else tiers, now)
+        key = register_map_key(self.data)
+        if key is not None and key != self.register_map_key:
+            # The firmware was updated, or its versions couldn't be read at startup.
+            await self._async_use_register_map(key)
+        return decoded
+
+    def _finish_poll(self, data: dict, tiers: frozenset[str], now: float) -> dict:
+        """Add the calculated values to the data of a poll that read at least one block, and publish it."""
+        self.last_read_ok = True
+        for tier in tiers:
+            self._tier_last_poll[tier] = now
+
+        data['power_pv_total'] = data.get('power_pv1', 0) + data.get('power_pv2', 0) + data.get('power_pv3', 0)
+        
+        pv_voltages = [v for v in [data.get('voltage_pv1', 0), data.get('voltage_pv2', 0), data.get('voltage_pv3', 0)] if v > 25]
+        
+        if pv_voltages:
+            data['voltage_pv_average'] = sum(pv_voltages) / len(pv_voltages)
+        else:
+            data['voltage_pv_average'] = 0
+            
+        data['power_battery_total'] = data.get('power_battery_charge', 0) - data.get('power_battery_discharge', 0)
+        data['energy_daily_pv_total'] = data.get('energy_daily_pv1', 0) + data.get('energy_daily_pv2', 0) + data.get('energy_daily_pv3', 0)
+        data['energy_cumulative_pv'] = data.get('energy_cumulative_pv1', 0) + data.get('energy_cumulative_pv2', 0) + data.get('energy_cumulative_pv3', 0)
         
-        if not messages:
-            return f"Unknown Code: {hex(code)}"
+        data['power_grid_total'] = data.get('power_grid_import', 0) - data.get('power_grid_export', 0)
+        if self.data:
+            self._fire_code_events(data)
+        if TIER_SETTINGS in tiers and self.data:
+            changed = sorted(key for key in SETTINGS_KEYS if key in self.data and data.get(key) != self.data[key])
+            if changed:
+                _LOGGER.info(f"Settings changed outside Home Assistant: {', '.join(changed)}")
+        if self._sampler is not None and TIER_NORMAL in tiers:
+            # Spikes between polls, once per reporting interval.
+            data.update(self._sampler.publish())
+        if self._integrator is not None:
+            # Anchor to the cumulative registers read in this poll, then publish every poll.
+            self._integrator.anchor(data, {key for key, read_at in self._read_at.items() if read_at >= now})
+            data.update(self._integrator.totals())
+        gateway = self._get_gateway()
+        data['modbus_reconnects'] = gateway.connection.reconnect_count + gateway.connection.idle_reconnect_count
+        stats = gateway.stats[self._device_id]
+        data['modbus_requests'] = stats.requests
+        data['modbus_errors'] = stats.errors
+        data['modbus_latency'] = round(stats.latency * 1000, 1)
+        data['modbus_queue_wait'] = round(stats.queue_wait * 1000, 1)
+        data['poll_latency'] = round(self.last_poll_latency * 1000, 1)
+
+        self.data = self._with_block_stats(data)
+        return self.data
+
+    async def _async_read_firmware(self) -> Optional[str]:
+        """Read just the firmware versions and return their register map key, None if that fails."""
+        descriptions = [d for d in HOLDING_REGISTERS if d.key in FIRMWARE_KEYS]
+        data: dict = {}
+        try:
+            for request in plan_reads(description_spans(descriptions), max_gap=self._max_read_gap):
+                result = await self._execute(
+                    READ_METHODS["holding"], request.start, count=request.count, **self._kwargs
+                )
+                if result.isError():
+                    _LOGGER.debug(f"Reading the firmware versions failed: {describe_error(result)}")
+                    return None
+                compile_decode_plan(descriptions, request.start, request.count).apply(result.registers, data)
+        except (IndexError, ModbusException) as ex:
+            _LOGGER.debug(f"Reading the firmware versions failed: {ex}")
+            return None
+        return register_map_key(data)
+
+    async def _async_use_register_map(self, key: str) -> None:
+        """Apply the register map stored for the firmware `key`, or none if it was never discovered."""
+        self.register_map_key = key
+        register_map = await async_load_register_map(self.hass, key)
+        if register_map is None:
+            _LOGGER.debug(
+                f"No register map for firmware {key}, "
+                f"the {DOMAIN}.{SERVICE_DISCOVER_REGISTERS} service discovers one"
+            )
+            if self._holes == UNREADABLE_REGISTERS:
+                return
+            # The holes of the previous firmware may be readable now.
+            register_map = {}
+        self._apply_register_map(register_map)
+
+    def _apply_register_map(self, register_map: dict) -> None:
+        """Keep the read plans out of the ranges a register map found unreadable, and replan."""
+        holes = register_map_holes(register_map)
+        self._holes = {
+            register_type: tuple(ranges) + holes.get(register_type, ())
+            for register_type, ranges in UNREADABLE_REGISTERS.items()
+        }
+        self._read_plans.clear()
+        self._failed_blocks = []
+        if self._sampler is not None:
+            self._sample_plans = self._compile_read_plan(lambda d: d.key in SAMPLED_POWER_KEYS)
+        _LOGGER.info(
+            f"Skipping the registers firmware {self.register_map_key} doesn't answer: "
+            + (", ".join(f"{t} {first}-{last}" for t, ranges in holes.items() for first, last in ranges) or "none")
+        )
+
+    async def _async_readable(self, register_type: str, start: int, count: int) -> bool:
+        """
+        Return whether a block of registers can be read. Raises RegisterScanError
+        when the read fails for any reason other than the registers not existing.
+        """
+        result = await self._execute(READ_METHODS[register_type], start, count=count, **self._kwargs)
+        if not result.isError():
+            # Some firmwares answer a partly unsupported block with just its readable start.
+            return len(result.registers) >= count
+        if isinstance(result, ExceptionResponse) and result.exception_code in UNSUPPORTED_EXCEPTION_CODES:
+            return False
+        raise RegisterScanError(
+            f"Reading {register_type} registers {start}-{start + count - 1} failed: {describe_error(result)}"
+        )
+
+    async def async_discover_registers(self) -> dict:
+        """
+        Sweep the input and holding registers up to the last described one for
+        the ranges this inverter answers, store them as the register map of its
+        firmware and replan the reads around the rest. Returns the register map.
+        """
+        if not await self._get_gateway().connect():
+            raise RegisterScanError("Modbus connection failed")
+        key = await self._async_read_firmware()
+        if key is None:
+            raise RegisterScanError("The firmware versions can't be read")
+
+        register_map = {}
+        started = time.monotonic()
+        for register_type, descriptions in (("input", INPUT_REGISTERS), ("holding", HOLDING_REGISTERS)):
+            spans = description_spans(descriptions)
+            end = max(last for _, last in spans) + 1
+
+            async def read(start: int, count: int, register_type: str = register_type) -> bool:
+                return await self._async_readable(register_type, start, count)
+
+            try:
+                readable = await async_scan_registers(read, end, spans)
+            except (IndexError, ModbusException) as ex:
+                raise RegisterScanError(f"Scanning the {register_type} registers failed: {ex}") from ex
+            register_map[register_type] = {"end": end, "readable": [list(r) for r in readable]}
+        _LOGGER.info(f"Discovered the registers of firmware {key} in {time.monotonic() - started:.1f}s")
 
-        return ", ".join(messages)
\ No newline at end of file
+        await async_save_register_map(self.hass, key, register_map)
+        self.register_map_key = key
+        self._apply_register_map(register_map)
+        return register_map
@@ -0,0 +1,101 @@
+"""Per-block request statistics of the read plan."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from homeassistant.util import dt as dt_util
+
+# Round trips kept per block for the rolling percentiles.
+ROLLING_WINDOW = 100
+
+# Modbus TCP frame sizes: MBAP header plus function code, address and count,
+# and MBAP header plus function code and byte count ahead of the registers.
+READ_REQUEST_BYTES = 12
+READ_RESPONSE_OVERHEAD = 9
+
+
+def read_bytes(registers: int) -> int:
+    """Return the bytes on the wire of a read request and its response."""
+    return READ_REQUEST_BYTES + READ_RESPONSE_OVERHEAD + 2 * registers
+
+
+def describe_error(result) -> str:
+    """Return a short name of a failed read, from an exception or an error response."""
+    if isinstance(result, BaseException):
+        return type(result).__name__
+    code = getattr(result, "exception_code", None)
+    return f"Modbus exception {code}" if code else type(result).__name__
+
+
+@dataclass
+class BlockStats:
+    """Round trips and failures of one block of the read plan."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes: int = 0
+    last_error: Optional[str] = None
+    last_error_at: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    rtt: deque = field(default_factory=lambda: deque(maxlen=ROLLING_WINDOW))
+
+    def record(self, rtt: float, retries: int, transferred: int, error: Optional[str] = None) -> None:
+        """Add one read of the block."""
+        self.requests += 1
+        self.retries += retries
+        self.bytes += transferred
+        self.rtt.append(rtt)
+        if error is None:
+            self.last_success = dt_util.utcnow()
+        else:
+            self.errors += 1
+            self.last_error = error
+            self.last_error_at = dt_util.utcnow()
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return a percentile of the recent round trips, seconds."""
+        if not self.rtt:
+            return None
+        ordered = sorted(self.rtt)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def as_dict(self) -> dict:
+        """Return the statistics in milliseconds, for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at.isoformat() if self.last_error_at else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "rtt_p50_ms": _ms(self.percentile(0.5)),
+            "rtt_p95_ms": _ms(self.percentile(0.95)),
+            "rtt_max_ms": _ms(max(self.rtt, default=None)),
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def summarize_blocks(blocks: dict[str, BlockStats]) -> dict:
+    """Return the values of the block diagnostic sensors: the worst block and the totals."""
+    measured = {name: stats for name, stats in blocks.items() if stats.rtt}
+    slowest = max(measured, key=lambda name: measured[name].percentile(0.95), default=None)
+    failed = [stats for stats in blocks.values() if stats.last_error_at is not None]
+    latest_error = max(failed, key=lambda stats: stats.last_error_at, default=None)
+    return {
+        "modbus_block_rtt_p50": _ms(max((s.percentile(0.5) for s in measured.values()), default=None)),
+        "modbus_block_rtt_p95": _ms(max((s.percentile(0.95) for s in measured.values()), default=None)),
+        "modbus_block_rtt_max": _ms(max((max(s.rtt) for s in measured.values()), default=None)),
+        "modbus_slowest_block": slowest,
+        "modbus_retries": sum(s.retries for s in blocks.values()),
+        "modbus_bytes": sum(s.bytes for s in blocks.values()),
+        "modbus_last_error": latest_error.last_error if latest_error else None,
+    }
@@ -14,7 +14,6 @@ from .const import (
     DOMAIN,
     HOLDING_REGISTERS,
     EG4ModbusNumberEntityDescription,
-    ATTR_MANUFACTURER,
     CONF_ENABLE_WRITE_SENSORS,
 )
 from .hub import EG4ModbusHub
@@ -30,27 +29,21 @@ async def async_setup_entry(
     """Set up the EG4 number entities."""
     hub: EG4ModbusHub = hass.data[DOMAIN][entry.entry_id]
     
-    device_info = {
-        "identifiers": {(DOMAIN, hub.name)},
-        "name": hub.name,
-        "manufacturer": ATTR_MANUFACTURER,
-        "model": "EG4 Inverter",
-    }
-
     entities = []
     
     enable_write_sensors = entry.options.get(CONF_ENABLE_WRITE_SENSORS, False)
 
-    for address, description in HOLDING_REGISTERS.items():
-        if isinstance(description, EG4ModbusNumberEntityDescription):
-            # Calculate the desired state without modifying the global description
-            is_enabled = description.entity_registry_enabled_default
-            if enable_write_sensors:
-                is_enabled = True
+    for unit in hub.units:
+        for description in HOLDING_REGISTERS:
+            if isinstance(description, EG4ModbusNumberEntityDescription):
+                # Calculate the desired state without modifying the global description
+                is_enabled = description.entity_registry_enabled_default
+                if enable_write_sensors:
+                    is_enabled = True
             
-            # Pass the calculated state to the constructor
-            entity = EG4Number(hub, device_info, description, address, is_enabled)
-            entities.append(entity)
+                # Pass the calculated state to the constructor
+                entity = EG4Number(unit, unit.device_info, description, is_enabled)
+                entities.append(entity)
 
     async_add_entities(entities)
 
@@ -67,17 +60,21 @@ class EG4Number(CoordinatorEntity[EG4ModbusHub], NumberEntity):
         hub: EG4ModbusHub,
         device_info: dict,
         description: EG4ModbusNumberEntityDescription,
-        address: int,
         enabled_default: bool,  # <-- Add this argument
     ):
         """Initialize the number entity."""
-        super().__init__(coordinator=hub)
+        super().__init__(coordinator=hub, context=description.key)
         self.entity_description = description
         self._attr_device_info = device_info
         self._attr_unique_id = f"{hub.name}_{description.key}"
         self._attr_name = description.name
         self._attr_entity_enabled_default = enabled_default  # <-- Use the argument
-        self._address = address
+        self._address = description.address
+
+    @property
+    def available(self) -> bool:
+        """Return False while the value is stale because its registers can't be read."""
+        return super().available and not self.coordinator.is_stale(self.entity_description.key)
 
     @property
     def native_value(self) -> float | None:
@@ -89,10 +86,8 @@ class EG4Number(CoordinatorEntity[EG4ModbusHub], NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        scaled_value = int(value / self.entity_description.scale)
-        if await self.hass.async_add_executor_job(
-            self.coordinator.write_register, self._address, scaled_value
-        ):
-            self.coordinator.data[self.entity_description.key] = value
-            self.async_write_ha_state()
-            await self.coordinator.async_request_refresh()
+        scaled_value = round(value / self.entity_description.scale)
+        if self.entity_description.signed:
+            scaled_value &= 0xFFFF
+        # The read-back after the write publishes what the inverter actually stored.
+        await self.coordinator.async_queue_write(self._address, scaled_value)
@@ -0,0 +1,111 @@
+"""Poll every inverter of a parallel system together and publish system totals."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import ATTR_MANUFACTURER, DOMAIN, PARALLEL_SENSORS
+from .hub import EG4ModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+# Aggregates averaged over the units instead of summed.
+MEAN_AGGREGATES = {"parallel_battery_soc"}
+
+
+def parse_units(value: str) -> list[int]:
+    """Parse a comma separated list of unit ids, e.g. "1, 2, 3"."""
+    units = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        unit = int(part)
+        if not 1 <= unit <= 247:
+            raise ValueError(f"Unit id {unit} is out of range")
+        if unit not in units:
+            units.append(unit)
+    return units
+
+
+class EG4ParallelHub(DataUpdateCoordinator[dict]):
+    """
+    Poll all units of a parallel system in one round and aggregate them.
+
+    The units share one gateway, whose scheduler takes one request per unit in
+    turn, so polling them concurrently interleaves their blocks and every
+    unit's snapshot is taken within the same short window. A total only
+    counts the units whose registers behind it were read in that round.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str, units: list[EG4ModbusHub]):
+        """Initialize the parallel hub."""
+        super().__init__(hass, _LOGGER, name=name, update_interval=units[0].update_interval)
+        self.units = units
+        self.data: dict = {}
+        sources = frozenset(key for d in PARALLEL_SENSORS for key in d.sources)
+        for unit in units:
+            # The units are refreshed in rounds by this hub, not on their own timers.
+            unit.update_interval = None
+            unit.required_keys = sources
+
+    @property
+    def device_info(self) -> dict:
+        """Return the device the system totals belong to."""
+        return {
+            "identifiers": {(DOMAIN, self.name)},
+            "name": self.name,
+            "manufacturer": ATTR_MANUFACTURER,
+            "model": "EG4 Parallel System",
+        }
+
+    def is_stale(self, key: str) -> bool:
+        """System totals are only computed from units that answered, so they are never stale."""
+        return False
+
+    def close(self) -> None:
+        """Close every unit."""
+        for unit in self.units:
+            unit.close()
+
+    async def _async_update_data(self) -> dict:
+        """Poll all units in one interleaved round and compute the system totals."""
+        started = time.monotonic()
+        await asyncio.gather(*(unit.async_poll_once() for unit in self.units))
+        window = time.monotonic() - started
+        # The round follows the unit that is doing best; struggling units only probe.
+        self.update_interval = timedelta(seconds=min(unit.poll_interval for unit in self.units))
+
+        online = [unit for unit in self.units if unit.last_read_ok]
+        if len(online) < len(self.units):
+            missing = [unit.unit_id for unit in self.units if not unit.last_read_ok]
+            _LOGGER.debug(f"Units {missing} of the parallel system did not answer this round")
+        data = self.data.copy()
+        data["parallel_units_online"] = len(online)
+        data["parallel_poll_window"] = round(window * 1000)
+        if not online:
+            _LOGGER.warning("No unit of the parallel system answered, keeping the last totals.")
+            return data
+
+        for description in PARALLEL_SENSORS:
+            if not description.sources:
+                continue
+            source = description.sources[0]
+            # A unit whose block failed this round would add a stale value.
+            values = [
+                unit.data[source] for unit in online
+                if unit.read_since(source, started) and unit.data.get(source) is not None
+            ]
+            if not values:
+                continue  # not due this round, or no unit read it
+            if description.key in MEAN_AGGREGATES:
+                data[description.key] = round(sum(values) / len(values), 1)
+            else:
+                # Summing tenths leaves float noise like 13878.300000000001 behind.
+                data[description.key] = round(sum(values), 3)
+        return data
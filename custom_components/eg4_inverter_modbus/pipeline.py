@@ -0,0 +1,120 @@
+"""Modbus TCP reads with several transactions in flight on one socket."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from typing import NamedTuple, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_FUNCTION_CODES = {"input": 0x04, "holding": 0x03}
+
+# MBAP header: transaction id, protocol id (always 0), length of the rest, unit id.
+_MBAP = struct.Struct(">HHHB")
+_READ_REQUEST = struct.Struct(">HHHBBHH")
+
+
+class PipelineError(Exception):
+    """The gateway doesn't handle pipelined requests correctly."""
+
+
+class PipelineTransportError(Exception):
+    """A pipelined batch was lost to a timeout or a dropped connection."""
+
+
+class PipelinedResponse(NamedTuple):
+    """A read response, holding the raw big-endian register payload."""
+
+    payload: bytes
+    exception_code: int = 0
+
+    def isError(self) -> bool:  # noqa: N802 - same name as pymodbus responses
+        """Return True for a Modbus exception response."""
+        return bool(self.exception_code)
+
+    @property
+    def registers(self) -> list[int]:
+        """Return the payload as a list of registers."""
+        return list(struct.unpack(f">{len(self.payload) // 2}H", self.payload))
+
+
+class PipelinedReader:
+    """
+    Send a batch of read requests back to back and match the responses by
+    transaction id, so a poll costs one round trip instead of one per block.
+
+    pymodbus runs one transaction at a time, so this speaks Modbus TCP on a
+    socket of its own, next to the shared pymodbus session, opened on the
+    first batch. The gateway must accept that second TCP client; many
+    single-client RS485 bridges don't. The gateway's scheduler still sends
+    one batch or request at a time over either socket.
+    A response that doesn't fit the batch raises PipelineError, after which
+    callers read one request at a time for good. A timeout or dropped
+    connection raises PipelineTransportError and only loses that batch. Both
+    close the socket.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5):
+        """Initialize the reader."""
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._transaction_id = 0
+
+    async def _ensure_open(self) -> None:
+        """Open the socket if needed."""
+        if self._writer is not None and not self._writer.is_closing():
+            return
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port), self._timeout
+        )
+
+    def _next_transaction_id(self) -> int:
+        """Return the next transaction id, skipping 0."""
+        self._transaction_id = self._transaction_id % 0xFFFF + 1
+        return self._transaction_id
+
+    async def read(self, unit: int, requests: list[tuple[str, int, int]]) -> list[PipelinedResponse]:
+        """Read every (register type, start, count) request, all in flight at once."""
+        try:
+            await self._ensure_open()
+            pending: dict[int, tuple[int, int, int]] = {}
+            frames = []
+            for index, (register_type, start, count) in enumerate(requests):
+                transaction_id = self._next_transaction_id()
+                function_code = READ_FUNCTION_CODES[register_type]
+                pending[transaction_id] = (index, function_code, count)
+                frames.append(_READ_REQUEST.pack(transaction_id, 0, 6, unit, function_code, start, count))
+            self._writer.write(b"".join(frames))
+            await self._writer.drain()
+
+            results: list[Optional[PipelinedResponse]] = [None] * len(requests)
+            while pending:
+                header = await asyncio.wait_for(self._reader.readexactly(_MBAP.size), self._timeout)
+                transaction_id, protocol_id, length, unit_id = _MBAP.unpack(header)
+                if protocol_id != 0 or transaction_id not in pending or unit_id != unit or not 2 <= length <= 256:
+                    raise PipelineError(f"Unexpected response header {header.hex()}")
+                body = await asyncio.wait_for(self._reader.readexactly(length - 1), self._timeout)
+                index, function_code, count = pending.pop(transaction_id)
+                if body[0] == function_code | 0x80:
+                    results[index] = PipelinedResponse(b"", body[1] if len(body) > 1 else 0xFF)
+                elif body[0] != function_code or len(body) < 2 or body[1] != 2 * count or len(body) != 2 + 2 * count:
+                    raise PipelineError(f"Malformed response to transaction {transaction_id}")
+                else:
+                    results[index] = PipelinedResponse(bytes(body[2:]))
+            return results
+        except PipelineError:
+            self.close()
+            raise
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError) as ex:
+            self.close()
+            raise PipelineTransportError(f"Pipelined read failed: {ex!r}") from ex
+
+    def close(self) -> None:
+        """Close the socket."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
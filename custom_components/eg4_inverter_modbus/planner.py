@@ -0,0 +1,82 @@
+"""Plan the fewest Modbus read requests that cover a set of registers."""
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+
+# A read response PDU carries at most 125 registers (Modbus spec, FC03/FC04).
+MAX_REGISTERS_PER_READ = 125
+# A write multiple registers request PDU carries at most 123 registers (FC16).
+MAX_REGISTERS_PER_WRITE = 123
+
+
+class ReadRequest(NamedTuple):
+    """One read request of `count` registers starting at `start`."""
+
+    start: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        """Return the last register covered by the request."""
+        return self.start + self.count - 1
+
+
+def _in_hole(first: int, last: int, holes: list[tuple[int, int]]) -> bool:
+    """Check whether any register in first..last falls inside a known hole."""
+    return any(hole_first <= last and first <= hole_last for hole_first, hole_last in holes)
+
+
+def plan_reads(
+    spans: Iterable[tuple[int, int]],
+    max_count: int = MAX_REGISTERS_PER_READ,
+    max_gap: int = 0,
+    holes: Iterable[tuple[int, int]] = (),
+) -> list[ReadRequest]:
+    """
+    Return the smallest list of read requests covering every span.
+
+    `spans` are inclusive (first, last) register ranges that must each be read
+    in one piece, so a 32-bit value is never split across two requests.
+    Up to `max_gap` unneeded registers are read to bridge two spans, but never
+    registers inside one of the inclusive `holes` that are known to be
+    unreadable, and no request is longer than `max_count`. Spans that touch a
+    hole can't be read at all and are dropped.
+
+    Growing each request greedily from the lowest address is optimal here,
+    since a feasible request stays feasible when its last span is removed.
+    """
+    holes = sorted(holes)
+    requests: list[ReadRequest] = []
+    start = end = None
+
+    for first, last in sorted(set(spans)):
+        if _in_hole(first, last, holes):
+            continue
+        if start is not None:
+            if first <= end:
+                # Overlapping spans (e.g. bitfields sharing a register) extend the request.
+                if max(end, last) - start < max_count:
+                    end = max(end, last)
+                    continue
+            elif (
+                first - end - 1 <= max_gap
+                and last - start < max_count
+                and not _in_hole(end + 1, first - 1, holes)
+            ):
+                end = last
+                continue
+            requests.append(ReadRequest(start, end - start + 1))
+        start, end = first, last
+
+    if start is not None:
+        requests.append(ReadRequest(start, end - start + 1))
+    return requests
+
+
+def description_spans(descriptions) -> list[tuple[int, int]]:
+    """Return the inclusive register span of every description that maps to registers."""
+    return [
+        (description.address, description.address + description.registers - 1)
+        for description in descriptions
+        if description.address is not None
+    ]
@@ -0,0 +1,119 @@
+"""High-rate sampling of the power registers between polls."""
+from __future__ import annotations
+
+import asyncio
+from array import array
+import logging
+import math
+from typing import Awaitable, Callable, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistics published per sampled key, as f"{key}_{statistic}".
+SAMPLE_STATISTICS = ("min", "max", "mean")
+
+
+class RingBuffer:
+    """A fixed-size ring of float samples in a flat array."""
+
+    __slots__ = ("_values", "_next", "size")
+
+    def __init__(self, capacity: int):
+        """Initialize the ring."""
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self.size = 0
+
+    def append(self, value: float) -> None:
+        """Add a sample, overwriting the oldest once the ring is full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        if self.size < len(self._values):
+            self.size += 1
+
+    def values(self) -> memoryview:
+        """Return the samples held, in no particular order."""
+        return memoryview(self._values)[:self.size]
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._next = self.size = 0
+
+
+class PowerSampler:
+    """
+    Read a small block of power registers several times a second and keep the
+    samples of each key in a ring buffer, so short spikes that fall between
+    two polls still show up in the min/max/mean of the reporting window.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[], Awaitable[Optional[dict]]],
+        keys: tuple[str, ...],
+        rate: float,
+        window: float,
+        listener: Optional[Callable[[float, dict], None]] = None,
+    ):
+        """
+        Initialize the sampler; `read` returns the decoded block, or None on
+        failure. `listener` is called with the loop time and the values of
+        every sample.
+        """
+        self._read = read
+        self._listener = listener
+        self.rate = rate
+        # Room for two reporting windows, in case a poll is late.
+        capacity = max(1, math.ceil(rate * window * 2))
+        self.rings = {key: RingBuffer(capacity) for key in keys}
+        self.samples = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self) -> None:
+        """Sample at the configured rate; late samples shift the schedule instead of bursting."""
+        loop = asyncio.get_running_loop()
+        period = 1 / self.rate
+        due = loop.time()
+        while True:
+            try:
+                values = await self._read()
+            except Exception as ex:  # the next sample tries again
+                _LOGGER.debug(f"Power sample failed: {ex}")
+                values = None
+            if values is None:
+                self.failures += 1
+            else:
+                self.samples += 1
+                for key, ring in self.rings.items():
+                    value = values.get(key)
+                    if value is not None:
+                        ring.append(value)
+                if self._listener is not None:
+                    self._listener(loop.time(), values)
+            due = max(due + period, loop.time())
+            await asyncio.sleep(due - loop.time())
+
+    def publish(self) -> dict:
+        """Return the statistics of the samples since the last call and start a new window."""
+        data = {}
+        for key, ring in self.rings.items():
+            if not ring.size:
+                continue
+            values = ring.values()
+            data[f"{key}_min"] = min(values)
+            data[f"{key}_max"] = max(values)
+            data[f"{key}_mean"] = round(math.fsum(values) / ring.size, 1)
+            ring.clear()
+        return data
@@ -0,0 +1,77 @@
+"""Adaptive poll interval with a circuit breaker for degraded gateways."""
+from __future__ import annotations
+
+import random
+
+# Growth of the interval per failed or slow poll, and its random spread once stretched.
+BACKOFF_FACTOR = 2
+JITTER = 0.2
+# Consecutive failed polls before the breaker opens and polls turn into probes.
+FAILURES_TO_OPEN = 3
+# A successful poll counts as slow when its requests took longer than this on average,
+# seconds. A full 125-register read takes about 0.3 s on a 9600 baud RS485 bus, inverter
+# turnaround included, so a healthy serial bridge stays well below it however many
+# blocks a poll reads.
+SLOW_REQUEST_SECONDS = 1.0
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class AdaptiveSchedule:
+    """
+    Stretch the poll interval while a gateway struggles and shrink it back
+    once it recovers.
+
+    Failed and slow polls double the interval up to `maximum`, with jitter so
+    several hubs don't retry in lockstep, and every healthy poll halves it
+    again. After FAILURES_TO_OPEN failed polls in a row the breaker opens: the
+    hub then only sends a single-register probe per tick, and resumes full
+    polls (half open) as soon as the probe is answered.
+    """
+
+    def __init__(self, base: float, maximum: float):
+        """Initialize the schedule."""
+        self.base = base
+        self.maximum = max(maximum, base)
+        self.interval = base
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self._stretch = 1.0
+
+    def record_poll(self, ok: bool, latency: float, requests: int = 1) -> float:
+        """Account for a full poll of `requests` reads that took `latency` seconds and return the next interval."""
+        if ok:
+            self.failures = 0
+            self.state = BREAKER_CLOSED
+            if latency > max(1, requests) * SLOW_REQUEST_SECONDS:
+                self._grow()
+            else:
+                self._stretch = max(1.0, self._stretch / BACKOFF_FACTOR)
+        else:
+            self.failures += 1
+            if self.failures >= FAILURES_TO_OPEN:
+                self.state = BREAKER_OPEN
+            self._grow()
+        return self._next_interval()
+
+    def record_probe(self, ok: bool) -> None:
+        """Account for a probe of an open breaker."""
+        if ok:
+            self.state = BREAKER_HALF_OPEN
+        else:
+            self._grow()
+            self._next_interval()
+
+    def _grow(self) -> None:
+        """Stretch the interval one step."""
+        self._stretch = min(self._stretch * BACKOFF_FACTOR, self.maximum / self.base)
+
+    def _next_interval(self) -> float:
+        """Return the stretched interval, jittered when it is above the base."""
+        interval = self.base * self._stretch
+        if self._stretch > 1:
+            interval *= random.uniform(1 - JITTER, 1 + JITTER)
+        self.interval = min(self.maximum, max(self.base, interval))
+        return self.interval
@@ -14,7 +14,6 @@ from .const import (
     DOMAIN,
     HOLDING_REGISTERS,
     EG4ModbusSelectEntityDescription,
-    ATTR_MANUFACTURER,
     CONF_ENABLE_WRITE_SENSORS,
 )
 from .hub import EG4ModbusHub
@@ -30,27 +29,21 @@ async def async_setup_entry(
     """Set up the EG4 select entities."""
     hub: EG4ModbusHub = hass.data[DOMAIN][entry.entry_id]
     
-    device_info = {
-        "identifiers": {(DOMAIN, hub.name)},
-        "name": hub.name,
-        "manufacturer": ATTR_MANUFACTURER,
-        "model": "EG4 Inverter",
-    }
-
     entities = []
     
     enable_write_sensors = entry.options.get(CONF_ENABLE_WRITE_SENSORS, False)
 
-    for address, description in HOLDING_REGISTERS.items():
-        if isinstance(description, EG4ModbusSelectEntityDescription):
-            # Calculate the desired state without modifying the global description
-            is_enabled = description.entity_registry_enabled_default
-            if enable_write_sensors:
-                is_enabled = True
+    for unit in hub.units:
+        for description in HOLDING_REGISTERS:
+            if isinstance(description, EG4ModbusSelectEntityDescription):
+                # Calculate the desired state without modifying the global description
+                is_enabled = description.entity_registry_enabled_default
+                if enable_write_sensors:
+                    is_enabled = True
 
-            # Pass the calculated state to the constructor
-            entity = EG4Select(hub, device_info, description, address, is_enabled)
-            entities.append(entity)
+                # Pass the calculated state to the constructor
+                entity = EG4Select(unit, unit.device_info, description, is_enabled)
+                entities.append(entity)
 
     async_add_entities(entities)
 
@@ -66,17 +59,21 @@ class EG4Select(CoordinatorEntity[EG4ModbusHub], SelectEntity):
         hub: EG4ModbusHub,
         device_info: dict,
         description: EG4ModbusSelectEntityDescription,
-        address: int,
         enabled_default: bool,  # <-- Add this argument
     ):
         """Initialize the select entity."""
-        super().__init__(coordinator=hub)
+        super().__init__(coordinator=hub, context=description.key)
         self.entity_description = description
         self._attr_device_info = device_info
         self._attr_unique_id = f"{hub.name}_{description.key}"
         self._attr_name = description.name
         self._attr_entity_enabled_default = enabled_default  # <-- Use the argument
-        self._address = address
+        self._address = description.address
+
+    @property
+    def available(self) -> bool:
+        """Return False while the value is stale because its registers can't be read."""
+        return super().available and not self.coordinator.is_stale(self.entity_description.key)
 
     @property
     def current_option(self) -> str | None:
@@ -98,11 +95,7 @@ class EG4Select(CoordinatorEntity[EG4ModbusHub], SelectEntity):
         """Change the selected option."""
         try:
             index = self.entity_description.options.index(option)
-            if await self.hass.async_add_executor_job(
-                self.coordinator.write_register, self._address, index
-            ):
-                self.coordinator.data[self.entity_description.key] = index
-                self.async_write_ha_state()
-                await self.coordinator.async_request_refresh()
+            # The read-back after the write publishes what the inverter actually stored.
+            await self.coordinator.async_queue_write(self._address, index)
         except ValueError:
             _LOGGER.error(f"'{option}' is not a valid option for {self.name}")
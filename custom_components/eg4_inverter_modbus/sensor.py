@@ -12,11 +12,14 @@ from .const import (
     DOMAIN,
     INPUT_REGISTERS,
     HOLDING_REGISTERS,
+    PARALLEL_SENSORS,
+    ENERGY_INTEGRATION_SENSORS,
+    POWER_STATISTICS_SENSORS,
     EG4ModbusSensorEntityDescription,
-    ATTR_MANUFACTURER,
     CONF_ENABLE_READ_SENSORS,
 )
 from .hub import EG4ModbusHub
+from .parallel import EG4ParallelHub
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,32 +32,37 @@ async def async_setup_entry(
     """Set up the EG4 sensors."""
     hub: EG4ModbusHub = hass.data[DOMAIN][entry.entry_id]
     
-    device_info = {
-        "identifiers": {(DOMAIN, hub.name)},
-        "name": hub.name,
-        "manufacturer": ATTR_MANUFACTURER,
-        "model": "EG4 Inverter",
-    }
-
     entities = []
     
     enable_read_sensors = entry.options.get(CONF_ENABLE_READ_SENSORS, False)
 
-    # Create sensors from Input Registers
-    for description in INPUT_REGISTERS.values():
-        if isinstance(description, EG4ModbusSensorEntityDescription):
-            is_enabled = description.entity_registry_enabled_default
-            if enable_read_sensors:
-                is_enabled = True
-            entities.append(EG4Sensor(hub, device_info, description, is_enabled))
-
-    # Create sensors from Holding Registers
-    for description in HOLDING_REGISTERS.values():
-        if isinstance(description, EG4ModbusSensorEntityDescription):
-            is_enabled = description.entity_registry_enabled_default
-            if enable_read_sensors:
-                is_enabled = True
-            entities.append(EG4Sensor(hub, device_info, description, is_enabled))
+    for unit in hub.units:
+        # Create sensors from Input Registers
+        for description in INPUT_REGISTERS:
+            if isinstance(description, EG4ModbusSensorEntityDescription):
+                is_enabled = description.entity_registry_enabled_default
+                if enable_read_sensors:
+                    is_enabled = True
+                entities.append(EG4Sensor(unit, unit.device_info, description, is_enabled))
+
+        # Create sensors from Holding Registers
+        for description in HOLDING_REGISTERS:
+            if isinstance(description, EG4ModbusSensorEntityDescription):
+                is_enabled = description.entity_registry_enabled_default
+                if enable_read_sensors:
+                    is_enabled = True
+                entities.append(EG4Sensor(unit, unit.device_info, description, is_enabled))
+
+        # Create the statistics and integrated energy of the power samples
+        if unit.power_sampling:
+            for description in POWER_STATISTICS_SENSORS + ENERGY_INTEGRATION_SENSORS:
+                is_enabled = description.entity_registry_enabled_default or enable_read_sensors
+                entities.append(EG4Sensor(unit, unit.device_info, description, is_enabled))
+
+    # Create the system totals of a parallel system
+    if isinstance(hub, EG4ParallelHub):
+        for description in PARALLEL_SENSORS:
+            entities.append(EG4Sensor(hub, hub.device_info, description, description.entity_registry_enabled_default))
 
     async_add_entities(entities)
 
@@ -73,7 +81,7 @@ class EG4Sensor(CoordinatorEntity[EG4ModbusHub], SensorEntity):
         enabled_default: bool,  # <-- Add this argument
     ):
         """Initialize the sensor."""
-        super().__init__(coordinator=hub)
+        super().__init__(coordinator=hub, context=description.key)
         self.entity_description = description
         self._attr_device_info = device_info
         self._attr_unique_id = f"{hub.name}_{description.key}"
@@ -81,6 +89,11 @@ class EG4Sensor(CoordinatorEntity[EG4ModbusHub], SensorEntity):
         self._attr_suggested_display_precision = description.suggested_display_precision
         self._attr_entity_enabled_default = enabled_default  # <-- Use the argument
 
+    @property
+    def available(self) -> bool:
+        """Return False while the value is stale because its registers can't be read."""
+        return super().available and not self.coordinator.is_stale(self.entity_description.key)
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -0,0 +1,7 @@
+"""Make the integration, the simulator and the Home Assistant fakes importable from the tests."""
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
@@ -0,0 +1,50 @@
+"""
+Reference decoder for the tests: every key decoded register by register
+through CustomPayloadDecoder, the way the hub did before the compiled plans.
+"""
+from __future__ import annotations
+
+import random
+
+from custom_components.eg4_inverter_modbus.const import HOLDING_REGISTERS, INPUT_REGISTERS
+from custom_components.eg4_inverter_modbus.decoder import compile_decode_plan
+from custom_components.eg4_inverter_modbus.hub import CustomPayloadDecoder
+from custom_components.eg4_inverter_modbus.planner import description_spans, plan_reads
+
+
+def build_blocks(seed: int = 0) -> list:
+    """Return (plan, registers) for every block of a full poll, filled with random registers."""
+    rng = random.Random(seed)
+    blocks = []
+    for descriptions in (INPUT_REGISTERS, HOLDING_REGISTERS):
+        for request in plan_reads(description_spans(descriptions), max_gap=24):
+            plan = compile_decode_plan(descriptions, request.start, request.count)
+            # value_fn conversions cost the same with either decoder, leave them out.
+            plan = type(plan)(plan.start, plan.count, tuple(f for f in plan.fields if f.value_fn is None))
+            blocks.append((plan, [rng.randrange(0x10000) for _ in range(request.count)]))
+    return blocks
+
+
+def decode_with_payload_decoder(plan, registers: list[int], data: dict) -> None:
+    """Decode a block register by register, the way the hub did before the bulk decoder."""
+    decoder = CustomPayloadDecoder(registers)
+    for key, offset, width, sign_bit, shift, mask, divisor, multiplier, value_map, _ in plan.fields:
+        decoder._pointer = offset
+        if width == 1:
+            raw = decoder.decode_16bit_int() if sign_bit else decoder.decode_16bit_uint()
+        elif width == 2:
+            raw = decoder.decode_32bit_int() if sign_bit else decoder.decode_32bit_uint()
+        else:
+            raw = 0
+            for i in range(width):
+                raw |= decoder.decode_16bit_uint() << (16 * i)
+        if mask is not None:
+            raw = (raw >> shift) & mask
+        if value_map is not None:
+            data[key] = value_map.get(raw, "Unknown")
+        elif divisor != 1:
+            data[key] = raw / divisor
+        elif multiplier != 1:
+            data[key] = raw * multiplier
+        else:
+            data[key] = raw
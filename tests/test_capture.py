@@ -0,0 +1,58 @@
+"""Tests of the raw register capture format."""
+import pathlib
+
+from custom_components.eg4_inverter_modbus.capture import (
+    CAPTURE_SUFFIX,
+    CaptureWriter,
+    iter_records,
+    registers_to_payload,
+)
+
+
+def _write(writer: CaptureWriter) -> list[pathlib.Path]:
+    writer.write(writer.take())
+    return sorted(pathlib.Path(writer.directory).glob(f"*{CAPTURE_SUFFIX}"))
+
+
+def test_round_trip(tmp_path):
+    writer = CaptureWriter(str(tmp_path), "test", 1 << 20, 4)
+    first = registers_to_payload(range(40))
+    changed = registers_to_payload([*range(39), 1000])
+    writer.append(1000.0, 1, 4, 0, first)
+    writer.append(1001.5, 1, 4, 0, changed)
+    writer.append(1001.6, 1, 3, 0, b"", 2)
+    writer.append(1003.0, 2, 4, 0, first)
+    files = _write(writer)
+
+    assert len(files) == 1
+    records = list(iter_records(files[0].read_bytes()))
+    assert [(r.timestamp, r.unit, r.function_code, r.start, r.exception_code) for r in records] == [
+        (1000.0, 1, 4, 0, 0), (1001.5, 1, 4, 0, 0), (1001.6, 1, 3, 0, 2), (1003.0, 2, 4, 0, 0),
+    ]
+    assert records[1].registers == [*range(39), 1000]
+    assert records[3].payload == first
+    # The unchanged-but-one block is stored as a delta.
+    assert writer.bytes < 3 * len(first)
+
+
+def test_files_rotate_and_are_pruned(tmp_path):
+    writer = CaptureWriter(str(tmp_path), "test", 200, 2)
+    payload = registers_to_payload(range(60))
+    for second in range(6):
+        writer.append(2000.0 + second, 1, 4, 0, payload)
+        writer.append(2000.0 + second, 1, 4, 200, payload)
+    files = _write(writer)
+
+    assert len(files) == 2
+    records = [record for path in files for record in iter_records(path.read_bytes())]
+    assert all(record.payload == payload for record in records)
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    writer = CaptureWriter(str(tmp_path), "test", 1 << 20, 4)
+    writer.append(3000.0, 1, 4, 0, registers_to_payload(range(10)))
+    writer.append(3001.0, 1, 4, 20, registers_to_payload(range(10)))
+    data = _write(writer)[0].read_bytes()
+
+    assert len(list(iter_records(data))) == 2
+    assert len(list(iter_records(data[:-3]))) == 1
@@ -0,0 +1,86 @@
+"""Tests of the register range discovery."""
+import asyncio
+import random
+
+import pytest
+
+from custom_components.eg4_inverter_modbus.discovery import (
+    async_scan_registers,
+    register_map_holes,
+    register_map_key,
+    unreadable_ranges,
+)
+
+
+def scan(holes, end, spans=()):
+    """Scan against a device that refuses every read touching a hole; returns the ranges and the reads."""
+    reads = []
+
+    async def read(start, count):
+        reads.append((start, count))
+        return not any(first <= start + count - 1 and start <= last for first, last in holes)
+
+    return asyncio.run(async_scan_registers(read, end, spans)), reads
+
+
+def test_fully_readable_space_takes_one_read_per_block():
+    readable, reads = scan([], 256)
+    assert readable == [(0, 255)]
+    assert reads == [(0, 125), (125, 125), (250, 6)]
+
+
+@pytest.mark.parametrize(
+    "holes, expected",
+    [
+        ([(130, 135)], [(0, 129), (136, 255)]),
+        ([(0, 3), (200, 255)], [(4, 199)]),
+        ([(153, 255)], [(0, 152)]),
+        ([(40, 40), (41, 60), (250, 250)], [(0, 39), (61, 249), (251, 255)]),
+    ],
+)
+def test_holes_are_found(holes, expected):
+    readable, _ = scan(holes, 256)
+    assert readable == expected
+    unreadable = {a for first, last in unreadable_ranges(readable, 256) for a in range(first, last + 1)}
+    assert unreadable == {a for first, last in holes for a in range(first, last + 1)}
+
+
+def test_described_spans_inside_holes_are_checked_on_their_own():
+    # The island 127-128 is skipped by the doubling steps over the hole run.
+    holes = [(114, 126), (129, 150)]
+    readable, _ = scan(holes, 256)
+    assert (127, 127) not in readable
+    readable, _ = scan(holes, 256, spans=[(127, 128), (140, 140)])
+    assert any(first <= 127 and 128 <= last for first, last in readable)
+    assert not any(first <= 140 <= last for first, last in readable)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_layouts_never_report_unreadable_registers(seed):
+    rng = random.Random(seed)
+    end = rng.randrange(50, 400)
+    holes, position = [], 0
+    while True:
+        position += rng.randrange(0, 80)
+        if position >= end:
+            break
+        last = min(position + rng.randrange(0, 30), end - 1)
+        holes.append((position, last))
+        position = last + 2
+    spans = [(a, a + rng.randrange(2)) for a in rng.sample(range(end - 1), 30)]
+    readable, _ = scan(holes, end, spans)
+
+    def unreadable(first, last):
+        return any(hole_first <= last and first <= hole_last for hole_first, hole_last in holes)
+
+    assert not any(unreadable(first, last) for first, last in readable)
+    for first, last in spans:
+        covered = any(a <= first and last <= b for a, b in readable)
+        assert covered == (not unreadable(first, last))
+
+
+def test_register_map_holes_and_key():
+    register_map = {"input": {"end": 200, "readable": [[0, 139], [150, 189]]}, "holding": {"end": 50, "readable": [[0, 49]]}}
+    assert register_map_holes(register_map) == {"input": ((140, 149), (190, 199)), "holding": ()}
+    assert register_map_key({"info_com_version": 18}) is None
+    assert register_map_key({"info_com_version": 18, "info_controller_version": 7}) == "com 18 controller 7"
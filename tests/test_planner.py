@@ -0,0 +1,41 @@
+"""Tests of the read planner."""
+from custom_components.eg4_inverter_modbus.planner import (
+    MAX_REGISTERS_PER_READ,
+    MAX_REGISTERS_PER_WRITE,
+    ReadRequest,
+    plan_reads,
+)
+
+
+def test_adjacent_and_overlapping_spans_share_a_request():
+    assert plan_reads([(0, 0), (1, 2), (2, 2), (3, 3)]) == [ReadRequest(0, 4)]
+
+
+def test_gaps_are_bridged_up_to_max_gap():
+    spans = [(0, 1), (5, 5), (20, 21)]
+    assert plan_reads(spans, max_gap=3) == [ReadRequest(0, 6), ReadRequest(20, 2)]
+    assert plan_reads(spans, max_gap=0) == [ReadRequest(0, 2), ReadRequest(5, 1), ReadRequest(20, 2)]
+    assert plan_reads(spans, max_gap=14) == [ReadRequest(0, 22)]
+
+
+def test_holes_are_never_bridged_and_spans_in_them_are_dropped():
+    spans = [(0, 1), (4, 4), (6, 7)]
+    assert plan_reads(spans, max_gap=10, holes=[(3, 3)]) == [ReadRequest(0, 2), ReadRequest(4, 4)]
+    assert plan_reads(spans, max_gap=10, holes=[(4, 5)]) == [ReadRequest(0, 2), ReadRequest(6, 2)]
+
+
+def test_requests_stay_within_the_read_limit():
+    spans = [(address, address) for address in range(300)]
+    requests = plan_reads(spans)
+    assert [r.count for r in requests] == [MAX_REGISTERS_PER_READ, MAX_REGISTERS_PER_READ, 50]
+    assert requests[1].start == requests[0].end + 1
+
+
+def test_a_32_bit_span_is_never_split():
+    requests = plan_reads([(0, 123), (124, 125)])
+    assert requests == [ReadRequest(0, 124), ReadRequest(124, 2)]
+
+
+def test_write_limit():
+    requests = plan_reads(((a, a) for a in range(200)), max_count=MAX_REGISTERS_PER_WRITE)
+    assert [r.count for r in requests] == [MAX_REGISTERS_PER_WRITE, 200 - MAX_REGISTERS_PER_WRITE]
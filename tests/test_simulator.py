@@ -0,0 +1,95 @@
+"""End-to-end tests of the hub against the simulated inverter on localhost."""
+import asyncio
+import time
+
+import pytest
+
+from fakes import fake_hass
+from custom_components.eg4_inverter_modbus.const import HOLDING_REGISTERS, INPUT_REGISTERS
+from custom_components.eg4_inverter_modbus.decoder import compile_decode_plan
+from custom_components.eg4_inverter_modbus.hub import POLL_RETRY_BUDGET, EG4ModbusHub
+from simulator import REGISTER_COUNT, InverterSimulator
+
+
+def run(test, pipeline_reads=False):
+    """Run `test(simulator, hub)` against a simulator whose values only change when the test says so."""
+
+    async def main():
+        simulator = InverterSimulator(port=0, tick=3600)
+        await simulator.start()
+        hub = EG4ModbusHub(
+            fake_hass(asyncio.get_running_loop()), "Test", "127.0.0.1", simulator.port, 1, 10, pipeline_reads=pipeline_reads
+        )
+        try:
+            return await test(simulator, hub)
+        finally:
+            hub.close()
+            await simulator.stop()
+
+    return asyncio.run(main())
+
+
+def expected_values(registers: list[int], descriptions) -> dict:
+    """Decode a whole register table, leaving out the conversions that read the clock."""
+    plan = compile_decode_plan(descriptions, 0, REGISTER_COUNT)
+    plan = type(plan)(plan.start, plan.count, tuple(f for f in plan.fields if f.value_fn is None))
+    values: dict = {}
+    plan.apply(registers, values)
+    return values
+
+
+@pytest.mark.parametrize("pipeline_reads", [False, True])
+def test_poll_decodes_the_served_registers(pipeline_reads):
+    async def test(simulator, hub):
+        await hub.async_poll_once()
+        assert hub.last_read_ok
+        model = simulator.models[1]
+        for registers, descriptions in ((model.input, INPUT_REGISTERS), (model.holding, HOLDING_REGISTERS)):
+            expected = expected_values(registers, descriptions)
+            assert {key: hub.data[key] for key in expected} == expected
+        assert hub.data["power_pv_total"] == sum(hub.data[f"power_pv{n}"] for n in (1, 2, 3))
+        assert hub.data["modbus_errors"] == 0
+        if pipeline_reads:
+            assert "pipelined" in hub.poll_latency
+
+    run(test, pipeline_reads)
+
+
+def test_write_is_sent_and_read_back():
+    async def test(simulator, hub):
+        await hub.async_poll_once()
+        assert await hub.async_queue_write(65, 42)
+        for _ in range(50):
+            if hub.data["setting_percent_discharge_power"] == 42:
+                break
+            await asyncio.sleep(0.05)
+        assert simulator.models[1].holding[65] == 42
+        assert hub.data["setting_percent_discharge_power"] == 42
+
+    run(test)
+
+
+def test_failed_blocks_keep_the_last_values_and_are_read_again():
+    async def test(simulator, hub):
+        key = "setting_percent_discharge_power"
+        # Every response misses its last register, so no block decodes.
+        simulator.short = 1.0
+        started = time.monotonic()
+        await hub.async_poll_once()
+        assert not hub.last_read_ok
+        assert key not in hub.data
+        assert not hub.read_since(key, started)
+        gateway = hub.diagnostics()["gateway"]
+        # The short responses reached the bus and were retried; they are not Modbus errors.
+        assert gateway["requests"] >= len(hub.diagnostics()["blocks"]) + POLL_RETRY_BUDGET
+        assert gateway["errors"] == 0
+
+        simulator.short = 0.0
+        started = time.monotonic()
+        await hub.async_poll_once()
+        assert hub.last_read_ok
+        assert hub.data[key] == simulator.models[1].holding[65]
+        assert hub.read_since(key, started)
+        assert not hub.is_stale(key)
+
+    run(test)
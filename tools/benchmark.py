@@ -0,0 +1,272 @@
+"""
+Benchmark suite for the polling hot path, with JSON results for comparing runs.
+
+Measures:
+- end-to-end polls of EG4ModbusHub against the simulator with injected latency,
+  reading sequentially and pipelined;
+- decoding of every read block;
+- translating the fault and warning words, testing every bit and through the
+  byte tables, cold and memoized;
+- pushing one coordinator update to every entity of the sensor, binary_sensor,
+  number and select platforms, with all values changed and with one changed.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python tools/benchmark.py [--latency 0.02] [--polls 50] [--output results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import pymodbus  # noqa: E402
+
+from custom_components.eg4_inverter_modbus import binary_sensor, number, select, sensor  # noqa: E402
+from custom_components.eg4_inverter_modbus.const import (  # noqa: E402
+    CONF_ENABLE_READ_SENSORS,
+    CONF_ENABLE_WRITE_SENSORS,
+    DOMAIN,
+    FAULT_CODES,
+    FAULT_TABLE,
+    HOLDING_REGISTERS,
+    INPUT_REGISTERS,
+    WARNING_CODES,
+    WARNING_TABLE,
+    EG4ModbusSelectEntityDescription,
+    translate_bitmask_to_messages,
+)
+from custom_components.eg4_inverter_modbus.decoder import compile_decode_plan  # noqa: E402
+from custom_components.eg4_inverter_modbus.hub import EG4ModbusHub  # noqa: E402
+from custom_components.eg4_inverter_modbus.planner import description_spans, plan_reads  # noqa: E402
+from fakes import fake_hass  # noqa: E402
+from simulator import InverterModel, InverterSimulator  # noqa: E402
+
+PLATFORMS = (sensor, binary_sensor, number, select)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Return mean, percentiles and max of timings in seconds, as milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+        "p50_ms": ordered[len(ordered) // 2] * 1e3,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3,
+        "max_ms": ordered[-1] * 1e3,
+    }
+
+
+def per_call(function, number: int) -> float:
+    """Return the best time of one call in microseconds."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+async def bench_polls(args: argparse.Namespace) -> dict:
+    """Time full polls of the hub against the simulator, sequentially and pipelined."""
+    simulator = InverterSimulator(port=0, latency=args.latency, jitter=args.jitter)
+    await simulator.start()
+    results = {}
+    try:
+        for mode in ("sequential", "pipelined"):
+            hub = EG4ModbusHub(
+                fake_hass(asyncio.get_running_loop()), "EG4", "127.0.0.1", simulator.port, 1, 10,
+                pipeline_reads=mode == "pipelined",
+            )
+            samples = []
+            for _ in range(args.polls + 1):
+                hub._tier_last_poll.clear()  # every tier due, so each poll reads all blocks
+                start = time.perf_counter()
+                hub.data = await hub._async_update_data()
+                samples.append(time.perf_counter() - start)
+            hub.close()
+            results[mode] = summarize(samples[1:])  # the first poll connects and plans
+        results["requests_per_poll"] = sum(
+            len(plan_reads(description_spans(descriptions), max_gap=hub._max_read_gap))
+            for descriptions in (INPUT_REGISTERS, HOLDING_REGISTERS)
+        )
+    finally:
+        await simulator.stop()
+    return results
+
+
+def bench_decode(args: argparse.Namespace) -> dict:
+    """Time decoding each block of a full poll, with registers from the simulator model."""
+    model = InverterModel(1)
+    results = {}
+    for register_type, descriptions, registers in (
+        ("input", INPUT_REGISTERS, model.input),
+        ("holding", HOLDING_REGISTERS, model.holding),
+    ):
+        for request in plan_reads(description_spans(descriptions), max_gap=24):
+            plan = compile_decode_plan(descriptions, request.start, request.count)
+            block = registers[request.start:request.end + 1]
+            data: dict = {}
+            results[f"{register_type} {request.start}-{request.end}"] = {
+                "fields": len(plan.fields),
+                "us_per_decode": per_call(lambda: plan.apply(block, data), args.number),
+            }
+    results["total_us"] = sum(block["us_per_decode"] for block in results.values())
+    return results
+
+
+def bench_bitmask(args: argparse.Namespace) -> dict:
+    """
+    Time the translation of no, one and several set bits by testing every
+    known bit, through the byte tables and through their memoized lookup.
+    """
+    cases = {
+        "fault_none": (0, FAULT_CODES, FAULT_TABLE),
+        "fault_one_bit": (next(iter(FAULT_CODES)), FAULT_CODES, FAULT_TABLE),
+        "fault_all_bits": (sum(FAULT_CODES), FAULT_CODES, FAULT_TABLE),
+        "warning_one_bit": (next(iter(WARNING_CODES)), WARNING_CODES, WARNING_TABLE),
+        "warning_all_bits": (sum(WARNING_CODES), WARNING_CODES, WARNING_TABLE),
+    }
+    return {
+        name: {
+            "us_per_call": per_call(lambda: translate_bitmask_to_messages(code, codes), args.number),
+            "us_per_call_table": per_call(lambda: table._messages(code), args.number),
+            "us_per_call_memoized": per_call(lambda: table.messages(code), args.number),
+        }
+        for name, (code, codes, table) in cases.items()
+    }
+
+
+def changed_values(data: dict) -> dict:
+    """Return a copy of the data with every value that can change changed."""
+    options = {
+        description.key: len(description.options)
+        for description in HOLDING_REGISTERS
+        if isinstance(description, EG4ModbusSelectEntityDescription)
+    }
+    changed = {}
+    for key, value in data.items():
+        if isinstance(value, bool):
+            value = not value
+        elif key in options:
+            value = (value + 1) % options[key]
+        elif isinstance(value, (int, float)):
+            value = value + 1
+        changed[key] = value
+    return changed
+
+
+async def bench_fan_out(args: argparse.Namespace) -> dict:
+    """Time one coordinator update pushed to the entities of every platform."""
+    hass = fake_hass(asyncio.get_running_loop())
+    hub = EG4ModbusHub(hass, "EG4", "127.0.0.1", 502, 1, 10)
+    hub.update_interval = None  # never polls, the benchmark sets the data
+    hass.data[DOMAIN] = {"bench": hub}
+    entry = SimpleNamespace(
+        entry_id="bench", options={CONF_ENABLE_READ_SENSORS: True, CONF_ENABLE_WRITE_SENSORS: True}
+    )
+
+    entities = []
+    for module in PLATFORMS:
+        await module.async_setup_entry(hass, entry, entities.extend)
+    state_writes = 0
+
+    def write_state(entity):
+        # What async_write_ha_state costs the integration: computing the state.
+        nonlocal state_writes
+        state_writes += 1
+        return entity.state, entity.available
+
+    for entity in entities:
+        entity.hass = hass
+        entity.entity_id = f"{type(entity).__name__.lower()}.{entity.entity_description.key}"
+        entity.async_write_ha_state = lambda entity=entity: write_state(entity)
+        hub.async_add_listener(entity._handle_coordinator_update, entity.coordinator_context)
+
+    # Values as the hub decodes them, from the simulator's registers.
+    model = InverterModel(1)
+    data: dict = {}
+    for descriptions, registers in ((INPUT_REGISTERS, model.input), (HOLDING_REGISTERS, model.holding)):
+        for request in plan_reads(description_spans(descriptions), max_gap=24):
+            compile_decode_plan(descriptions, request.start, request.count).apply(
+                registers[request.start:request.end + 1], data
+            )
+    changed = changed_values(data)
+    one_changed = dict(data, power_pv1=changed["power_pv1"])
+
+    def push(alternatives: tuple[dict, dict]):
+        state = {"turn": 0}
+
+        def update():
+            hub.data = alternatives[state["turn"]]
+            state["turn"] ^= 1
+            hub.async_update_listeners()
+        return update
+
+    results = {"entities": {type(e).__name__: 0 for e in entities}}
+    for entity in entities:
+        results["entities"][type(entity).__name__] += 1
+    hub.last_update_success = True
+    hub.data = data
+    hub.async_update_listeners()
+    for name, alternatives in (("all_changed", (changed, data)), ("one_changed", (one_changed, data))):
+        state_writes = 0
+        seconds = min(timeit.repeat(push(alternatives), number=args.fan_out_updates, repeat=5))
+        results[name] = {
+            "us_per_update": seconds / args.fan_out_updates * 1e6,
+            "state_writes_per_update": state_writes / (5 * args.fan_out_updates),
+        }
+    hub.close()
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run the selected benchmarks."""
+    results = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pymodbus": pymodbus.__version__,
+        "machine": platform.machine(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "only")},
+    }
+    selected = args.only or ["polls", "decode", "bitmask", "fan_out"]
+    if "polls" in selected:
+        results["polls"] = await bench_polls(args)
+    if "decode" in selected:
+        results["decode"] = bench_decode(args)
+    if "bitmask" in selected:
+        results["bitmask"] = bench_bitmask(args)
+    if "fan_out" in selected:
+        results["fan_out"] = await bench_fan_out(args)
+    return results
+
+
+def main() -> None:
+    """Parse the command line, run the benchmarks and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated network latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency in seconds")
+    parser.add_argument("--polls", type=int, default=50, help="end-to-end polls per read mode")
+    parser.add_argument("--number", type=int, default=2000, help="calls per decode and bitmask measurement")
+    parser.add_argument("--fan-out-updates", type=int, default=200, help="updates per fan-out measurement")
+    parser.add_argument("--only", nargs="+", choices=["polls", "decode", "bitmask", "fan_out"])
+    parser.add_argument("--output", help="write the JSON here instead of to stdout")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of block decoding: the bulk struct decoder against CustomPayloadDecoder.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python tools/benchmark_decoder.py [--polls 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import timeit
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# The per-key decoder is the reference of the decoder tests.
+sys.path.insert(0, str(ROOT / "tests"))
+
+from reference_decoder import build_blocks, decode_with_payload_decoder  # noqa: E402
+
+
+def main() -> None:
+    """Run both decoders over a full poll and print the time per poll."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--polls", type=int, default=20000, help="decoded polls per measurement")
+    args = parser.parse_args()
+
+    blocks = build_blocks()
+    payload_data: dict = {}
+    bulk_data: dict = {}
+    for plan, registers in blocks:
+        decode_with_payload_decoder(plan, registers, payload_data)
+        plan.apply(registers, bulk_data)
+    assert payload_data == bulk_data, "decoders disagree"
+
+    def payload_poll():
+        data = {}
+        for plan, registers in blocks:
+            decode_with_payload_decoder(plan, registers, data)
+
+    def bulk_poll():
+        data = {}
+        for plan, registers in blocks:
+            plan.apply(registers, data)
+
+    fields = sum(len(plan.fields) for plan, _ in blocks)
+    registers = sum(len(r) for _, r in blocks)
+    print(f"{len(blocks)} blocks, {registers} registers, {fields} fields per poll")
+    results = {}
+    for name, poll in (("CustomPayloadDecoder", payload_poll), ("bulk struct", bulk_poll)):
+        seconds = min(timeit.repeat(poll, number=args.polls, repeat=5)) / args.polls
+        results[name] = seconds
+        print(f"{name:>22}: {seconds * 1e6:8.1f} us/poll")
+    print(f"{'speedup':>22}: {results['CustomPayloadDecoder'] / results['bulk struct']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""Just enough of Home Assistant to run EG4ModbusHub outside of it, for the tools and the tests."""
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import tempfile
+from types import SimpleNamespace
+
+from homeassistant.util.unit_system import METRIC_SYSTEM
+
+
+def fake_hass(loop: asyncio.AbstractEventLoop) -> SimpleNamespace:
+    """Return just enough of Home Assistant for the hub and the platforms."""
+    return SimpleNamespace(
+        loop=loop,
+        data={},
+        is_stopping=False,
+        async_create_task=lambda target, name=None, eager_start=False: asyncio.ensure_future(target),
+        async_add_executor_job=lambda target, *args: loop.run_in_executor(None, target, *args),
+        # An empty config directory: no register map is stored for the simulated firmware.
+        config=SimpleNamespace(
+            units=METRIC_SYSTEM, path=lambda *parts: str(pathlib.Path(tempfile.gettempdir(), "eg4-benchmark", *parts))
+        ),
+    )
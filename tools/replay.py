@@ -0,0 +1,190 @@
+"""
+Replay raw register captures through the decode path of EG4ModbusHub.
+
+Each capture file written by the capture_raw option is memory-mapped and
+streamed record by record. Every poll goes through the hub's own
+async_apply_blocks, like a live poll, so the calculated values, block
+statistics and fault/warning events are the ones the integration would have
+produced. A poll is the run of records up to the next block the unit already
+answered.
+
+Replays at the recorded pace (--speed 1), faster (--speed 100) or as fast as
+possible (--speed 0), and reports decode throughput in records per second.
+With --dump, the data of every poll is written as JSON lines, so two decoder
+versions can be compared with diff.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python tools/replay.py CAPTURE_OR_DIRECTORY... [--speed 0] [--dump polls.jsonl]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import closing
+import json
+import logging
+import mmap
+import pathlib
+import sys
+import time
+from types import SimpleNamespace
+from typing import Iterator
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from custom_components.eg4_inverter_modbus.capture import CAPTURE_SUFFIX, CaptureRecord, iter_records  # noqa: E402
+from custom_components.eg4_inverter_modbus.const import HOLDING_REGISTERS, INPUT_REGISTERS  # noqa: E402
+from custom_components.eg4_inverter_modbus.decoder import DecodePlan, compile_decode_plan  # noqa: E402
+from custom_components.eg4_inverter_modbus.hub import EG4ModbusHub  # noqa: E402
+from custom_components.eg4_inverter_modbus.pipeline import READ_FUNCTION_CODES, PipelinedResponse  # noqa: E402
+from fakes import fake_hass  # noqa: E402
+
+REGISTER_TYPES = {code: register_type for register_type, code in READ_FUNCTION_CODES.items()}
+DESCRIPTIONS = {"input": INPUT_REGISTERS, "holding": HOLDING_REGISTERS}
+
+
+def capture_files(paths: list[str]) -> list[pathlib.Path]:
+    """Expand directories into their capture files, oldest first."""
+    files = []
+    for path in map(pathlib.Path, paths):
+        files.extend(sorted(path.glob(f"*{CAPTURE_SUFFIX}")) if path.is_dir() else [path])
+    return files
+
+
+def read_captures(files: list[pathlib.Path]) -> Iterator[CaptureRecord]:
+    """Stream the records of every file from a read-only memory map."""
+    for path in files:
+        with open(path, "rb") as file:
+            if not path.stat().st_size:
+                continue
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # The generator holds a view of the map; close it before the map.
+                with closing(iter_records(mapped)) as records:
+                    yield from records
+
+
+class CaptureReplay:
+    """Feed capture records to one hub per unit as if they were block responses."""
+
+    def __init__(self, hass: SimpleNamespace, speed: float):
+        """Initialize the replay; a speed of 0 replays as fast as possible."""
+        self.hass = hass
+        self.speed = speed
+        self.hubs: dict[int, EG4ModbusHub] = {}
+        self.plans: dict[tuple[str, int, int], DecodePlan] = {}
+        self.records = 0
+        self.polls = 0
+        self.failed_blocks = 0
+        self.busy = 0.0
+        self._pending: dict[int, list[CaptureRecord]] = {}
+
+    def _hub(self, unit: int) -> EG4ModbusHub:
+        """Return the hub replaying a unit, created on its first record."""
+        hub = self.hubs.get(unit)
+        if hub is None:
+            hub = self.hubs[unit] = EG4ModbusHub(self.hass, f"Replay {unit}", "replay.invalid", 502, unit, 10)
+            hub.update_interval = None
+        return hub
+
+    def _plan(self, register_type: str, start: int, count: int) -> DecodePlan:
+        """Return the decode plan of every description inside a block."""
+        key = (register_type, start, count)
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = self.plans[key] = compile_decode_plan(DESCRIPTIONS[register_type], start, count)
+        return plan
+
+    async def _async_poll(self, unit: int, records: list[CaptureRecord], dump) -> None:
+        """Apply the blocks of one poll to the unit's hub."""
+        hub = self._hub(unit)
+        blocks = []
+        for record in records:
+            register_type = REGISTER_TYPES[record.function_code]
+            plan = self._plan(register_type, record.start, len(record.payload) // 2 or 1)
+            blocks.append((register_type, plan, PipelinedResponse(record.payload, record.exception_code), None))
+        decoded = await hub.async_apply_blocks(blocks, time.monotonic())
+        self.failed_blocks += len(blocks) - decoded
+        self.polls += 1
+        if decoded and dump is not None:
+            dump.write(json.dumps({"timestamp": records[-1].timestamp, "unit": unit, "data": hub.data}, default=str) + "\n")
+
+    async def run(self, records: Iterator[CaptureRecord], dump=None) -> None:
+        """Replay the records, pacing the polls by their timestamps unless the speed is 0."""
+        loop = asyncio.get_running_loop()
+        first = started = None
+        for record in records:
+            if first is None:
+                first, started = record.timestamp, loop.time()
+            pending = self._pending.setdefault(record.unit, [])
+            if any(r.function_code == record.function_code and r.start == record.start for r in pending):
+                # The unit answers a block again: the previous poll is complete.
+                if self.speed:
+                    delay = started + (pending[0].timestamp - first) / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                begin = time.perf_counter()
+                await self._async_poll(record.unit, pending, dump)
+                self.busy += time.perf_counter() - begin
+                pending = self._pending[record.unit] = []
+            pending.append(record)
+            self.records += 1
+        begin = time.perf_counter()
+        for unit, pending in self._pending.items():
+            if pending:
+                await self._async_poll(unit, pending, dump)
+        self.busy += time.perf_counter() - begin
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Close the hubs."""
+        for hub in self.hubs.values():
+            hub.close()
+
+
+async def replay(args: argparse.Namespace) -> dict:
+    """Replay the captures and return the throughput and a summary per unit."""
+    events = []
+    hass = fake_hass(asyncio.get_running_loop())
+    hass.bus = SimpleNamespace(async_fire=lambda event_type, event_data: events.append(event_data))
+    engine = CaptureReplay(hass, args.speed)
+    files = capture_files(args.captures)
+    dump = open(args.dump, "w") if args.dump else None
+    started = time.perf_counter()
+    try:
+        await engine.run(read_captures(files), dump)
+    finally:
+        engine.close()
+        if dump is not None:
+            dump.close()
+    elapsed = time.perf_counter() - started
+    return {
+        "files": len(files),
+        "records": engine.records,
+        "polls": engine.polls,
+        "failed_blocks": engine.failed_blocks,
+        "events": len(events),
+        "speed": args.speed,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_second": round(engine.records / engine.busy) if engine.busy else None,
+        "units": {
+            unit: {"blocks": {name: stats.requests for name, stats in hub.block_stats.items()}}
+            for unit, hub in engine.hubs.items()
+        },
+    }
+
+
+def main() -> None:
+    """Parse the command line, replay the captures and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("captures", nargs="+", help="capture files or directories of them")
+    parser.add_argument("--speed", type=float, default=0, help="1 replays in real time, 100 a hundred times faster, 0 as fast as possible")
+    parser.add_argument("--dump", help="write the data of every poll here as JSON lines")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(json.dumps(asyncio.run(replay(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
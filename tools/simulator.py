@@ -0,0 +1,457 @@
+"""
+Simulated EG4 inverter for tests and benchmarks.
+
+Serves the input and holding register map of const.py through pymodbus's
+Modbus TCP server, with values that follow a compressed solar day. A small
+proxy in front of the server injects faults: network latency, dropped and
+short responses and connection resets. The proxy answers pipelined requests
+like a capable Ethernet gateway, or drops them like a simple one.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python tools/simulator.py --port 5020 --units 1,2,3 --latency 0.05 --drop 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import math
+import pathlib
+import random
+import socket
+import struct
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from homeassistant.components.sensor import SensorDeviceClass  # noqa: E402
+
+from custom_components.eg4_inverter_modbus.const import (  # noqa: E402
+    HOLDING_REGISTERS,
+    INPUT_REGISTERS,
+    EG4ModbusNumberEntityDescription,
+    EG4ModbusSelectEntityDescription,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Registers served per table; covers every address in const.py.
+REGISTER_COUNT = 256
+
+_MBAP = struct.Struct(">HHHB")
+
+
+def encode(description, raw: int, registers: list[int]) -> None:
+    """Store a raw value into the registers of a description, in place."""
+    width = description.registers
+    bits = 16 * width
+    if description.mask is not None:
+        current = 0
+        for i in range(width):
+            current |= registers[description.address + i] << (16 * i)
+        mask = description.mask << description.shift
+        raw = (current & ~mask) | ((raw << description.shift) & mask)
+    raw &= (1 << bits) - 1  # two's complement for negative values
+    for i in range(width):
+        registers[description.address + i] = (raw >> (16 * i)) & 0xFFFF
+
+
+def pack_inverter_time(now: time.struct_time) -> int:
+    """Pack a time the way registers 12-14 hold the inverter clock."""
+    return (
+        (now.tm_year - 2000)
+        | now.tm_mon << 8
+        | now.tm_mday << 16
+        | now.tm_hour << 24
+        | now.tm_min << 32
+        | now.tm_sec << 40
+    )
+
+
+class InverterModel:
+    """
+    Register contents of one simulated inverter.
+
+    A whole day passes every `day_seconds`, so PV output, battery SOC and grid
+    flows swing through their full range quickly. Energy counters integrate
+    the simulated power. Holding registers start from sensible settings and
+    keep whatever a client writes to them.
+    """
+
+    def __init__(self, unit: int, seed: int = 0, day_seconds: float = 600):
+        """Initialize the model."""
+        self.unit = unit
+        self.input = [0] * REGISTER_COUNT
+        self.holding = [0] * REGISTER_COUNT
+        self._rng = random.Random(seed * 1000 + unit)
+        self._day_seconds = day_seconds
+        self._started = self._last = time.monotonic()
+        self._size = 0.8 + 0.4 * self._rng.random()  # units of a stack differ a little
+        self._soc = 40 + 40 * self._rng.random()
+        self._energy: dict[str, float] = {}
+        self._day = 0
+        for description in HOLDING_REGISTERS:
+            if description.address is not None:
+                encode(description, self._initial_holding(description), self.holding)
+        self.update()
+
+    def _initial_holding(self, description) -> int:
+        """Return a plausible raw setting."""
+        if isinstance(description, EG4ModbusNumberEntityDescription):
+            low = description.native_min_value or 0
+            high = description.native_max_value if description.native_max_value is not None else low
+            return round((low + high) / 2 / description.scale)
+        if isinstance(description, EG4ModbusSelectEntityDescription):
+            return 0
+        return self._fallback_raw(description)
+
+    def _fallback_raw(self, description) -> int:
+        """Return a raw value by the kind of quantity, for keys the model doesn't simulate."""
+        device_class = getattr(description, "device_class", None)
+        noise = 1 + 0.01 * (self._rng.random() - 0.5)
+        value = {
+            SensorDeviceClass.VOLTAGE: 240 * noise,
+            SensorDeviceClass.CURRENT: 10 * noise,
+            SensorDeviceClass.POWER: 300 * noise,
+            SensorDeviceClass.APPARENT_POWER: 320 * noise,
+            SensorDeviceClass.TEMPERATURE: 35 * noise,
+            SensorDeviceClass.FREQUENCY: 60 * noise,
+            SensorDeviceClass.BATTERY: 50,
+            SensorDeviceClass.POWER_FACTOR: 0.98,
+        }.get(device_class)
+        if value is None or description.value_map is not None or description.value_fn is not None:
+            return 0
+        return round(value / description.scale)
+
+    def _simulate(self, elapsed: float, hours: float) -> dict[str, float]:
+        """Return engineering values of the simulated quantities."""
+        phase = (elapsed / self._day_seconds) % 1
+        sun = max(0.0, math.sin(2 * math.pi * phase))  # daylight for the first half of the day
+        jitter = lambda: 1 + 0.03 * (self._rng.random() - 0.5)  # noqa: E731
+
+        values: dict[str, float] = {}
+        for string, share in (("1", 0.45), ("2", 0.35), ("3", 0.20)):
+            power = 8000 * share * self._size * sun * jitter()
+            values[f"power_pv{string}"] = round(power)
+            values[f"voltage_pv{string}"] = (320 + 80 * sun) * jitter() if sun else 5 * self._rng.random()
+        pv = sum(values[f"power_pv{s}"] for s in "123")
+        load = (900 + 600 * max(0.0, math.sin(4 * math.pi * phase + 1))) * self._size * jitter()
+
+        surplus = pv - load
+        charge = min(surplus, 5000) if surplus > 0 and self._soc < 98 else 0
+        discharge = min(-surplus, 5000) if surplus < 0 and self._soc > 12 else 0
+        self._soc = min(100.0, max(0.0, self._soc + (charge - discharge) * hours / 14336 * 100))
+        grid = load + charge - pv - discharge
+
+        values.update(
+            power_battery_charge=round(charge),
+            power_battery_discharge=round(discharge),
+            power_grid_import=round(max(grid, 0)),
+            power_grid_export=round(max(-grid, 0)),
+            power_inverter=round(load),
+            power_inverter_output=round(load),
+            power_apparent_inverter=round(load * 1.04),
+            power_inverter_l1n=round(load / 2),
+            power_inverter_l2n=round(load / 2),
+            battery_soc=round(self._soc),
+            battery_soh=98,
+            voltage_battery=51.2 + 3.2 * self._soc / 100,
+            voltage_grid_l1l2=240 * jitter(),
+            frequency_grid=60 + 0.04 * (self._rng.random() - 0.5),
+            inverter_state=0x0C if charge else 0x14 if discharge and pv else 0x10 if discharge else 0x04,
+        )
+
+        day = int(elapsed // self._day_seconds)
+        if day != self._day:
+            self._day = day
+            for key in [k for k in self._energy if k.startswith("energy_daily_")]:
+                self._energy[key] = 0.0
+        for description in INPUT_REGISTERS:
+            key = description.key
+            if key.startswith(("energy_daily_", "energy_cumulative_")):
+                source = "power_" + key.split("_", 2)[2]
+                if key not in self._energy:
+                    self._energy[key] = 0.0 if "daily" in key else 1000 + 4000 * self._rng.random()
+                self._energy[key] += values.get(source, 0) * hours / 1000
+                values[key] = self._energy[key]
+        values["inverter_on_time"] = values["inverter_uptime_minutes"] = int(elapsed)
+        return values
+
+    def update(self) -> None:
+        """Advance the simulation to now and refresh the registers in place."""
+        now = time.monotonic()
+        hours = (now - self._last) * 24 / self._day_seconds
+        self._last = now
+        values = self._simulate(now - self._started, hours)
+
+        for description in INPUT_REGISTERS:
+            if description.address is None:
+                continue
+            value = values.get(description.key)
+            if value is None:
+                raw = self._fallback_raw(description)
+            elif description.value_map is not None or description.value_fn is not None:
+                raw = int(value)  # already the raw register value
+            else:
+                raw = round(value / description.scale)
+            encode(description, raw, self.input)
+        for description in HOLDING_REGISTERS:
+            if description.key == "inverter_time_accurate":
+                encode(description, pack_inverter_time(time.gmtime()), self.holding)
+
+
+def _free_port() -> int:
+    """Return a free localhost port for the internal server."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_server(models: dict[int, InverterModel], port: int):
+    """Create a pymodbus TCP server that serves the live registers of the models."""
+    from pymodbus.server import ModbusTcpServer
+
+    try:
+        from pymodbus.simulator import DataType, SimData, SimDevice
+    except ImportError:
+        SimDevice = None
+
+    if SimDevice is not None:
+        # pymodbus >= 3.12: devices copy their data, so every access syncs with the model.
+        def make_action(model: InverterModel):
+            async def action(function_code, start_address, address, count, registers, set_values):
+                source = model.input if function_code == 4 else model.holding
+                first = address - start_address
+                if set_values is None:
+                    registers[first:first + count] = source[address:address + count]
+                else:
+                    source[address:address + len(set_values)] = set_values
+                return None
+            return action
+
+        bits = [SimData(0, count=16, values=False, datatype=DataType.BITS)]
+        devices = [
+            SimDevice(
+                id=unit,
+                simdata=(
+                    bits,
+                    bits,
+                    [SimData(0, count=REGISTER_COUNT, values=0, datatype=DataType.REGISTERS)],
+                    [SimData(0, count=REGISTER_COUNT, values=0, datatype=DataType.REGISTERS)],
+                ),
+                action=make_action(model),
+            )
+            for unit, model in models.items()
+        ]
+        return ModbusTcpServer(devices, address=("127.0.0.1", port))
+
+    from pymodbus.datastore import ModbusSequentialDataBlock, ModbusServerContext
+
+    try:
+        from pymodbus.datastore import ModbusDeviceContext as DeviceContext
+    except ImportError:
+        from pymodbus.datastore import ModbusSlaveContext as DeviceContext
+
+    contexts = {}
+    for unit, model in models.items():
+        # Blocks start at 1 since the context adds 1 to every request address;
+        # they share the model's lists, so updates show up without copying.
+        input_block = ModbusSequentialDataBlock(1, [0] * REGISTER_COUNT)
+        input_block.values = model.input
+        holding_block = ModbusSequentialDataBlock(1, [0] * REGISTER_COUNT)
+        holding_block.values = model.holding
+        contexts[unit] = DeviceContext(ir=input_block, hr=holding_block)
+    return ModbusTcpServer(ModbusServerContext(contexts, single=False), address=("127.0.0.1", port))
+
+
+@dataclass
+class FaultStats:
+    """What the proxy did to the traffic."""
+
+    requests: int = 0
+    dropped: int = 0
+    short: int = 0
+    resets: int = 0
+    refused_pipelined: int = 0
+
+
+@dataclass
+class InverterSimulator:
+    """
+    Simulated inverters on localhost.
+
+    `latency` (plus up to `jitter`) is added to every response like a network
+    round trip, so pipelined requests overlap it. `drop`, `short` and `reset`
+    are the probabilities of a lost response, a response missing its last
+    register, and a closed connection. Without `pipelining`, requests that
+    arrive while another one is outstanding are dropped.
+    """
+
+    port: int = 5020
+    units: tuple[int, ...] = (1,)
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop: float = 0.0
+    short: float = 0.0
+    reset: float = 0.0
+    pipelining: bool = True
+    seed: int = 0
+    day_seconds: float = 600
+    tick: float = 1.0
+    stats: FaultStats = field(default_factory=FaultStats)
+
+    def __post_init__(self):
+        """Build the models."""
+        self.models = {unit: InverterModel(unit, self.seed, self.day_seconds) for unit in self.units}
+        self._rng = random.Random(self.seed)
+        self._server = None
+        self._proxy: Optional[asyncio.base_events.Server] = None
+        self._tasks: list[asyncio.Task] = []
+        self._clients: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start(self) -> None:
+        """Start the server, the proxy in front of it and the value updates."""
+        upstream_port = _free_port()
+        self._server = _build_server(self.models, upstream_port)
+        self._tasks.append(asyncio.create_task(self._server.serve_forever()))
+        for _ in range(100):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", upstream_port)
+            except OSError:
+                await asyncio.sleep(0.05)
+                continue
+            writer.close()
+            break
+        self._upstream_port = upstream_port
+        self._proxy = await asyncio.start_server(self._handle_client, "127.0.0.1", self.port)
+        if not self.port:
+            self.port = self._proxy.sockets[0].getsockname()[1]
+        self._tasks.append(asyncio.create_task(self._tick()))
+        _LOGGER.info(f"Simulating units {list(self.units)} on 127.0.0.1:{self.port}")
+
+    async def stop(self) -> None:
+        """Stop everything."""
+        if self._proxy is not None:
+            self._proxy.close()
+        for writer in self._clients:
+            writer.transport.abort()
+        await asyncio.gather(*self._clients.values(), return_exceptions=True)
+        for task in self._tasks:
+            task.cancel()
+        if self._server is not None:
+            await self._server.shutdown()
+
+    async def _tick(self) -> None:
+        """Advance the models."""
+        while True:
+            for model in self.models.values():
+                model.update()
+            await asyncio.sleep(self.tick)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Forward one client connection to the server, injecting faults."""
+        self._clients[writer] = asyncio.current_task()
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", self._upstream_port)
+        upstream_lock = asyncio.Lock()
+        outstanding = 0
+        tasks = set()
+
+        async def serve(frame: bytes, received: float) -> None:
+            nonlocal outstanding
+            try:
+                async with upstream_lock:
+                    upstream_writer.write(frame)
+                    header = await upstream_reader.readexactly(_MBAP.size)
+                    body = await upstream_reader.readexactly(_MBAP.unpack(header)[2] - 1)
+                roll = self._rng.random()
+                if roll < self.drop:
+                    self.stats.dropped += 1
+                    return
+                if roll < self.drop + self.short and body[0] in (3, 4) and body[1] > 2:
+                    # Drop the last register but keep the frame well formed.
+                    self.stats.short += 1
+                    body = bytes((body[0], body[1] - 2)) + body[2:-2]
+                    header = _MBAP.pack(*_MBAP.unpack(header)[:2], len(body) + 1, header[6])
+                delay = received + self.latency + self.jitter * self._rng.random() - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                writer.write(header + body)
+            finally:
+                outstanding -= 1
+
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                body = await reader.readexactly(_MBAP.unpack(header)[2] - 1)
+                self.stats.requests += 1
+                if self._rng.random() < self.reset:
+                    self.stats.resets += 1
+                    writer.transport.abort()
+                    break
+                if outstanding and not self.pipelining:
+                    self.stats.refused_pipelined += 1
+                    continue
+                outstanding += 1
+                task = asyncio.create_task(serve(header + body, time.monotonic()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            upstream_writer.close()
+            writer.close()
+            self._clients.pop(writer, None)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    simulator = InverterSimulator(
+        port=args.port,
+        units=tuple(int(unit) for unit in args.units.split(",")),
+        latency=args.latency,
+        jitter=args.jitter,
+        drop=args.drop,
+        short=args.short,
+        reset=args.reset,
+        pipelining=not args.no_pipelining,
+        seed=args.seed,
+        day_seconds=args.day_seconds,
+    )
+    await simulator.start()
+    try:
+        while True:
+            await asyncio.sleep(60)
+            _LOGGER.info(f"{simulator.stats}")
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Parse the command line and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--units", default="1", help="comma separated unit ids, e.g. 1,2,3")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability of a lost response")
+    parser.add_argument("--short", type=float, default=0.0, help="probability of a response missing a register")
+    parser.add_argument("--reset", type=float, default=0.0, help="probability of a connection reset per request")
+    parser.add_argument("--no-pipelining", action="store_true", help="drop requests sent while one is outstanding")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--day-seconds", type=float, default=600, help="length of a simulated day")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()